@@ -4,9 +4,13 @@ Batch orchestrator for admin-reseed backfills.
 
 Purpose:
 - Find interactions that do not currently have active conversation spans
-- Call admin-reseed for each interaction with bounded request rate
+  (server-side anti-join RPC, keyset-paginated)
+- Optionally order them by priority (recency, open review items, transcript cost)
+- Call admin-reseed for each interaction from N workers sharing a global rate limit
 - Continue on failures and emit retry artifacts
-- Print progress every N interactions (default: 50)
+- Resume an interrupted or partly failed run from its results.csv (--resume)
+- Print progress every N interactions (default: 50) and keep a live status.json
+  (throughput, rolling latency, error rates, ETA; optionally served on localhost)
 
 Required env vars:
 - SUPABASE_URL
@@ -19,6 +23,7 @@ Example:
   python3 scripts/admin_reseed_batch_backfill.py \
     --mode resegment_only \
     --max-per-minute 5 \
+    --workers 4 \
     --progress-every 50
 """
 
@@ -26,29 +31,97 @@ from __future__ import annotations
 
 import argparse
 import csv
+import gzip
+import http.client
+import itertools
 import json
+import math
 import os
+import random
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
-
+from typing import Any, Iterator
+
+from gt_rate_control import (
+    add_rate_control_args,
+    breaker_from_args,
+    check_rate_control_args,
+    controller_from_args,
+    guarded_call,
+)
+from reseed_schedule import (
+    CURVE_NAME,
+    DEFAULT_HALF_LIFE_DAYS,
+    DEFAULT_WEIGHTS,
+    SCHEDULE_NAME,
+    Candidate,
+    estimate_cost_s,
+    parse_weights,
+    prioritize,
+    simulate,
+    write_completion_curve,
+    write_schedule,
+)
+from reseed_telemetry import DEFAULT_STATUS_EVERY_S, STATUS_NAME, Telemetry
 
 REST_PAGE_SIZE = 1000
-
-
-@dataclass
+# Pages requested ahead of the one being consumed (one keep-alive connection each).
+REST_PREFETCH_PAGES = 4
+CANDIDATES_RPC = "list_unsegmented_interactions"
+FEATURES_RPC = "reseed_candidate_features"
+FEATURES_BATCH = 1000
+ADMIN_RESEED_TIMEOUT_S = 180
+RUN_META_NAME = "run.json"
+RESULTS_FIELDS = ["index", "interaction_id", "result", "http_status", "latency_ms", "error"]
+# Results that end an interaction's backfill; anything else is retried on --resume.
+FINAL_RESULTS = ("success", "skipped_human_lock", "failed_permanent")
+# admin-reseed error codes that a retry cannot fix (bad request / missing interaction).
+# Only these end an interaction as failed_permanent.
+PERMANENT_ERROR_CODES = {
+    "invalid_json",
+    "invalid_mode",
+    "missing_idempotency_key",
+    "missing_interaction_id",
+    "missing_reason",
+    "interaction_not_found",
+}
+RESUME_MAX_ATTEMPTS = 3
+RETRY_MAX_DELAY_S = 300.0
+
+Outcome = tuple[str, int, dict[str, Any], float]
+
+
+@dataclass(slots=True)
 class RunStats:
     total_candidates: int = 0
     attempted: int = 0
     succeeded: int = 0
     skipped_locked: int = 0
     failed: int = 0
+    failed_permanent: int = 0
+    retries: int = 0
+
+
+@dataclass(slots=True)
+class PriorResults:
+    """What an earlier run's results.csv says about each interaction."""
+
+    last_result: dict[str, str]
+    attempts: dict[str, int]
+    max_index: int = 0
+
+    @property
+    def completed(self) -> set[str]:
+        return {iid for iid, result in self.last_result.items() if result in FINAL_RESULTS}
 
 
 def _utc_stamp() -> str:
@@ -103,52 +176,160 @@ def _json_request(
     return status, data
 
 
+class RestReader:
+    """Keep-alive, gzip-accepting PostgREST client. Not thread-safe: use one per thread."""
+
+    def __init__(self, base_url: str, headers: dict[str, str], *, timeout: int = 60) -> None:
+        parts = urllib.parse.urlsplit(base_url)
+        self._https = parts.scheme == "https"
+        self._netloc = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self._headers = {**headers, "Accept": "application/json", "Accept-Encoding": "gzip"}
+        self._timeout = timeout
+        self._conn: http.client.HTTPConnection | None = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            conn_cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            self._conn = conn_cls(self._netloc, timeout=self._timeout)
+        return self._conn
+
+    def request(self, method: str, path: str, payload: dict[str, Any] | None = None) -> tuple[int, Any]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = dict(self._headers)
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        # A keep-alive connection the server has since closed fails on first use; retry once fresh.
+        for attempt in range(2):
+            try:
+                conn = self._connect()
+                conn.request(method, self._prefix + path, body=body, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+                status = int(resp.status)
+                if resp.getheader("Content-Encoding", "").lower() == "gzip":
+                    raw = gzip.decompress(raw)
+                break
+            except (http.client.HTTPException, OSError) as exc:
+                self.close()
+                if attempt == 1:
+                    return 0, {"error": f"request_failed: {exc}"}
+
+        text = raw.decode("utf-8", errors="replace")
+        try:
+            data = json.loads(text) if text else {}
+        except json.JSONDecodeError:
+            data = {"raw": text}
+        return status, data
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _rest_headers(service_key: str) -> dict[str, str]:
+    return {
+        "apikey": service_key,
+        "Authorization": f"Bearer {service_key}",
+    }
+
+
 def _fetch_table_ids(
     base_url: str,
     service_key: str,
     table: str,
     *,
     where: str | None = None,
+    order: str = "interaction_id.asc",
 ) -> list[str]:
-    headers = {
-        "apikey": service_key,
-        "Authorization": f"Bearer {service_key}",
-    }
-    ids: list[str] = []
-    offset = 0
-
-    while True:
-        params = {
-            "select": "interaction_id",
-            "limit": str(REST_PAGE_SIZE),
-            "offset": str(offset),
-        }
-        if table == "interactions":
-            params["order"] = "interaction_id.asc"
-        if where:
-            key, value = where.split("=", 1)
-            params[key] = value
-
-        query = urllib.parse.urlencode(params)
-        url = f"{base_url}/rest/v1/{table}?{query}"
-        status, data = _json_request(url, method="GET", headers=headers, timeout=60)
+    """Distinct interaction_ids of `table`, in page order.
+
+    Upcoming pages are prefetched in parallel over REST_PREFETCH_PAGES keep-alive
+    connections, and ids are de-duplicated as pages arrive (conversation_spans has
+    one row per span). `order` must be deterministic across pages.
+    """
+    base_params = {"select": "interaction_id", "order": order, "limit": str(REST_PAGE_SIZE)}
+    if where:
+        key, value = where.split("=", 1)
+        base_params[key] = value
+
+    local = threading.local()
+    readers: list[RestReader] = []
+    readers_lock = threading.Lock()
+
+    def fetch_page(offset: int) -> list[Any]:
+        reader = getattr(local, "reader", None)
+        if reader is None:
+            reader = local.reader = RestReader(base_url, _rest_headers(service_key))
+            with readers_lock:
+                readers.append(reader)
+        query = urllib.parse.urlencode({**base_params, "offset": str(offset)})
+        status, data = reader.request("GET", f"/rest/v1/{table}?{query}")
         if status == 0:
             raise RuntimeError(f"Failed to read {table}: {data.get('error', 'unknown_error')}")
         if status >= 400:
             raise RuntimeError(f"Failed to read {table}: HTTP {status} {data}")
-        if not isinstance(data, list):
-            break
-
-        batch = [str(row.get("interaction_id")) for row in data if row.get("interaction_id")]
-        ids.extend(batch)
-        if len(data) < REST_PAGE_SIZE:
-            break
-        offset += len(data)
+        return data if isinstance(data, list) else []
 
+    seen: set[str] = set()
+    ids: list[str] = []
+    try:
+        with ThreadPoolExecutor(max_workers=REST_PREFETCH_PAGES) as pool:
+            pages: deque[Future] = deque()
+            next_offset = 0
+            while True:
+                while len(pages) < REST_PREFETCH_PAGES:
+                    pages.append(pool.submit(fetch_page, next_offset))
+                    next_offset += REST_PAGE_SIZE
+                data = pages.popleft().result()
+                for row in data:
+                    iid = row.get("interaction_id")
+                    if iid and iid not in seen:
+                        seen.add(iid)
+                        ids.append(str(iid))
+                if len(data) < REST_PAGE_SIZE:
+                    # Pages speculatively requested past the end come back empty.
+                    for fut in pages:
+                        fut.cancel()
+                    break
+    finally:
+        for reader in readers:
+            reader.close()
     return ids
 
 
-def _list_unsegmented_interactions(base_url: str, service_key: str) -> list[str]:
+class RpcMissingError(RuntimeError):
+    """The candidate RPC is not deployed on this project (migration not applied)."""
+
+
+def _iter_unsegmented_interactions(base_url: str, service_key: str) -> Iterator[str]:
+    """Stream candidates from the list_unsegmented_interactions RPC, one keyset page at a time."""
+    reader = RestReader(base_url, _rest_headers(service_key))
+    path = f"/rest/v1/rpc/{CANDIDATES_RPC}"
+    after: str | None = None
+    try:
+        while True:
+            status, data = reader.request("POST", path, {"p_after": after, "p_limit": REST_PAGE_SIZE})
+            if status == 404 and after is None:
+                raise RpcMissingError(f"{CANDIDATES_RPC}: HTTP 404 {data}")
+            if status == 0:
+                raise RuntimeError(f"Failed to call {CANDIDATES_RPC}: {data.get('error', 'unknown_error')}")
+            if status >= 400:
+                raise RuntimeError(f"Failed to call {CANDIDATES_RPC}: HTTP {status} {data}")
+            if not isinstance(data, list):
+                return
+
+            batch = [str(row.get("interaction_id")) for row in data if row.get("interaction_id")]
+            yield from batch
+            if len(data) < REST_PAGE_SIZE or not batch:
+                return
+            after = batch[-1]
+    finally:
+        reader.close()
+
+
+def _list_unsegmented_interactions_client_side(base_url: str, service_key: str) -> list[str]:
     all_interactions = _fetch_table_ids(base_url, service_key, "interactions")
     active_spans = set(
         _fetch_table_ids(
@@ -156,11 +337,145 @@ def _list_unsegmented_interactions(base_url: str, service_key: str) -> list[str]
             service_key,
             "conversation_spans",
             where="is_superseded=eq.false",
+            order="interaction_id.asc,id.asc",
         )
     )
     return [iid for iid in all_interactions if iid not in active_spans]
 
 
+def _list_unsegmented_interactions(base_url: str, service_key: str, *, stop_after: int = 0) -> list[str]:
+    """Candidates in interaction_id order; stop_after > 0 ends discovery once that many are found."""
+    try:
+        stream = _iter_unsegmented_interactions(base_url, service_key)
+        return list(itertools.islice(stream, stop_after) if stop_after > 0 else stream)
+    except RpcMissingError:
+        print(
+            f"WARN: {CANDIDATES_RPC} RPC not found; falling back to client-side candidate diff",
+            file=sys.stderr,
+        )
+        return _list_unsegmented_interactions_client_side(base_url, service_key)
+
+
+def _fetch_candidate_features(base_url: str, service_key: str, candidates: list[str]) -> list[Candidate]:
+    """Scheduling features for each candidate, FEATURES_BATCH ids per RPC call."""
+    reader = RestReader(base_url, _rest_headers(service_key))
+    path = f"/rest/v1/rpc/{FEATURES_RPC}"
+    rows: dict[str, dict[str, Any]] = {}
+    try:
+        for start in range(0, len(candidates), FEATURES_BATCH):
+            status, data = reader.request("POST", path, {"p_interaction_ids": candidates[start : start + FEATURES_BATCH]})
+            if status == 404 and start == 0:
+                raise RpcMissingError(f"{FEATURES_RPC}: HTTP 404 {data}")
+            if status == 0:
+                raise RuntimeError(f"Failed to call {FEATURES_RPC}: {data.get('error', 'unknown_error')}")
+            if status >= 400:
+                raise RuntimeError(f"Failed to call {FEATURES_RPC}: HTTP {status} {data}")
+            for row in data if isinstance(data, list) else []:
+                if row.get("interaction_id"):
+                    rows[str(row["interaction_id"])] = row
+    finally:
+        reader.close()
+
+    features: list[Candidate] = []
+    for iid in candidates:
+        row = rows.get(iid, {})
+        transcript_bytes = int(row.get("transcript_bytes") or 0)
+        features.append(
+            Candidate(
+                interaction_id=iid,
+                event_at_utc=str(row.get("event_at_utc") or ""),
+                transcript_bytes=transcript_bytes,
+                open_review_items=int(row.get("open_review_items") or 0),
+                est_cost_s=estimate_cost_s(transcript_bytes),
+            )
+        )
+    return features
+
+
+def _write_schedule_artifacts(output_dir: Path, ordered: list[Candidate], args: argparse.Namespace) -> dict[str, Any]:
+    """schedule.csv and completion_curve.csv for the chosen order; returns the summary.json entry."""
+    per_minute = max(args.max_per_minute, 0.01)
+    timings = simulate(ordered, workers=args.workers, per_minute=per_minute, burst=args.burst)
+    baseline = sorted(ordered, key=lambda c: c.interaction_id)
+    baseline_timings = simulate(baseline, workers=args.workers, per_minute=per_minute, burst=args.burst)
+    write_schedule(output_dir / SCHEDULE_NAME, ordered, timings)
+    curve = write_completion_curve(output_dir / CURVE_NAME, ordered, timings, baseline, baseline_timings)
+    return {
+        "policy": "priority",
+        "weights": args.priority_weights,
+        "recency_half_life_days": args.recency_half_life_days,
+        **curve,
+    }
+
+
+def _drop_torn_row(csv_path: Path) -> None:
+    """Cut an interrupted final row so rows appended on resume start on a line of their own."""
+    with csv_path.open("rb+") as fh:
+        end = pos = fh.seek(0, os.SEEK_END)
+        keep = 0
+        while pos > 0:
+            start = max(0, pos - 4096)
+            fh.seek(start)
+            newline = fh.read(pos - start).rfind(b"\n")
+            if newline >= 0:
+                keep = start + newline + 1
+                break
+            pos = start
+        if keep < end:
+            fh.truncate(keep)
+
+
+def _read_prior_results(csv_path: Path) -> PriorResults:
+    prior = PriorResults(last_result={}, attempts={})
+    if not csv_path.exists():
+        return prior
+    with csv_path.open("r", newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            iid = (row.get("interaction_id") or "").strip()
+            result = (row.get("result") or "").strip()
+            try:
+                index = int(row.get("index") or "")
+            except ValueError:
+                continue
+            if not iid or not result:
+                continue
+            prior.last_result[iid] = result
+            prior.attempts[iid] = prior.attempts.get(iid, 0) + 1
+            prior.max_index = max(prior.max_index, index)
+    return prior
+
+
+def _load_run_meta(output_dir: Path) -> dict[str, Any]:
+    for name in (RUN_META_NAME, "summary.json"):
+        path = output_dir / name
+        if path.exists():
+            meta = json.loads(path.read_text(encoding="utf-8"))
+            if meta.get("timestamp_utc") and meta.get("mode"):
+                return meta
+    raise RuntimeError(f"cannot resume {output_dir}: no {RUN_META_NAME} or summary.json")
+
+
+def _backoff_delay(attempt: int, base_s: float) -> float:
+    """Exponential backoff with equal jitter before retry `attempt` (2, 3, ...)."""
+    delay = min(RETRY_MAX_DELAY_S, base_s * 2 ** (attempt - 2))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _classify_failure(status: int, data: Any) -> str:
+    """'transient' (retry/requeue), 'permanent' or 'fatal' for a failed admin-reseed call."""
+    code = data.get("error") if isinstance(data, dict) else None
+    if code in PERMANENT_ERROR_CODES:
+        return "permanent"
+    # Bad credentials, a missing claim, or no admin-reseed route at this URL: every
+    # call will fail the same way until the config is fixed, so the run stops. The
+    # interaction itself is not at fault and stays retryable on --resume.
+    if status in (401, 403, 404, 405):
+        return "fatal"
+    # Everything else -- no response, timeouts, throttling, server errors, other 4xx,
+    # and a 200 replaying a stored failure receipt -- may succeed on a later attempt.
+    return "transient"
+
+
 def _call_admin_reseed(
     *,
     base_url: str,
@@ -172,7 +487,8 @@ def _call_admin_reseed(
     mode: str,
     reason: str,
     idempotency_prefix: str,
-) -> tuple[str, int, dict[str, Any], float]:
+    attempt: int = 1,
+) -> Outcome:
     headers = {
         "apikey": service_key,
         "Authorization": f"Bearer {service_key}",
@@ -181,17 +497,23 @@ def _call_admin_reseed(
         "X-Origin-Session": origin_session,
         "X-Claim-Receipt": claim_receipt,
     }
+    # admin-reseed replays any logged receipt for a known key, failures included, so
+    # retries need their own key. Keys stay deterministic per attempt number, so a
+    # resumed run replays calls that completed but were never journaled.
+    idempotency_key = f"{idempotency_prefix}:{interaction_id}"
+    if attempt > 1:
+        idempotency_key += f":attempt{attempt}"
     payload = {
         "interaction_id": interaction_id,
         "reason": reason,
-        "idempotency_key": f"{idempotency_prefix}:{interaction_id}",
+        "idempotency_key": idempotency_key,
         "mode": mode,
         "requested_by": origin_session,
         "claim_receipt": claim_receipt,
     }
     url = f"{base_url}/functions/v1/admin-reseed"
     t0 = time.time()
-    status, data = _json_request(url, method="POST", headers=headers, payload=payload, timeout=180)
+    status, data = _json_request(url, method="POST", headers=headers, payload=payload, timeout=ADMIN_RESEED_TIMEOUT_S)
     elapsed = (time.time() - t0) * 1000.0
 
     if status == 200 and isinstance(data, dict) and data.get("ok") is True:
@@ -200,7 +522,8 @@ def _call_admin_reseed(
     if status == 409 and isinstance(data, dict) and data.get("error") == "human_lock_present":
         return "skipped_human_lock", status, data, elapsed
 
-    return "failed", status, data if isinstance(data, dict) else {"raw": data}, elapsed
+    result = "failed_permanent" if _classify_failure(status, data) == "permanent" else "failed"
+    return result, status, data if isinstance(data, dict) else {"raw": data}, elapsed
 
 
 def _parse_args() -> argparse.Namespace:
@@ -215,9 +538,34 @@ def _parse_args() -> argparse.Namespace:
         "--max-per-minute",
         type=float,
         default=5.0,
-        help="Max admin-reseed calls per minute (default: 5)",
+        help="Max admin-reseed calls per minute across all workers (default: 5)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent admin-reseed calls (default: 1); the rate limit is shared",
+    )
+    parser.add_argument(
+        "--burst",
+        type=float,
+        default=1.0,
+        help="Calls the rate limiter may bank while workers are busy (default: 1, no burst)",
     )
     parser.add_argument("--progress-every", type=int, default=50, help="Progress interval (default: 50)")
+    parser.add_argument(
+        "--status-every",
+        type=float,
+        default=DEFAULT_STATUS_EVERY_S,
+        help=f"Seconds between {STATUS_NAME} rewrites; 0 = only at start and end "
+        f"(default: {DEFAULT_STATUS_EVERY_S:g})",
+    )
+    parser.add_argument(
+        "--status-port",
+        type=int,
+        default=0,
+        help="Also serve live status as JSON on http://127.0.0.1:PORT/status (default: off)",
+    )
     parser.add_argument("--limit", type=int, default=0, help="Optional cap on number of candidates")
     parser.add_argument("--offset", type=int, default=0, help="Skip first N candidates")
     parser.add_argument("--dry-run", action="store_true", help="List candidates only; do not call admin-reseed")
@@ -231,6 +579,44 @@ def _parse_args() -> argparse.Namespace:
         default="",
         help="Optional output directory. Default: artifacts/reseed_backfill_<timestamp>",
     )
+    parser.add_argument(
+        "--resume",
+        default="",
+        metavar="OUTPUT_DIR",
+        help="Continue a prior run: skip interactions already success/skipped_human_lock in its "
+        "results.csv, retry failed ones, and append to the same results.csv",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=0,
+        help=f"Calls per interaction before it counts as failed (default: 1, or {RESUME_MAX_ATTEMPTS} with --resume)",
+    )
+    parser.add_argument(
+        "--retry-base-seconds",
+        type=float,
+        default=5.0,
+        help="First retry backoff; doubles per attempt with jitter, capped at 300s (default: 5)",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=["id", "priority"],
+        default="id",
+        help="Candidate order: interaction_id (default) or cost-aware priority "
+        f"(writes {SCHEDULE_NAME} and {CURVE_NAME})",
+    )
+    parser.add_argument(
+        "--priority-weights",
+        default=DEFAULT_WEIGHTS,
+        help=f"Weights for --schedule priority; omitted keys are 0 (default: {DEFAULT_WEIGHTS})",
+    )
+    parser.add_argument(
+        "--recency-half-life-days",
+        type=float,
+        default=DEFAULT_HALF_LIFE_DAYS,
+        help=f"Age at which the recency score halves (default: {DEFAULT_HALF_LIFE_DAYS:g})",
+    )
+    add_rate_control_args(parser)
     return parser.parse_args()
 
 
@@ -243,33 +629,100 @@ def main() -> int:
         edge_secret = _require_env("EDGE_SHARED_SECRET")
         origin_session = _require_claim_env("ORIGIN_SESSION")
         claim_receipt = _require_claim_env("CLAIM_RECEIPT")
+        check_rate_control_args(args)
+        if args.workers < 1:
+            raise RuntimeError("--workers must be >= 1")
+        if args.burst < 1:
+            raise RuntimeError("--burst must be >= 1")
+        if args.max_attempts < 0:
+            raise RuntimeError("--max-attempts must be >= 1 (0 = default)")
+        if args.status_every < 0:
+            raise RuntimeError("--status-every must be >= 0")
+        if not 0 <= args.status_port <= 65535:
+            raise RuntimeError("--status-port must be a TCP port (0 = off)")
+        if args.recency_half_life_days <= 0:
+            raise RuntimeError("--recency-half-life-days must be > 0")
+        try:
+            weights = parse_weights(args.priority_weights)
+        except ValueError as exc:
+            raise RuntimeError(str(exc)) from None
+        if args.resume and args.output_dir:
+            raise RuntimeError("--resume writes into the resumed directory; drop --output-dir")
+        prior = PriorResults(last_result={}, attempts={})
+        if args.resume:
+            output_dir = Path(args.resume)
+            meta = _load_run_meta(output_dir)
+            stamp = str(meta["timestamp_utc"])
+            args.mode = str(meta["mode"])
+            args.reason = str(meta.get("reason") or args.reason)
+            if (output_dir / "results.csv").exists():
+                # A run killed mid-write leaves a partial last row; it is retried like any unfinished call.
+                _drop_torn_row(output_dir / "results.csv")
+            prior = _read_prior_results(output_dir / "results.csv")
+        else:
+            stamp = _utc_stamp()
+            output_dir = Path(args.output_dir) if args.output_dir else Path("artifacts") / f"reseed_backfill_{stamp}"
     except RuntimeError as exc:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 2
 
-    stamp = _utc_stamp()
-    output_dir = Path(args.output_dir) if args.output_dir else Path("artifacts") / f"reseed_backfill_{stamp}"
+    max_attempts = args.max_attempts or (RESUME_MAX_ATTEMPTS if args.resume else 1)
     output_dir.mkdir(parents=True, exist_ok=True)
+    if not args.resume:
+        run_meta = {"timestamp_utc": stamp, "mode": args.mode, "reason": args.reason}
+        (output_dir / RUN_META_NAME).write_text(json.dumps(run_meta, indent=2) + "\n", encoding="utf-8")
 
     csv_path = output_dir / "results.csv"
     failures_path = output_dir / "failed_interactions.txt"
     summary_path = output_dir / "summary.json"
+    status_path = output_dir / STATUS_NAME
 
     print("=== admin-reseed batch orchestrator ===")
     print(f"timestamp: {stamp}")
+    if args.resume:
+        completed = len(prior.completed)
+        print(f"resume: {len(prior.last_result)} interactions in results.csv, {completed} complete")
     print(f"mode: {args.mode}")
     print(f"max_per_minute: {args.max_per_minute}")
+    print(f"workers: {args.workers}")
+    print(f"max_attempts: {max_attempts}")
+    print(f"adaptive_rate: {args.adaptive_rate}")
+    print(f"schedule: {args.schedule}" + (f" ({args.priority_weights})" if args.schedule == "priority" else ""))
     print(f"progress_every: {args.progress_every}")
     print(f"output_dir: {output_dir}")
     print(f"origin_session: {origin_session}")
     print(f"claim_receipt: {claim_receipt}")
 
     try:
-        candidates = _list_unsegmented_interactions(base_url, service_key)
+        # Priority order needs every candidate before offset/limit can be applied.
+        full_discovery = args.resume or args.schedule == "priority"
+        stop_after = args.offset + args.limit if args.limit > 0 and not full_discovery else 0
+        candidates = _list_unsegmented_interactions(base_url, service_key, stop_after=stop_after)
     except Exception as exc:
         print(f"ERROR: failed to list candidates: {exc}", file=sys.stderr)
         return 1
 
+    if args.resume:
+        # Human-locked interactions still have no active spans; don't call them again.
+        completed_ids = prior.completed
+        candidates = [iid for iid in candidates if iid not in completed_ids]
+
+    scheduled: dict[str, Candidate] = {}
+    if args.schedule == "priority" and candidates:
+        try:
+            features = _fetch_candidate_features(base_url, service_key, candidates)
+        except RpcMissingError:
+            print(f"WARN: {FEATURES_RPC} RPC not found; keeping interaction_id order", file=sys.stderr)
+        except Exception as exc:
+            print(f"ERROR: failed to read candidate features: {exc}", file=sys.stderr)
+            return 1
+        else:
+            ordered = prioritize(
+                features, weights, half_life_days=args.recency_half_life_days, workers=args.workers
+            )
+            scheduled = {c.interaction_id: c for c in ordered}
+            candidates = [c.interaction_id for c in ordered]
+
     if args.offset > 0:
         candidates = candidates[args.offset :]
     if args.limit > 0:
@@ -278,6 +731,16 @@ def main() -> int:
     stats = RunStats(total_candidates=len(candidates))
     print(f"candidates_without_active_spans: {stats.total_candidates}")
 
+    schedule_summary: dict[str, Any] | None = None
+    if scheduled and candidates:
+        schedule_summary = _write_schedule_artifacts(output_dir, [scheduled[iid] for iid in candidates], args)
+        print(
+            f"schedule: wrote {output_dir / SCHEDULE_NAME}; expected duration "
+            f"{schedule_summary['expected_duration_s']:.0f}s, half the priority value by "
+            f"{schedule_summary['value_50pct_s']:.0f}s "
+            f"(interaction_id order: {schedule_summary['id_order_value_50pct_s']:.0f}s)"
+        )
+
     if stats.total_candidates == 0:
         print("Nothing to do.")
         return 0
@@ -288,80 +751,160 @@ def main() -> int:
         print(f"dry-run complete: wrote candidate list to {dry_run_file}")
         return 0
 
-    min_interval_s = 60.0 / max(args.max_per_minute, 0.01)
+    # One token bucket enforces --max-per-minute across all workers.
+    rate = controller_from_args(
+        args,
+        concurrency=args.workers,
+        per_minute=max(args.max_per_minute, 0.01),
+        log_dir=output_dir,
+        label="reseed_rate",
+        burst=args.burst,
+    )
+    breaker = breaker_from_args(args, log_dir=output_dir, label="reseed_breaker")
+    telemetry = Telemetry(
+        total=stats.total_candidates,
+        status_path=status_path,
+        rate=rate,
+        breaker=breaker,
+        every_s=args.status_every,
+        port=args.status_port,
+    )
     idempotency_prefix = f"backfill:{stamp}"
     failures: list[str] = []
-
-    with csv_path.open("w", newline="", encoding="utf-8") as csv_file:
+    # Set by the first auth/route failure; no further calls are started after it.
+    abort_reason: list[str] = []
+    aborted = threading.Event()
+    # Resumed rows continue the prior numbering; an interaction keeps one index across its attempts.
+    index_base = prior.max_index
+    append = bool(args.resume) and csv_path.exists() and csv_path.stat().st_size > 0
+
+    with telemetry, csv_path.open("a" if append else "w", newline="", encoding="utf-8") as csv_file:
         writer = csv.writer(csv_file)
-        writer.writerow(
-            [
-                "index",
-                "interaction_id",
-                "result",
-                "http_status",
-                "latency_ms",
-                "error",
-            ]
-        )
-
-        for index, interaction_id in enumerate(candidates, start=1):
-            request_t0 = time.time()
-            result, http_status, response_data, latency_ms = _call_admin_reseed(
-                base_url=base_url,
-                service_key=service_key,
-                edge_secret=edge_secret,
-                origin_session=origin_session,
-                claim_receipt=claim_receipt,
-                interaction_id=interaction_id,
-                mode=args.mode,
-                reason=args.reason,
-                idempotency_prefix=idempotency_prefix,
-            )
+        if not append:
+            writer.writerow(RESULTS_FIELDS)
+
+        def reseed_one(interaction_id: str) -> list[Outcome]:
+            # Attempt numbers continue from earlier runs so retry keys never repeat.
+            first_attempt = prior.attempts.get(interaction_id, 0) + 1
+            outcomes: list[Outcome] = []
+            for attempt in range(first_attempt, first_attempt + max_attempts):
+                if outcomes:
+                    time.sleep(_backoff_delay(len(outcomes) + 1, args.retry_base_seconds))
+                if aborted.is_set():
+                    break
+                with guarded_call(rate, breaker) as call:
+                    outcome = _call_admin_reseed(
+                        base_url=base_url,
+                        service_key=service_key,
+                        edge_secret=edge_secret,
+                        origin_session=origin_session,
+                        claim_receipt=claim_receipt,
+                        interaction_id=interaction_id,
+                        mode=args.mode,
+                        reason=args.reason,
+                        idempotency_prefix=idempotency_prefix,
+                        attempt=attempt,
+                    )
+                    call.status, call.latency_s = outcome[1], outcome[3] / 1000.0
+                telemetry.record_call(outcome[1], outcome[3])
+                outcomes.append(outcome)
+                if outcome[0] == "failed" and _classify_failure(outcome[1], outcome[2]) == "fatal":
+                    if not aborted.is_set():
+                        abort_reason.append(f"admin-reseed answered HTTP {outcome[1]} for {interaction_id}")
+                        aborted.set()
+                    break
+                # Only transient failures are retried.
+                if outcome[0] != "failed":
+                    break
+            return outcomes
+
+        def record(position: int, interaction_id: str, outcomes: list[Outcome]) -> None:
+            for result, http_status, response_data, latency_ms in outcomes:
+                error_text = ""
+                if result == "skipped_human_lock":
+                    error_text = "human_lock_present"
+                elif result in ("failed", "failed_permanent"):
+                    error_text = json.dumps(response_data, separators=(",", ":"), ensure_ascii=True)[:400]
+                writer.writerow(
+                    [
+                        index_base + position,
+                        interaction_id,
+                        result,
+                        http_status,
+                        round(latency_ms, 1),
+                        error_text,
+                    ]
+                )
+            csv_file.flush()
 
+            if not outcomes:
+                return  # never called: the run was aborted first
             stats.attempted += 1
-            error_text = ""
+            stats.retries += len(outcomes) - 1
+            result = outcomes[-1][0]
+            telemetry.record_done(result)
             if result == "success":
                 stats.succeeded += 1
             elif result == "skipped_human_lock":
                 stats.skipped_locked += 1
-                error_text = "human_lock_present"
             else:
                 stats.failed += 1
+                if result == "failed_permanent":
+                    stats.failed_permanent += 1
                 failures.append(interaction_id)
-                error_text = json.dumps(response_data, separators=(",", ":"), ensure_ascii=True)[:400]
-
-            writer.writerow(
-                [
-                    index,
-                    interaction_id,
-                    result,
-                    http_status,
-                    round(latency_ms, 1),
-                    error_text,
-                ]
-            )
-            csv_file.flush()
 
-            if index % max(args.progress_every, 1) == 0 or index == stats.total_candidates:
+            if position % max(args.progress_every, 1) == 0 or position == stats.total_candidates:
                 print(
                     "progress "
-                    f"{index}/{stats.total_candidates} | "
+                    f"{position}/{stats.total_candidates} | "
                     f"ok={stats.succeeded} "
                     f"locked={stats.skipped_locked} "
-                    f"failed={stats.failed}"
+                    f"failed={stats.failed} "
+                    f"permanent={stats.failed_permanent} | "
+                    f"{telemetry.brief()}"
+                    + (f" breaker={breaker.state}" if breaker is not None and breaker.state != "closed" else "")
+                    + (f" rate={rate.per_minute:.1f}/min workers={rate.concurrency}" if args.adaptive_rate else "")
                 )
 
-            elapsed_s = time.time() - request_t0
-            sleep_s = min_interval_s - elapsed_s
-            if sleep_s > 0:
-                time.sleep(sleep_s)
+        # Workers finish out of order; completed calls wait in `finished` until every
+        # earlier candidate is written, so results.csv stays in candidate order.
+        # The lookahead covers everything the rate budget allows during one
+        # maximal-length call, so a single slow call never stalls dispatch.
+        pending = iter(enumerate(candidates, start=1))
+        in_flight: dict[Future, int] = {}
+        finished: dict[int, list[Outcome]] = {}
+        next_index = 1
+        submit_ahead = rate.max_workers + math.ceil(rate.max_per_minute * ADMIN_RESEED_TIMEOUT_S / 60.0)
+        with ThreadPoolExecutor(max_workers=rate.max_workers) as pool:
+            while True:
+                while not aborted.is_set() and len(in_flight) + len(finished) < submit_ahead:
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                    in_flight[pool.submit(reseed_one, item[1])] = item[0]
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    finished[in_flight.pop(fut)] = fut.result()
+                while next_index in finished:
+                    record(next_index, candidates[next_index - 1], finished.pop(next_index))
+                    next_index += 1
+            # After an abort, calls that never started leave gaps; write every call that was made.
+            for position in sorted(finished):
+                if finished[position]:
+                    record(position, candidates[position - 1], finished[position])
+        if aborted.is_set():
+            telemetry.state = "aborted"
 
     failures_path.write_text("\n".join(failures) + ("\n" if failures else ""), encoding="utf-8")
 
     summary = {
         "timestamp_utc": stamp,
         "mode": args.mode,
+        "reason": args.reason,
+        "resumed_at_utc": _utc_stamp() if args.resume else None,
+        "previously_completed": len(prior.completed),
         "max_per_minute": args.max_per_minute,
         "progress_every": args.progress_every,
         "origin_session": origin_session,
@@ -371,18 +914,32 @@ def main() -> int:
         "succeeded": stats.succeeded,
         "skipped_human_lock": stats.skipped_locked,
         "failed": stats.failed,
+        "failed_permanent": stats.failed_permanent,
+        "retries": stats.retries,
+        "aborted": abort_reason[0] if abort_reason else None,
+        "max_attempts": max_attempts,
         "results_csv": str(csv_path),
         "failed_ids_file": str(failures_path),
+        "status_json": str(status_path),
     }
+    if args.adaptive_rate:
+        summary["rate_control"] = rate.summary()
+    if breaker is not None:
+        summary["circuit_breaker"] = breaker.summary()
+    if schedule_summary is not None:
+        summary["schedule"] = schedule_summary
     summary_path.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
 
-    print("=== complete ===")
+    print("=== aborted ===" if abort_reason else "=== complete ===")
     print(json.dumps(summary, indent=2))
-    if stats.failed > 0:
+    if abort_reason:
         print(
-            "retry guidance: rerun with --offset/--limit and failed_interactions list from "
-            f"{failures_path}"
+            f"ERROR: {abort_reason[0]}; check SUPABASE_URL and credentials, then rerun with --resume {output_dir}",
+            file=sys.stderr,
         )
+        return 1
+    if stats.failed > 0:
+        print(f"retry guidance: rerun with --resume {output_dir} (failed ids: {failures_path})")
     return 0
 
 
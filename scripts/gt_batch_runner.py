@@ -20,60 +20,126 @@ Input format (gt_batch_v1.csv or gt_batch_v1.json):
 from __future__ import annotations
 
 import argparse
+import array
+import contextlib
 import csv
 import datetime as dt
+import hashlib
+import itertools
 import json
+import math
+import operator
 import os
 import re
+import secrets
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from gt_db import Database, database_from_env
+from gt_rate_control import (
+    AdaptiveRateController,
+    CircuitBreaker,
+    add_rate_control_args,
+    breaker_from_args,
+    check_rate_control_args,
+    controller_from_args,
+    guarded_call,
+)
+from gt_records import Record, intern_decision, json_default, record
+from gt_run_index import INDEX_NAME, RunIndex, dominant, file_sha256, parse_match
+
+try:  # optional, only needed for --format parquet/arrow
+    import pyarrow as pa  # type: ignore[import-not-found]
+    import pyarrow.parquet as pq  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on local install
+    pa = None
+    pq = None
 
 ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
 DECISION_ALLOWED = {"assign", "review", "none", ""}
 
-INPUT_FIELDS = [
-    "row_id",
-    "interaction_id",
-    "span_index",
-    "span_id",
-    "expected_project_id",
-    "expected_project_name_contains",
-    "expected_decision",
-    "notes",
-    "tags",
-]
 
-RESULT_FIELDS = [
-    "row_id",
+@record
+class InputRow(Record):
+    row_id: str = ""
+    interaction_id: str = ""
+    span_index: str = ""
+    span_id: str = ""
+    expected_project_id: str = ""
+    expected_project_name_contains: str = ""
+    expected_decision: str = ""
+    notes: str = ""
+    tags: str = ""
+
+
+@record
+class Actual(Record):
+    """What the pipeline produced for one span selector (query_row_actual() shape)."""
+
+    resolved_span_id: str = ""
+    resolved_span_index: str = ""
+    char_start: str = ""
+    char_end: str = ""
+    actual_project_id: str = ""
+    actual_project_name: str = ""
+    actual_decision: str = ""
+    actual_confidence: str = ""
+    actual_prompt_version: str = ""
+    actual_model_id: str = ""
+    actual_reason_codes: str = ""
+    actual_reasoning: str = ""
+    error: str = ""
+
+
+@record
+class GtResult(Record):
+    row_id: str = ""
+    interaction_id: str = ""
+    run_interaction_id: str = ""
+    span_selector: str = ""
+    resolved_span_id: str = ""
+    resolved_span_index: str = ""
+    expected_project_id: str = ""
+    expected_project_name_contains: str = ""
+    expected_decision: str = ""
+    actual_project_id: str = ""
+    actual_project_name: str = ""
+    actual_decision: str = ""
+    actual_confidence: str = ""
+    actual_prompt_version: str = ""
+    actual_model_id: str = ""
+    actual_reason_codes: str = ""
+    actual_reasoning: str = ""
+    char_start: str = ""
+    char_end: str = ""
+    has_expectation: str = ""
+    is_correct: str = ""
+    error: str = ""
+    notes: str = ""
+    tags: str = ""
+
+
+INPUT_FIELDS = list(InputRow.FIELDS)
+RESULT_FIELDS = list(GtResult.FIELDS)
+ACTUAL_VALUE_FIELDS = tuple(f for f in Actual.FIELDS if f != "error")
+
+READINESS_FIELDS = [
     "interaction_id",
     "run_interaction_id",
-    "span_selector",
-    "resolved_span_id",
-    "resolved_span_index",
-    "expected_project_id",
-    "expected_project_name_contains",
-    "expected_decision",
-    "actual_project_id",
-    "actual_project_name",
-    "actual_decision",
-    "actual_confidence",
-    "actual_prompt_version",
-    "actual_model_id",
-    "actual_reason_codes",
-    "actual_reasoning",
-    "char_start",
-    "char_end",
-    "has_expectation",
-    "is_correct",
-    "error",
-    "notes",
-    "tags",
+    "state",
+    "waited_seconds",
+    "span_count",
+    "attributed_count",
 ]
 
+JOURNAL_NAME = "run_journal.jsonl"
+
 TRIGGER_FIELDS = [
     "interaction_id",
     "run_interaction_id",
@@ -86,6 +152,40 @@ TRIGGER_FIELDS = [
     "response_file",
 ]
 
+# Typed columns in --format parquet/arrow output; every other column is a string.
+COLUMN_TYPES = {
+    "resolved_span_index": "int64",
+    "char_start": "int64",
+    "char_end": "int64",
+    "actual_confidence": "float64",
+    "has_expectation": "bool",
+    "is_correct": "bool",
+    "ok": "bool",
+    "http_status": "int64",
+}
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+FLIP_FIELDS = [
+    "row_id",
+    "interaction_id",
+    "span_selector",
+    "change",
+    "expected_decision",
+    "expected_project_id",
+    "baseline_is_correct",
+    "current_is_correct",
+    "baseline_decision",
+    "current_decision",
+    "baseline_project_id",
+    "current_project_id",
+    "baseline_project_name",
+    "current_project_name",
+]
+
+MULTI_PROJECT_MARKERS = ("multi_project", "multi-project", "needs_resegment", "mixed span")
+NO_PROJECT_LABEL = "(none)"
+TAG_SPLIT_RE = re.compile(r"[;,\s]+")
+
 
 def utc_stamp() -> str:
     return dt.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
@@ -102,26 +202,6 @@ def sql_quote(text: str) -> str:
     return "'" + text.replace("'", "''") + "'"
 
 
-def run_psql_sql(database_url: str, psql_bin: str, sql: str) -> str:
-    cmd = [
-        psql_bin,
-        database_url,
-        "-X",
-        "-v",
-        "ON_ERROR_STOP=1",
-        "-A",
-        "-t",
-        "-F",
-        "\t",
-        "-c",
-        sql,
-    ]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise RuntimeError(proc.stderr.strip() or "psql failed")
-    return proc.stdout.strip()
-
-
 def post_json(url: str, payload: dict, headers: dict, timeout: int) -> Tuple[int, object]:
     payload_json = json.dumps(payload)
     cmd = [
@@ -177,78 +257,237 @@ def normalize_field(value: object) -> str:
     return str(value).strip()
 
 
-def load_rows(input_path: Path) -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
+JSON_READ_CHUNK = 1 << 16
+JSON_NUMBER_CHARS = frozenset("0123456789+-.eE")
+encode_json_str = json.encoder.encode_basestring_ascii
+
+
+def iter_json_array(fh: IO[str], chunk_size: int = JSON_READ_CHUNK) -> Iterator[Any]:
+    """Yield the elements of a JSON array (or of {"rows": [...]}) read incrementally.
+
+    Only the element being decoded is buffered, so memory does not grow with the
+    size of the array.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ""
+
+    def decode_value() -> Any:
+        nonlocal pos
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as exc:
+                if fill():
+                    continue
+                raise RuntimeError(f"invalid json input: {exc}") from exc
+            # A number may continue past the chunk boundary: "2." or "1e" decodes as 2 or 1.
+            at_edge = end == len(buf) or buf[end] in JSON_NUMBER_CHARS
+            if at_edge and not eof and isinstance(value, (int, float)) and fill():
+                continue
+            pos = end
+            return value
+
+    def expect(chars: str) -> str:
+        nonlocal pos
+        ch = next_char()
+        if not ch or ch not in chars:
+            raise RuntimeError("json input must be an array or {\"rows\": [...]}")
+        pos += 1
+        return ch
+
+    opener = expect("[{")
+    if opener == "{":
+        while True:
+            if next_char() == "}":
+                raise RuntimeError("json input must be an array or {\"rows\": [...]}")
+            key = decode_value()
+            expect(":")
+            if key == "rows" and next_char() == "[":
+                pos += 1
+                break
+            decode_value()
+            expect(",")
+
+    if next_char() == "]":
+        return
+    while True:
+        yield decode_value()
+        if expect(",]") == "]":
+            return
+
+
+def _raw_input_rows(input_path: Path, fh: IO[str]) -> Iterator[Dict[str, Any]]:
     suffix = input_path.suffix.lower()
-
     if suffix == ".json":
-        payload = json.loads(input_path.read_text(encoding="utf-8"))
-        if isinstance(payload, dict) and isinstance(payload.get("rows"), list):
-            payload = payload["rows"]
-        if not isinstance(payload, list):
-            raise RuntimeError("json input must be an array or {\"rows\": [...]}")
-        for idx, raw in enumerate(payload, start=1):
+        for idx, raw in enumerate(iter_json_array(fh), start=1):
             if not isinstance(raw, dict):
                 raise RuntimeError(f"json row {idx} is not an object")
-            row = {k: normalize_field(raw.get(k, "")) for k in INPUT_FIELDS}
-            if not row["row_id"]:
-                row["row_id"] = f"row_{idx:04d}"
-            rows.append(row)
-    elif suffix == ".csv":
-        with input_path.open("r", encoding="utf-8", newline="") as fh:
-            reader = csv.DictReader(fh)
-            if reader.fieldnames is None:
-                raise RuntimeError("csv input is missing header")
-            normalized_headers = {h.strip() for h in reader.fieldnames if h}
-            if "interaction_id" not in normalized_headers:
-                raise RuntimeError("csv input must include interaction_id header")
-            for idx, raw in enumerate(reader, start=1):
-                row = {k: normalize_field(raw.get(k, "")) for k in INPUT_FIELDS}
-                if not row["row_id"]:
-                    row["row_id"] = f"row_{idx:04d}"
-                rows.append(row)
+            yield raw
     else:
+        reader = csv.DictReader(fh)
+        if reader.fieldnames is None:
+            raise RuntimeError("csv input is missing header")
+        normalized_headers = {h.strip() for h in reader.fieldnames if h}
+        if "interaction_id" not in normalized_headers:
+            raise RuntimeError("csv input must include interaction_id header")
+        yield from reader
+
+
+def iter_input_rows(input_path: Path) -> Iterator[InputRow]:
+    """Read, normalize and validate input rows one at a time."""
+    suffix = input_path.suffix.lower()
+    if suffix not in {".json", ".csv"}:
         raise RuntimeError("input must be .csv or .json")
 
-    if not rows:
+    idx = 0
+    with input_path.open("r", encoding="utf-8", newline="" if suffix == ".csv" else None) as fh:
+        for idx, raw in enumerate(_raw_input_rows(input_path, fh), start=1):
+            row = InputRow(*[normalize_field(raw.get(k, "")) for k in INPUT_FIELDS])
+            if not row.row_id:
+                row.row_id = f"row_{idx:04d}"
+            # Interaction ids and labels repeat across spans; rows share one string each.
+            row.interaction_id = sys.intern(row.interaction_id)
+            row.expected_project_id = sys.intern(row.expected_project_id)
+            row.expected_project_name_contains = sys.intern(row.expected_project_name_contains)
+            row.tags = sys.intern(row.tags)
+
+            iid = row.interaction_id
+            if not iid or not ID_RE.match(iid):
+                raise RuntimeError(f"row {idx}: invalid interaction_id '{iid}'")
+            if row.span_index:
+                try:
+                    int(row.span_index)
+                except ValueError as exc:
+                    raise RuntimeError(f"row {idx}: invalid span_index '{row.span_index}'") from exc
+            if row.span_id and not ID_RE.match(row.span_id):
+                raise RuntimeError(f"row {idx}: invalid span_id '{row.span_id}'")
+
+            decision = intern_decision(row.expected_decision.lower())
+            if decision not in DECISION_ALLOWED:
+                raise RuntimeError(
+                    f"row {idx}: expected_decision must be one of assign|review|none (got '{row.expected_decision}')"
+                )
+            row.expected_decision = decision
+            yield row
+
+    if idx == 0:
         raise RuntimeError("input has no rows")
 
-    for idx, row in enumerate(rows, start=1):
-        iid = row["interaction_id"]
-        if not iid or not ID_RE.match(iid):
-            raise RuntimeError(f"row {idx}: invalid interaction_id '{iid}'")
-        if row["span_index"]:
-            try:
-                int(row["span_index"])
-            except ValueError as exc:
-                raise RuntimeError(f"row {idx}: invalid span_index '{row['span_index']}'") from exc
-        if row["span_id"] and not ID_RE.match(row["span_id"]):
-            raise RuntimeError(f"row {idx}: invalid span_id '{row['span_id']}'")
-
-        decision = row["expected_decision"].lower()
-        if decision not in DECISION_ALLOWED:
-            raise RuntimeError(
-                f"row {idx}: expected_decision must be one of assign|review|none (got '{row['expected_decision']}')"
-            )
-        row["expected_decision"] = decision
 
-    return rows
+def load_rows(input_path: Path) -> List[InputRow]:
+    return list(iter_input_rows(input_path))
+
+
+def iter_normalized_rows(path: Path) -> Iterator[InputRow]:
+    """Stream rows back from a run's input_normalized.json."""
+    with path.open("r", encoding="utf-8") as fh:
+        for raw in iter_json_array(fh):
+            row = InputRow.from_mapping(raw)
+            row.expected_decision = intern_decision(row.expected_decision)
+            yield row
+
+
+class NormalizedInputWriter:
+    """Write input_normalized.json/.csv row by row as the input is loaded.
+
+    The JSON bytes match json.dumps(rows, indent=2), so merge's byte comparison of
+    shard inputs is unaffected. Files are written under temporary names and only
+    renamed into place by commit().
+    """
+
+    def __init__(self, run_dir: Path) -> None:
+        self.json_path = run_dir / "input_normalized.json"
+        self.csv_path = run_dir / "input_normalized.csv"
+        self._json_tmp = self.json_path.with_name(self.json_path.name + ".tmp")
+        self._csv_tmp = self.csv_path.with_name(self.csv_path.name + ".tmp")
+        self._json_fh = self._json_tmp.open("w", encoding="utf-8")
+        self._csv_fh = self._csv_tmp.open("w", encoding="utf-8", newline="")
+        self._csv_writer = csv.writer(self._csv_fh)
+        self._csv_writer.writerow(INPUT_FIELDS)
+        self._row_values = operator.attrgetter(*INPUT_FIELDS)
+        self._json_keys = [f"{encode_json_str(k)}: " for k in INPUT_FIELDS]
+        self.count = 0
+
+    def write(self, row: InputRow) -> InputRow:
+        values = self._row_values(row)
+        # Values are always strings, so encode them directly rather than through
+        # the (pure-Python) indenting encoder.
+        body = ",\n    ".join([k + encode_json_str(v) for k, v in zip(self._json_keys, values)])
+        self._json_fh.write(("[\n  {\n    " if self.count == 0 else ",\n  {\n    ") + body + "\n  }")
+        self._csv_writer.writerow(values)
+        self.count += 1
+        return row
+
+    def commit(self) -> None:
+        self._json_fh.write("\n]" if self.count else "[]")
+        self.close()
+        os.replace(self._json_tmp, self.json_path)
+        os.replace(self._csv_tmp, self.csv_path)
+
+    def close(self) -> None:
+        self._json_fh.close()
+        self._csv_fh.close()
+
+    def abort(self) -> None:
+        self.close()
+        for tmp in (self._json_tmp, self._csv_tmp):
+            tmp.unlink(missing_ok=True)
+
+
+def selector_for_row(row: InputRow) -> Tuple[str, str]:
+    if row.span_id:
+        return "span_id", row.span_id
+    if row.span_index:
+        return "span_index", row.span_index
+    return "span_index", "0"
 
 
-def selector_for_row(row: Dict[str, str]) -> Tuple[str, str]:
-    if row["span_id"]:
-        return "span_id", row["span_id"]
-    if row["span_index"]:
-        return "span_index", row["span_index"]
-    return "span_index", "0"
+ACTUAL_SELECT_SQL = """
+  coalesce(ts.id::text,'') as resolved_span_id,
+  coalesce(ts.span_index::text,'') as resolved_span_index,
+  coalesce(ts.char_start::text,'') as char_start,
+  coalesce(ts.char_end::text,'') as char_end,
+  coalesce(la.project_id::text,'') as actual_project_id,
+  coalesce(p.name,'') as actual_project_name,
+  coalesce(la.decision,'') as actual_decision,
+  coalesce(la.confidence::text,'') as actual_confidence,
+  coalesce(la.prompt_version,'') as actual_prompt_version,
+  coalesce(la.model_id,'') as actual_model_id,
+  coalesce(lr.reason_codes,'') as actual_reason_codes,
+  coalesce(la.reasoning,'') as actual_reasoning
+""".strip("\n")
 
 
 def query_row_actual(
-    database_url: str,
-    psql_bin: str,
+    db: Database,
     run_interaction_id: str,
-    row: Dict[str, str],
-) -> Dict[str, str]:
+    row: InputRow,
+) -> Actual:
     selector_type, selector_value = selector_for_row(row)
 
     if selector_type == "span_id":
@@ -284,88 +523,143 @@ latest_review as (
   limit 1
 )
 select
-  coalesce(ts.id::text,''),
-  coalesce(ts.span_index::text,''),
-  coalesce(ts.char_start::text,''),
-  coalesce(ts.char_end::text,''),
-  coalesce(la.project_id::text,''),
-  coalesce(p.name,''),
-  coalesce(la.decision,''),
-  coalesce(la.confidence::text,''),
-  coalesce(la.prompt_version,''),
-  coalesce(la.model_id,''),
-  coalesce(lr.reason_codes,''),
-  coalesce(la.reasoning,'')
+{ACTUAL_SELECT_SQL}
 from target_span ts
 left join latest_attr la on la.rn = 1
 left join projects p on p.id = la.project_id
 left join latest_review lr on lr.span_id = ts.id;
 """.strip()
 
-    out = run_psql_sql(database_url, psql_bin, sql)
-    if not out:
-        return {
-            "resolved_span_id": "",
-            "resolved_span_index": "",
-            "char_start": "",
-            "char_end": "",
-            "actual_project_id": "",
-            "actual_project_name": "",
-            "actual_decision": "",
-            "actual_confidence": "",
-            "actual_prompt_version": "",
-            "actual_model_id": "",
-            "actual_reason_codes": "",
-            "actual_reasoning": "",
-            "error": "span_not_found",
-        }
+    return actual_from_record(db.fetch_one(sql))
 
-    cols = out.split("\t")
-    while len(cols) < 12:
-        cols.append("")
 
-    return {
-        "resolved_span_id": cols[0],
-        "resolved_span_index": cols[1],
-        "char_start": cols[2],
-        "char_end": cols[3],
-        "actual_project_id": cols[4],
-        "actual_project_name": cols[5],
-        "actual_decision": cols[6].lower(),
-        "actual_confidence": cols[7],
-        "actual_prompt_version": cols[8],
-        "actual_model_id": cols[9],
-        "actual_reason_codes": cols[10],
-        "actual_reasoning": cols[11],
-        "error": "",
-    }
+def empty_actual(error: str = "") -> Actual:
+    return Actual(error=error)
+
+
+def actual_from_record(record: Optional[Dict[str, object]]) -> Actual:
+    if not record:
+        return Actual(error="span_not_found")
+
+    values = {}
+    for key in ACTUAL_VALUE_FIELDS:
+        value = record.get(key)
+        if value is not None:
+            values[key] = str(value)
+    actual = Actual(**values)
+    actual.actual_decision = intern_decision(actual.actual_decision.lower())
+    return actual
+
+
+def query_actuals_batch(
+    db: Database,
+    items: List[Tuple[str, InputRow]],
+) -> List[Actual]:
+    """Resolve actuals for many (run_interaction_id, row) pairs in one round trip.
+
+    Mirrors query_row_actual() per selector: same span, attribution and review
+    ordering, one lateral lookup per VALUES row.
+    """
+    if not items:
+        return []
+
+    values: List[str] = []
+    for pos, (run_interaction_id, row) in enumerate(items):
+        selector_type, selector_value = selector_for_row(row)
+        if selector_type == "span_id":
+            span_id_sql, span_index_sql = sql_quote(selector_value), "null::int"
+        else:
+            span_id_sql, span_index_sql = "null::text", str(int(selector_value))
+        values.append(f"({pos}, {sql_quote(run_interaction_id)}, {span_id_sql}, {span_index_sql})")
+
+    sql = f"""
+with sel(row_pos, run_interaction_id, span_id, span_index) as (
+  values
+    {(","+chr(10)+"    ").join(values)}
+)
+select
+  sel.row_pos,
+{ACTUAL_SELECT_SQL}
+from sel
+join lateral (
+  select cs.id, cs.span_index, cs.char_start, cs.char_end
+  from conversation_spans cs
+  where cs.interaction_id = sel.run_interaction_id
+    and cs.is_superseded = false
+    and case
+      when sel.span_id is not null then cs.id::text = sel.span_id
+      else cs.span_index = sel.span_index
+    end
+  order by cs.created_at desc nulls last, cs.id desc
+  limit 1
+) ts on true
+left join lateral (
+  select sa.project_id, sa.decision, sa.confidence, sa.prompt_version, sa.model_id, sa.reasoning
+  from span_attributions sa
+  where sa.span_id = ts.id
+  order by coalesce(sa.attributed_at, sa.applied_at_utc) desc nulls last, sa.id desc
+  limit 1
+) la on true
+left join projects p on p.id = la.project_id
+left join lateral (
+  select rq.reason_codes::text as reason_codes
+  from review_queue rq
+  where rq.span_id = ts.id
+  order by rq.created_at desc nulls last, rq.id desc
+  limit 1
+) lr on true
+order by sel.row_pos;
+""".strip()
+
+    found = {int(rec["row_pos"]): actual_from_record(rec) for rec in db.rows(sql)}
+    return [found.get(pos) or empty_actual("span_not_found") for pos in range(len(items))]
+
+
+def resolve_actuals(
+    db: Database,
+    items: List[Tuple[str, InputRow]],
+    batch_size: int,
+) -> List[Actual]:
+    if batch_size <= 1:
+        actuals: List[Actual] = []
+        for run_interaction_id, row in items:
+            try:
+                actuals.append(query_row_actual(db, run_interaction_id, row))
+            except Exception as e:  # noqa: BLE001
+                actuals.append(empty_actual(f"query_failed:{e}"))
+        return actuals
+
+    actuals = []
+    for start in range(0, len(items), batch_size):
+        chunk = items[start : start + batch_size]
+        try:
+            actuals.extend(query_actuals_batch(db, chunk))
+        except Exception as e:  # noqa: BLE001
+            actuals.extend(empty_actual(f"query_failed:{e}") for _ in chunk)
+    return actuals
 
 
 def bool_to_str(val: bool) -> str:
     return "true" if val else "false"
 
 
-def compute_correctness(row: Dict[str, str], actual: Dict[str, str]) -> Tuple[bool, bool]:
-    has_expectation = any(
-        [
-            row["expected_project_id"] != "",
-            row["expected_project_name_contains"] != "",
-            row["expected_decision"] != "",
-        ]
+def compute_correctness(row: InputRow, actual: Actual) -> Tuple[bool, bool]:
+    has_expectation = (
+        row.expected_project_id != "" or row.expected_project_name_contains != "" or row.expected_decision != ""
     )
     if not has_expectation:
         return False, True
 
-    if actual.get("error"):
+    if actual.error:
         return True, False
 
-    expected_decision = row["expected_decision"].lower().strip()
-    expected_project_id = row["expected_project_id"].strip()
-    expected_project_name_contains = row["expected_project_name_contains"].strip().lower()
+    expected_decision = row.expected_decision.lower().strip()
+    expected_project_id = row.expected_project_id.strip()
+    expected_project_name_contains = row.expected_project_name_contains.strip().lower()
 
-    actual_decision = actual.get("actual_decision", "").lower().strip()
-    actual_project_id = actual.get("actual_project_id", "").strip()
-    actual_project_name = actual.get("actual_project_name", "").lower().strip()
+    actual_decision = actual.actual_decision.lower().strip()
+    actual_project_id = actual.actual_project_id.strip()
+    actual_project_name = actual.actual_project_name.lower().strip()
 
     ok = True
     if expected_decision and actual_decision != expected_decision:
@@ -378,12 +672,115 @@ def compute_correctness(row: Dict[str, str], actual: Dict[str, str]) -> Tuple[bo
     return True, ok
 
 
-def write_csv(path: Path, fieldnames: List[str], rows: List[Dict[str, str]]) -> None:
+def selector_key(row: InputRow) -> str:
+    selector_type, selector_value = selector_for_row(row)
+    return f"{selector_type}:{selector_value}"
+
+
+def build_result(row: InputRow, run_interaction_id: str, actual: Actual) -> GtResult:
+    has_expectation, is_correct = compute_correctness(row, actual)
+    return GtResult(
+        row_id=row.row_id,
+        interaction_id=row.interaction_id,
+        run_interaction_id=run_interaction_id,
+        span_selector=selector_key(row),
+        resolved_span_id=actual.resolved_span_id,
+        resolved_span_index=actual.resolved_span_index,
+        expected_project_id=row.expected_project_id,
+        expected_project_name_contains=row.expected_project_name_contains,
+        expected_decision=row.expected_decision,
+        actual_project_id=actual.actual_project_id,
+        actual_project_name=actual.actual_project_name,
+        actual_decision=actual.actual_decision,
+        actual_confidence=actual.actual_confidence,
+        actual_prompt_version=actual.actual_prompt_version,
+        actual_model_id=actual.actual_model_id,
+        actual_reason_codes=actual.actual_reason_codes,
+        actual_reasoning=actual.actual_reasoning,
+        char_start=actual.char_start,
+        char_end=actual.char_end,
+        has_expectation=bool_to_str(has_expectation),
+        is_correct=bool_to_str(is_correct),
+        error=actual.error,
+        notes=row.notes,
+        tags=row.tags,
+    )
+
+
+def poll_readiness(db: Database, run_interaction_ids: List[str], created_after: str = "") -> Dict[str, Tuple[int, int]]:
+    """Return run_interaction_id -> (active span count, spans with an attribution)."""
+    if not run_interaction_ids:
+        return {}
+    in_list = ",".join(sql_quote(iid) for iid in run_interaction_ids)
+    created_filter = f"and cs.created_at >= {sql_quote(created_after)}::timestamptz" if created_after else ""
+    sql = f"""
+select
+  cs.interaction_id,
+  count(*)::int as span_count,
+  count(*) filter (
+    where exists (select 1 from span_attributions sa where sa.span_id = cs.id)
+  )::int as attributed_count
+from conversation_spans cs
+where cs.interaction_id in ({in_list})
+  and cs.is_superseded = false
+  {created_filter}
+group by cs.interaction_id;
+""".strip()
+    return {
+        str(rec["interaction_id"]): (int(rec["span_count"] or 0), int(rec["attributed_count"] or 0))
+        for rec in db.rows(sql)
+    }
+
+
+def write_csv(path: Path, fieldnames: List[str], rows: Iterable[Any]) -> None:
+    """Write dict rows or records; records are read with one C-level attrgetter call."""
+    record_values = operator.attrgetter(*fieldnames)
     with path.open("w", encoding="utf-8", newline="") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(fh)
+        writer.writerow(fieldnames)
         for row in rows:
-            writer.writerow({k: row.get(k, "") for k in fieldnames})
+            writer.writerow(record_values(row) if isinstance(row, Record) else [row.get(k, "") for k in fieldnames])
+
+
+def typed_column_value(kind: str, value: str) -> object:
+    if value == "":
+        return None
+    if kind == "bool":
+        return value == "true"
+    try:
+        return int(value) if kind == "int64" else float(value)
+    except ValueError:
+        return None
+
+
+def write_columnar(
+    path: Path,
+    fieldnames: List[str],
+    rows: List[Any],
+    output_format: str,
+    metadata: Dict[str, str],
+) -> None:
+    """Write rows as a Parquet or Arrow IPC file with COLUMN_TYPES applied (empty -> null)."""
+    arrow_types = {"string": pa.string(), "int64": pa.int64(), "float64": pa.float64(), "bool": pa.bool_()}
+    fields = []
+    arrays = []
+    for name in fieldnames:
+        kind = COLUMN_TYPES.get(name, "string")
+        values = [row.get(name, "") for row in rows]
+        if kind != "string":
+            values = [typed_column_value(kind, v) for v in values]
+        fields.append(pa.field(name, arrow_types[kind]))
+        arrays.append(pa.array(values, type=arrow_types[kind]))
+    schema = pa.schema(fields, metadata=metadata)
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    tmp = path.with_name(path.name + ".tmp")
+    if output_format == "parquet":
+        pq.write_table(table, tmp)
+    else:
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
 
 
 def parse_metric_bool(value: str) -> bool:
@@ -402,6 +799,209 @@ def compute_ratio(num: int, den: int) -> Optional[float]:
     return num / den
 
 
+class LatencyRecorder:
+    """Thread-safe latency samples per phase, summarized as p50/p95/p99."""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(name, []).append(seconds)
+
+    @contextlib.contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - t0)
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+        out: Dict[str, dict] = {}
+        for name in sorted(samples):
+            values = samples[name]
+            out[name] = {
+                "count": len(values),
+                "total_s": round(sum(values), 4),
+                # Nearest-rank percentiles.
+                **{
+                    f"p{int(q * 100)}_s": round(values[max(0, math.ceil(q * len(values)) - 1)], 4)
+                    for q in self.QUANTILES
+                },
+                "max_s": round(values[-1], 4),
+            }
+        return out
+
+
+def write_prometheus_textfile(path: Path, run_id: str, mode: str, timings: Dict[str, dict]) -> None:
+    """Write timings in node_exporter textfile-collector format (atomic rename)."""
+    metric = "gt_batch_runner_latency_seconds"
+    lines = [
+        f"# HELP {metric} GT batch runner per-phase latency.",
+        f"# TYPE {metric} summary",
+    ]
+    for name, t in timings.items():
+        labels = f'run_id="{run_id}",mode="{mode}",phase="{name}"'
+        for q in LatencyRecorder.QUANTILES:
+            lines.append(f'{metric}{{{labels},quantile="{q}"}} {t[f"p{int(q * 100)}_s"]}')
+        lines.append(f"{metric}_sum{{{labels}}} {t['total_s']}")
+        lines.append(f"{metric}_count{{{labels}}} {t['count']}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class ResultColumns:
+    """Column-oriented, typed view of scored results for metric computation.
+
+    Built in a single pass over the result records: flags become int8 arrays,
+    confidences a float64 array (NaN when missing), and projects/tags are
+    dictionary-encoded, so every metric and breakdown is a sum over arrays
+    rather than a re-parse of "true"/"false" strings and reason blobs.
+    """
+
+    def __init__(self, results: List[GtResult]) -> None:
+        self.size = len(results)
+        self.has_expectation = array.array("b")
+        self.is_correct = array.array("b")
+        self.is_failure = array.array("b")
+        self.is_review = array.array("b")
+        self.has_decision = array.array("b")
+        self.staff_leak = array.array("b")
+        self.multi_project = array.array("b")
+        self.homeowner_fail = array.array("b")
+        self.confidence = array.array("d")
+        # Project key is the expected project (id, else name fragment); rows without one share a bucket.
+        self.project_codes = array.array("l")
+        self.projects: List[str] = []
+        self.tag_codes: List[Tuple[int, ...]] = []
+        self.tags: List[str] = []
+
+        project_index: Dict[str, int] = {}
+        tag_index: Dict[str, int] = {}
+        for r in results:
+            expected = parse_metric_bool(r.has_expectation)
+            correct = expected and parse_metric_bool(r.is_correct)
+            decision = r.actual_decision
+            project_name = r.actual_project_name.lower()
+            reason_blob = f"{r.actual_reason_codes} {r.actual_reasoning}".lower()
+
+            homeowner_bad = False
+            if "homeowner" in f"{r.tags} {r.notes}".lower():
+                homeowner_bad = (
+                    decision != "assign"
+                    or bool(r.expected_project_id and r.actual_project_id != r.expected_project_id)
+                    or bool(
+                        r.expected_project_name_contains
+                        and r.expected_project_name_contains.lower() not in project_name
+                    )
+                )
+
+            self.has_expectation.append(expected)
+            self.is_correct.append(correct)
+            self.is_failure.append(expected and not correct)
+            self.is_review.append(decision == "review")
+            self.has_decision.append(decision != "")
+            self.staff_leak.append("sittler" in project_name)
+            self.multi_project.append(any(m in reason_blob for m in MULTI_PROJECT_MARKERS))
+            self.homeowner_fail.append(homeowner_bad)
+            try:
+                self.confidence.append(float(r.actual_confidence) if r.actual_confidence else math.nan)
+            except ValueError:
+                self.confidence.append(math.nan)
+
+            project = r.expected_project_id or r.expected_project_name_contains or NO_PROJECT_LABEL
+            code = project_index.get(project)
+            if code is None:
+                code = project_index[project] = len(self.projects)
+                self.projects.append(project)
+            self.project_codes.append(code)
+
+            codes = []
+            for tag in TAG_SPLIT_RE.split(r.tags):
+                if not tag:
+                    continue
+                code = tag_index.get(tag)
+                if code is None:
+                    code = tag_index[tag] = len(self.tags)
+                    self.tags.append(tag)
+                codes.append(code)
+            self.tag_codes.append(tuple(codes))
+
+    def failure_rows(self, results: List[GtResult]) -> List[GtResult]:
+        return list(itertools.compress(results, self.is_failure))
+
+    def mean_confidence(self) -> Optional[float]:
+        present = [c for c in self.confidence if not math.isnan(c)]
+        return sum(present) / len(present) if present else None
+
+    def totals(self) -> Dict[str, int]:
+        return {
+            "total_rows": self.size,
+            "expected_rows": sum(self.has_expectation),
+            "correct_rows": sum(self.is_correct),
+            "reviewed_rows": sum(self.is_review),
+            "decision_rows": sum(self.has_decision),
+            "failures_count": sum(self.is_failure),
+            "homeowner_override_fail_count": sum(self.homeowner_fail),
+            "staff_leak_count": sum(self.staff_leak),
+            "multi_project_span_count": sum(self.multi_project),
+        }
+
+    def _grouped(self, labels: List[str], row_groups: List[Tuple[int, ...]]) -> Dict[str, dict]:
+        n = len(labels)
+        rows = array.array("l", [0]) * n
+        expected = array.array("l", [0]) * n
+        correct = array.array("l", [0]) * n
+        reviewed = array.array("l", [0]) * n
+        decided = array.array("l", [0]) * n
+        conf_sum = array.array("d", [0.0]) * n
+        conf_n = array.array("l", [0]) * n
+        for i, groups in enumerate(row_groups):
+            e, c, rv, d, conf = (
+                self.has_expectation[i],
+                self.is_correct[i],
+                self.is_review[i],
+                self.has_decision[i],
+                self.confidence[i],
+            )
+            for g in groups:
+                rows[g] += 1
+                expected[g] += e
+                correct[g] += c
+                reviewed[g] += rv
+                decided[g] += d
+                if not math.isnan(conf):
+                    conf_sum[g] += conf
+                    conf_n[g] += 1
+        out: Dict[str, dict] = {}
+        for g in sorted(range(n), key=lambda g: labels[g]):
+            out[labels[g]] = {
+                "rows": rows[g],
+                "expected_rows": expected[g],
+                "correct_rows": correct[g],
+                "accuracy": get_float(compute_ratio(correct[g], expected[g])),
+                "review_rate": get_float(compute_ratio(reviewed[g], decided[g])),
+                "failures_count": expected[g] - correct[g],
+                "mean_confidence": get_float(conf_sum[g] / conf_n[g]) if conf_n[g] else None,
+            }
+        return out
+
+    def by_tag(self) -> Dict[str, dict]:
+        return self._grouped(self.tags, self.tag_codes)
+
+    def by_project(self) -> Dict[str, dict]:
+        return self._grouped(self.projects, [(c,) for c in self.project_codes])
+
+
 def maybe_load_baseline_metrics(baseline_arg: str, out_root: Path, current_run_dir: Path) -> Optional[Tuple[Path, dict]]:
     if baseline_arg:
         p = Path(baseline_arg)
@@ -414,6 +1014,9 @@ def maybe_load_baseline_metrics(baseline_arg: str, out_root: Path, current_run_d
     candidates = []
     if out_root.exists():
         for child in out_root.iterdir():
+            # Shard dirs are partial runs; only whole (or merged) runs are baselines.
+            if "_shard" in child.name:
+                continue
             if child.is_dir() and child != current_run_dir and (child / "metrics.json").exists():
                 candidates.append(child)
     if not candidates:
@@ -425,13 +1028,194 @@ def maybe_load_baseline_metrics(baseline_arg: str, out_root: Path, current_run_d
     return metrics_path, json.loads(metrics_path.read_text(encoding="utf-8"))
 
 
-def preserve_baseline_artifacts(baseline_metrics_path: Path, run_dir: Path) -> Optional[Path]:
+def result_join_keys(results: Iterable[Dict[str, str]]) -> Iterator[Tuple[Tuple[str, ...], Dict[str, str]]]:
+    """Yield (join key, row): interaction_id + span selector, plus row_id only when the pair repeats."""
+    seen: Set[Tuple[str, str]] = set()
+    for r in results:
+        pair = (r["interaction_id"], r["span_selector"])
+        if pair in seen:
+            yield (*pair, r["row_id"]), r
+        else:
+            seen.add(pair)
+            yield pair, r
+
+
+def diff_result_rows(
+    results: List[GtResult], baseline_results_path: Path
+) -> Tuple[List[Dict[str, str]], Dict[str, int]]:
+    """Hash-join current results against a baseline results.csv and list rows that changed."""
+    baseline: Dict[Tuple[str, ...], Tuple[bool, bool, str, str, str]] = {}
+    with baseline_results_path.open("r", encoding="utf-8", newline="") as f:
+        for key, r in result_join_keys(csv.DictReader(f)):
+            baseline[key] = (
+                parse_metric_bool(r.get("has_expectation", "")),
+                parse_metric_bool(r.get("is_correct", "")),
+                r.get("actual_decision", ""),
+                r.get("actual_project_id", ""),
+                r.get("actual_project_name", ""),
+            )
+
+    counts = {
+        "flip_correct_to_incorrect": 0,
+        "flip_incorrect_to_correct": 0,
+        "decision_changed": 0,
+        "project_changed": 0,
+        "rows_matched": 0,
+        "rows_only_in_current": 0,
+        "rows_only_in_baseline": 0,
+    }
+    flips: List[Dict[str, str]] = []
+    for key, r in result_join_keys(results):
+        base = baseline.pop(key, None)
+        if base is None:
+            counts["rows_only_in_current"] += 1
+            continue
+        counts["rows_matched"] += 1
+        base_expected, base_correct, base_decision, base_project_id, base_project_name = base
+
+        changes = []
+        if base_expected and parse_metric_bool(r["has_expectation"]):
+            cur_correct = parse_metric_bool(r["is_correct"])
+            if base_correct and not cur_correct:
+                changes.append("correct_to_incorrect")
+            elif cur_correct and not base_correct:
+                changes.append("incorrect_to_correct")
+        if base_decision != r["actual_decision"]:
+            changes.append("decision_changed")
+        if base_project_id != r["actual_project_id"]:
+            changes.append("project_changed")
+        if not changes:
+            continue
+        for change in changes:
+            counts[change if change.endswith("changed") else f"flip_{change}"] += 1
+        flips.append(
+            {
+                "row_id": r["row_id"],
+                "interaction_id": r["interaction_id"],
+                "span_selector": r["span_selector"],
+                "change": ";".join(changes),
+                "expected_decision": r["expected_decision"],
+                "expected_project_id": r["expected_project_id"],
+                "baseline_is_correct": bool_to_str(base_correct) if base_expected else "",
+                "current_is_correct": r["is_correct"] if parse_metric_bool(r["has_expectation"]) else "",
+                "baseline_decision": base_decision,
+                "current_decision": r["actual_decision"],
+                "baseline_project_id": base_project_id,
+                "current_project_id": r["actual_project_id"],
+                "baseline_project_name": base_project_name,
+                "current_project_name": r["actual_project_name"],
+            }
+        )
+    counts["rows_only_in_baseline"] = len(baseline)
+    return flips, counts
+
+
+class ArtifactStore:
+    """Content-addressed blob store shared by every run under one --out-root.
+
+    Blobs live read-only at <root>/objects/<aa>/<sha256>; preserved files are
+    hardlinks (symlinks where linking is not possible) to them, so a baseline
+    file is stored once no matter how many runs preserve it.
+
+    Ingesting copies a file's bytes into a new blob once and never links, chmods
+    or replaces the source: the baseline run dir stays writable (e.g. by
+    --resume), and rewriting it cannot reach a preserved copy.
+
+    Source files are indexed by path with their (device, inode, size, mtime), so
+    an unchanged file is never re-hashed. save_index() prunes entries whose file
+    has since been replaced or deleted, so the index stays bounded by the live
+    source files.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.objects = root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.index_path = root / "file_index.json"
+        try:
+            loaded = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            loaded = {}
+        # Entries in any other shape (e.g. an older stat-keyed index) are simply re-hashed.
+        self._index: Dict[str, Dict[str, str]] = {
+            path: entry
+            for path, entry in (loaded.items() if isinstance(loaded, dict) else ())
+            if isinstance(entry, dict) and {"stat", "sha256"} <= entry.keys()
+        }
+        self.files_hashed = 0
+        self.blobs_written = 0
+
+    def _blob(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    @staticmethod
+    def _stat_key(st: os.stat_result) -> str:
+        return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+    def ingest(self, path: Path) -> str:
+        key = str(path.resolve())
+        stat_key = self._stat_key(path.stat())
+        entry = self._index.get(key)
+        digest = entry["sha256"] if entry and entry["stat"] == stat_key else ""
+        if not digest or not self._blob(digest).exists():
+            digest = file_sha256(path)
+            self.files_hashed += 1
+            if not self._blob(digest).exists():
+                digest = self._copy_in(path)
+        self._index[key] = {"stat": stat_key, "sha256": digest}
+        return digest
+
+    def _copy_in(self, path: Path) -> str:
+        # Hash the bytes actually copied, so a source rewritten since it was hashed
+        # can never land under the wrong digest.
+        tmp = self.objects / f".ingest.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+        h = hashlib.sha256()
+        try:
+            with path.open("rb") as src, tmp.open("wb") as dst:
+                for chunk in iter(lambda: src.read(1 << 20), b""):
+                    h.update(chunk)
+                    dst.write(chunk)
+            digest = h.hexdigest()
+            blob = self._blob(digest)
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.chmod(tmp, 0o444)
+                os.replace(tmp, blob)
+                self.blobs_written += 1
+        finally:
+            tmp.unlink(missing_ok=True)
+        return digest
+
+    def materialize(self, digest: str, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(self._blob(digest), target)
+        except OSError:
+            target.symlink_to(self._blob(digest).resolve())
+
+    def save_index(self) -> None:
+        kept: Dict[str, Dict[str, str]] = {}
+        for path, entry in self._index.items():
+            try:
+                current = self._stat_key(os.stat(path)) == entry["stat"]
+            except OSError:
+                continue
+            if current and self._blob(entry["sha256"]).exists():
+                kept[path] = entry
+        self._index = kept
+        tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+        tmp.write_text(json.dumps(self._index, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+
+def preserve_baseline_artifacts(baseline_metrics_path: Path, run_dir: Path, out_root: Path) -> Optional[Path]:
     source = baseline_metrics_path.expanduser().resolve()
     if not source.exists():
         return None
 
     preserve_root = run_dir / "baseline_preserved"
     preserve_root.mkdir(parents=True, exist_ok=True)
+    store = ArtifactStore(out_root / ".artifact_store")
 
     # Preserve the full baseline run directory when diffing against metrics.json.
     if source.is_file() and source.name == "metrics.json":
@@ -439,281 +1223,193 @@ def preserve_baseline_artifacts(baseline_metrics_path: Path, run_dir: Path) -> O
         target_dir = preserve_root / source_dir.name
         if target_dir.exists():
             shutil.rmtree(target_dir)
-        shutil.copytree(source_dir, target_dir)
+        manifest = {}
+        for path in sorted(source_dir.rglob("*")):
+            rel = path.relative_to(source_dir)
+            # The baseline's own preserved baselines are already in the store; don't nest them.
+            if rel.parts[0] == "baseline_preserved" or not path.is_file():
+                continue
+            digest = store.ingest(path)
+            store.materialize(digest, target_dir / rel)
+            manifest[rel.as_posix()] = digest
+        store.save_index()
+        (target_dir / "preserved_manifest.json").write_text(
+            json.dumps({"source_dir": str(source_dir), "store": str(store.root), "files": manifest}, indent=2),
+            encoding="utf-8",
+        )
         target_metrics = target_dir / "metrics.json"
         return target_metrics if target_metrics.exists() else target_dir
 
     target_file = preserve_root / source.name
-    shutil.copy2(source, target_file)
+    target_file.unlink(missing_ok=True)
+    store.materialize(store.ingest(source), target_file)
+    store.save_index()
     return target_file
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="GT regression batch runner v1")
-    parser.add_argument("--input", required=True, help="path to gt_batch_v1 csv/json")
-    parser.add_argument("--mode", choices=["shadow", "reseed", "none"], default="shadow")
-    parser.add_argument(
-        "--reseed-mode",
-        choices=["resegment_and_reroute", "reseed_and_close_loop"],
-        default="resegment_and_reroute",
-    )
-    parser.add_argument("--out-root", default="/Users/chadbarlow/Desktop/gt_batch_runs")
-    parser.add_argument("--wait-seconds", type=int, default=6)
-    parser.add_argument("--timeout-seconds", type=int, default=180)
-    parser.add_argument("--baseline", default="", help="optional prior run dir or metrics.json for diff")
-    args = parser.parse_args()
-
-    supabase_url = ensure_env("SUPABASE_URL")
-    service_role = ensure_env("SUPABASE_SERVICE_ROLE_KEY")
-    edge_secret = ensure_env("EDGE_SHARED_SECRET")
-    database_url = ensure_env("DATABASE_URL")
-    psql_bin = os.environ.get("PSQL_PATH", "psql")
-
-    input_path = Path(args.input).expanduser().resolve()
-    if not input_path.exists():
-        raise RuntimeError(f"input file not found: {input_path}")
-
-    baseline_arg = args.baseline.strip()
-    if baseline_arg:
-        baseline_probe = Path(baseline_arg).expanduser()
-        if baseline_probe.is_dir():
-            baseline_probe = baseline_probe / "metrics.json"
-        if not baseline_probe.exists():
-            raise RuntimeError(f"baseline not found: {baseline_probe}")
-
-    rows = load_rows(input_path)
-
-    run_id = utc_stamp()
-    out_root = Path(args.out_root).expanduser()
-    run_dir = out_root / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
-
-    trigger_dir = run_dir / "trigger_responses"
-    trigger_dir.mkdir(parents=True, exist_ok=True)
-
-    (run_dir / "input_normalized.json").write_text(json.dumps(rows, indent=2), encoding="utf-8")
-    write_csv(run_dir / "input_normalized.csv", INPUT_FIELDS, rows)
-
-    unique_interactions = sorted({r["interaction_id"] for r in rows})
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {service_role}",
-        "apikey": service_role,
-        "X-Edge-Secret": edge_secret,
-        "X-Source": "gt-batch-runner",
-    }
-
-    trigger_rows: List[Dict[str, str]] = []
-    interaction_map: Dict[str, str] = {}
-
-    for idx, interaction_id in enumerate(unique_interactions, start=1):
-        if args.mode == "none":
-            interaction_map[interaction_id] = interaction_id
-            trigger_rows.append(
-                {
-                    "interaction_id": interaction_id,
-                    "run_interaction_id": interaction_id,
-                    "mode": args.mode,
-                    "ok": "true",
-                    "http_status": "",
-                    "error": "",
-                    "idempotency_key": "",
-                    "shadow_id": "",
-                    "response_file": "",
-                }
-            )
-            continue
-
-        if args.mode == "shadow":
-            shadow_id = f"cll_SHADOW_GTBATCH_{run_id}_{idx:03d}"
-            payload = {
-                "interaction_id": interaction_id,
-                "shadow_id": shadow_id,
-                "dry_run": False,
-            }
-            url = f"{supabase_url}/functions/v1/shadow-replay"
-            idem_key = ""
-        else:
-            shadow_id = ""
-            idem_key = f"gt-batch-{run_id}-{idx:03d}-{interaction_id}"
-            payload = {
-                "interaction_id": interaction_id,
-                "mode": args.reseed_mode,
-                "idempotency_key": idem_key,
-                "reason": "gt_batch_runner_v1",
-                "requested_by": "dev-1",
-            }
-            url = f"{supabase_url}/functions/v1/admin-reseed"
-
-        status, resp = post_json(url, payload, headers, timeout=args.timeout_seconds)
-        response_file = trigger_dir / f"{interaction_id}.json"
-        response_file.write_text(json.dumps({"http_status": status, "response": resp}, indent=2), encoding="utf-8")
-
-        ok = status == 200 and isinstance(resp, dict) and bool(resp.get("ok", False))
-
-        run_interaction_id = interaction_id
-        error = ""
-        if args.mode == "shadow":
-            if ok:
-                run_interaction_id = str(resp.get("shadow_id", "")).strip() or shadow_id
-            else:
-                run_interaction_id = ""
-                error = str(resp.get("error") if isinstance(resp, dict) else "shadow_replay_failed")
-        elif args.mode == "reseed":
-            if not ok:
-                error = str(resp.get("error") if isinstance(resp, dict) else "admin_reseed_failed")
-
-        interaction_map[interaction_id] = run_interaction_id
-
-        trigger_rows.append(
-            {
-                "interaction_id": interaction_id,
-                "run_interaction_id": run_interaction_id,
-                "mode": args.mode,
-                "ok": bool_to_str(ok),
-                "http_status": str(status),
-                "error": error,
-                "idempotency_key": idem_key,
-                "shadow_id": shadow_id,
-                "response_file": str(response_file),
-            }
-        )
-
-    write_csv(run_dir / "trigger_results.csv", TRIGGER_FIELDS, trigger_rows)
-
-    if args.mode in {"shadow", "reseed"} and args.wait_seconds > 0:
-        time.sleep(args.wait_seconds)
-
-    results: List[Dict[str, str]] = []
-    failures: List[Dict[str, str]] = []
-
-    for row in rows:
-        run_interaction_id = interaction_map.get(row["interaction_id"], "")
-        selector_type, selector_value = selector_for_row(row)
-
-        actual = {
-            "resolved_span_id": "",
-            "resolved_span_index": "",
-            "char_start": "",
-            "char_end": "",
-            "actual_project_id": "",
-            "actual_project_name": "",
-            "actual_decision": "",
-            "actual_confidence": "",
-            "actual_prompt_version": "",
-            "actual_model_id": "",
-            "actual_reason_codes": "",
-            "actual_reasoning": "",
+def trigger_interaction(
+    idx: int,
+    interaction_id: str,
+    *,
+    mode: str,
+    reseed_mode: str,
+    run_id: str,
+    supabase_url: str,
+    headers: dict,
+    timeout_seconds: int,
+    trigger_dir: Path,
+    timings: Optional[LatencyRecorder] = None,
+    rate: Optional[AdaptiveRateController] = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> Dict[str, str]:
+    if mode == "none":
+        return {
+            "interaction_id": interaction_id,
+            "run_interaction_id": interaction_id,
+            "mode": mode,
+            "ok": "true",
+            "http_status": "",
             "error": "",
+            "idempotency_key": "",
+            "shadow_id": "",
+            "response_file": "",
         }
 
-        trigger_ok = interaction_map.get(row["interaction_id"], "") != ""
-        if not trigger_ok:
-            actual["error"] = "trigger_failed"
-        else:
-            try:
-                actual = query_row_actual(database_url, psql_bin, run_interaction_id, row)
-            except Exception as e:  # noqa: BLE001
-                actual["error"] = f"query_failed:{e}"
-
-        has_expectation, is_correct = compute_correctness(row, actual)
-
-        result = {
-            "row_id": row["row_id"],
-            "interaction_id": row["interaction_id"],
-            "run_interaction_id": run_interaction_id,
-            "span_selector": f"{selector_type}:{selector_value}",
-            "resolved_span_id": actual["resolved_span_id"],
-            "resolved_span_index": actual["resolved_span_index"],
-            "expected_project_id": row["expected_project_id"],
-            "expected_project_name_contains": row["expected_project_name_contains"],
-            "expected_decision": row["expected_decision"],
-            "actual_project_id": actual["actual_project_id"],
-            "actual_project_name": actual["actual_project_name"],
-            "actual_decision": actual["actual_decision"],
-            "actual_confidence": actual["actual_confidence"],
-            "actual_prompt_version": actual["actual_prompt_version"],
-            "actual_model_id": actual["actual_model_id"],
-            "actual_reason_codes": actual["actual_reason_codes"],
-            "actual_reasoning": actual["actual_reasoning"],
-            "char_start": actual["char_start"],
-            "char_end": actual["char_end"],
-            "has_expectation": bool_to_str(has_expectation),
-            "is_correct": bool_to_str(is_correct),
-            "error": actual["error"],
-            "notes": row["notes"],
-            "tags": row["tags"],
+    if mode == "shadow":
+        shadow_id = f"cll_SHADOW_GTBATCH_{run_id}_{idx:03d}"
+        payload = {
+            "interaction_id": interaction_id,
+            "shadow_id": shadow_id,
+            "dry_run": False,
         }
-        results.append(result)
-
-        if parse_metric_bool(result["has_expectation"]) and not parse_metric_bool(result["is_correct"]):
-            failures.append(result)
-
-    write_csv(run_dir / "results.csv", RESULT_FIELDS, results)
-    write_csv(run_dir / "failures.csv", RESULT_FIELDS, failures)
+        url = f"{supabase_url}/functions/v1/shadow-replay"
+        idem_key = ""
+    else:
+        shadow_id = ""
+        idem_key = f"gt-batch-{run_id}-{idx:03d}-{interaction_id}"
+        payload = {
+            "interaction_id": interaction_id,
+            "mode": reseed_mode,
+            "idempotency_key": idem_key,
+            "reason": "gt_batch_runner_v1",
+            "requested_by": "dev-1",
+        }
+        url = f"{supabase_url}/functions/v1/admin-reseed"
+
+    with guarded_call(rate, breaker) as call:
+        t0 = time.monotonic()
+        status, resp = post_json(url, payload, headers, timeout=timeout_seconds)
+        http_s = call.latency_s = time.monotonic() - t0
+        call.status = status
+    if timings is not None:
+        timings.observe("trigger_http", http_s)
+        server_ms = resp.get("ms", resp.get("duration_ms")) if isinstance(resp, dict) else None
+        if isinstance(server_ms, (int, float)):
+            timings.observe("trigger_server_reported", server_ms / 1000.0)
+    response_file = trigger_dir / f"{interaction_id}.json"
+    response_file.write_text(json.dumps({"http_status": status, "response": resp}, indent=2), encoding="utf-8")
+
+    ok = status == 200 and isinstance(resp, dict) and bool(resp.get("ok", False))
+
+    run_interaction_id = interaction_id
+    error = ""
+    if mode == "shadow":
+        if ok:
+            run_interaction_id = str(resp.get("shadow_id", "")).strip() or shadow_id
+        else:
+            run_interaction_id = ""
+            error = str(resp.get("error") if isinstance(resp, dict) else "shadow_replay_failed")
+    elif mode == "reseed":
+        if not ok:
+            error = str(resp.get("error") if isinstance(resp, dict) else "admin_reseed_failed")
 
-    total_rows = len(results)
-    expected_rows = sum(1 for r in results if parse_metric_bool(r["has_expectation"]))
-    correct_rows = sum(
-        1
-        for r in results
-        if parse_metric_bool(r["has_expectation"]) and parse_metric_bool(r["is_correct"])
-    )
-    reviewed_rows = sum(1 for r in results if r["actual_decision"] == "review")
-    decision_rows = sum(1 for r in results if r["actual_decision"] != "")
+    return {
+        "interaction_id": interaction_id,
+        "run_interaction_id": run_interaction_id,
+        "mode": mode,
+        "ok": bool_to_str(ok),
+        "http_status": str(status),
+        "error": error,
+        "idempotency_key": idem_key,
+        "shadow_id": shadow_id,
+        "response_file": str(response_file),
+    }
 
-    homeowner_fail_count = 0
-    staff_leak_count = 0
-    multi_project_span_count = 0
-
-    for r in results:
-        tags_notes = f"{r['tags']} {r['notes']}".lower()
-        if "sittler" in r["actual_project_name"].lower():
-            staff_leak_count += 1
-
-        reason_blob = f"{r['actual_reason_codes']} {r['actual_reasoning']}".lower()
-        if (
-            "multi_project" in reason_blob
-            or "multi-project" in reason_blob
-            or "needs_resegment" in reason_blob
-            or "needs_resegmentation" in reason_blob
-            or "mixed span" in reason_blob
-        ):
-            multi_project_span_count += 1
-
-        homeowner_tagged = "homeowner" in tags_notes
-        if homeowner_tagged:
-            bad = False
-            if r["actual_decision"] != "assign":
-                bad = True
-            elif r["expected_project_id"] and r["actual_project_id"] != r["expected_project_id"]:
-                bad = True
-            elif r["expected_project_name_contains"] and r["expected_project_name_contains"].lower() not in r[
-                "actual_project_name"
-            ].lower():
-                bad = True
-            if bad:
-                homeowner_fail_count += 1
 
+def query_missing_char_offsets(db: Database, results: List[GtResult]) -> int:
     run_interactions = sorted({r["run_interaction_id"] for r in results if r["run_interaction_id"]})
-    missing_char_offsets_count = 0
-    if run_interactions:
-        in_list = ",".join(sql_quote(iid) for iid in run_interactions)
-        sql_missing = f"""
-select count(*)::int
+    if not run_interactions:
+        return 0
+    in_list = ",".join(sql_quote(iid) for iid in run_interactions)
+    sql_missing = f"""
+select count(*)::int as missing_count
 from conversation_spans
 where interaction_id in ({in_list})
   and is_superseded = false
   and (char_start is null or char_end is null);
 """.strip()
-        try:
-            out = run_psql_sql(database_url, psql_bin, sql_missing)
-            missing_char_offsets_count = int(out or "0")
-        except Exception:
-            missing_char_offsets_count = -1
+    try:
+        missing_row = db.fetch_one(sql_missing)
+        return int((missing_row or {}).get("missing_count") or 0)
+    except Exception:
+        return -1
+
+
+def write_run_artifacts(
+    run_dir: Path,
+    *,
+    run_id: str,
+    mode: str,
+    reseed_mode: str,
+    input_path: Path,
+    out_root: Path,
+    baseline_arg: str,
+    trigger_rows: List[Dict[str, str]],
+    readiness_rows: List[Dict[str, str]],
+    results: List[GtResult],
+    missing_char_offsets_count: int,
+    cache_enabled: bool,
+    cache_lookups: int,
+    cache_hits: int,
+    extra_metrics: Optional[dict] = None,
+    timings: Optional[LatencyRecorder] = None,
+    prometheus_textfile: str = "",
+    output_format: str = "csv",
+    run_index_path: Optional[Path] = None,
+    baseline_match: str = "",
+) -> None:
+    artifacts_t0 = time.monotonic()
+    write_csv(run_dir / "trigger_results.csv", TRIGGER_FIELDS, trigger_rows)
+    readiness_rows.sort(key=lambda r: r["interaction_id"])
+    write_csv(run_dir / "readiness.csv", READINESS_FIELDS, readiness_rows)
+
+    columns = ResultColumns(results)
+    failures = columns.failure_rows(results)
+
+    write_csv(run_dir / "results.csv", RESULT_FIELDS, results)
+    write_csv(run_dir / "failures.csv", RESULT_FIELDS, failures)
+    if output_format in COLUMNAR_FORMATS:
+        suffix = COLUMNAR_FORMATS[output_format]
+        metadata = {"run_id": run_id, "mode": mode}
+        write_columnar(run_dir / f"trigger_results{suffix}", TRIGGER_FIELDS, trigger_rows, output_format, metadata)
+        write_columnar(run_dir / f"results{suffix}", RESULT_FIELDS, results, output_format, metadata)
+        write_columnar(run_dir / f"failures{suffix}", RESULT_FIELDS, failures, output_format, metadata)
+
+    totals = columns.totals()
+    total_rows = totals["total_rows"]
+    expected_rows = totals["expected_rows"]
+    correct_rows = totals["correct_rows"]
+    reviewed_rows = totals["reviewed_rows"]
+    decision_rows = totals["decision_rows"]
+    homeowner_fail_count = totals["homeowner_override_fail_count"]
+    staff_leak_count = totals["staff_leak_count"]
+    multi_project_span_count = totals["multi_project_span_count"]
+
+    breakdowns = {"by_tag": columns.by_tag(), "by_project": columns.by_project()}
+    (run_dir / "breakdowns.json").write_text(json.dumps(breakdowns, indent=2), encoding="utf-8")
 
     trigger_fail_count = sum(1 for t in trigger_rows if t["ok"] != "true")
+    ready_timeout_count = sum(1 for r in readiness_rows if r["state"] == "timeout")
 
     accuracy = compute_ratio(correct_rows, expected_rows)
     review_rate = compute_ratio(reviewed_rows, decision_rows)
@@ -721,8 +1417,8 @@ where interaction_id in ({in_list})
     metrics = {
         "run_id": run_id,
         "run_dir": str(run_dir),
-        "mode": args.mode,
-        "reseed_mode": args.reseed_mode if args.mode == "reseed" else "",
+        "mode": mode,
+        "reseed_mode": reseed_mode if mode == "reseed" else "",
         "input_file": str(input_path),
         "total_rows": total_rows,
         "expected_rows": expected_rows,
@@ -734,22 +1430,40 @@ where interaction_id in ({in_list})
         "multi_project_span_count": multi_project_span_count,
         "missing_char_offsets_count": missing_char_offsets_count,
         "trigger_fail_count": trigger_fail_count,
+        "ready_timeout_count": ready_timeout_count,
+        "cache_lookups": cache_lookups,
+        "cache_hits": cache_hits,
+        "cache_hit_rate": get_float(compute_ratio(cache_hits, cache_lookups)) if cache_enabled else None,
         "failures_count": len(failures),
+        "mean_confidence": get_float(columns.mean_confidence()),
+        **(extra_metrics or {}),
         "generated_at_utc": dt.datetime.utcnow().isoformat() + "Z",
     }
 
     (run_dir / "metrics.json").write_text(json.dumps(metrics, indent=2), encoding="utf-8")
 
-    baseline = maybe_load_baseline_metrics(baseline_arg, out_root, run_dir)
+    run_index = RunIndex(run_index_path) if run_index_path is not None else None
+    input_sha256 = file_sha256(run_dir / "input_normalized.json")
+    if baseline_match and not baseline_arg:
+        if run_index is None:
+            raise RuntimeError("--baseline-match needs the run index (drop --no-run-index)")
+        current = {"mode": mode, "reseed_mode": metrics["reseed_mode"], "input_sha256": input_sha256}
+        current["prompt_version"], _ = dominant(r.actual_prompt_version for r in results)
+        current["model_id"], _ = dominant(r.actual_model_id for r in results)
+        chosen = run_index.select_baseline(parse_match(baseline_match, current), exclude_run_dir=run_dir)
+        baseline = (chosen, json.loads(chosen.read_text(encoding="utf-8"))) if chosen else None
+    else:
+        baseline = maybe_load_baseline_metrics(baseline_arg, out_root, run_dir)
     diff_obj = None
     if baseline:
         baseline_path, baseline_metrics = baseline
-        preserved_baseline_path = preserve_baseline_artifacts(baseline_path, run_dir)
+        preserved_baseline_path = preserve_baseline_artifacts(baseline_path, run_dir, out_root)
         baseline_path_for_diff = preserved_baseline_path or baseline_path
         diff_obj = {
             "baseline_metrics": str(baseline_path_for_diff),
             "baseline_metrics_source": str(baseline_path),
             "baseline_metrics_preserved": str(preserved_baseline_path) if preserved_baseline_path else None,
+            "baseline_match": baseline_match if baseline_match and not baseline_arg else None,
             "delta_accuracy": None,
             "delta_review_rate": None,
             "delta_staff_leak_count": None,
@@ -784,17 +1498,51 @@ where interaction_id in ({in_list})
         diff_obj["delta_missing_char_offsets_count"] = delta_int(
             "missing_char_offsets_count", "missing_char_offsets_count"
         )
+
+        baseline_results_path = baseline_path.parent / "results.csv"
+        diff_obj["baseline_results"] = str(baseline_results_path) if baseline_results_path.exists() else None
+        diff_obj["row_diff"] = None
+        if baseline_results_path.exists():
+            flips, diff_obj["row_diff"] = diff_result_rows(results, baseline_results_path)
+            write_csv(run_dir / "flips.csv", FLIP_FIELDS, flips)
         (run_dir / "diff.json").write_text(json.dumps(diff_obj, indent=2), encoding="utf-8")
 
+    if run_index is not None:
+        with timings.timed("run_index") if timings is not None else contextlib.nullcontext():
+            run_index.record_run(run_dir, metrics, results, input_sha256)
+        run_index.close()
+
+    timing_summary: Dict[str, dict] = {}
+    if timings is not None:
+        now = time.monotonic()
+        timings.observe("phase:artifacts", now - artifacts_t0)
+        timings.observe("phase:total", now - timings.started)
+        timing_summary = timings.summary()
+        (run_dir / "timings.json").write_text(json.dumps(timing_summary, indent=2), encoding="utf-8")
+        if prometheus_textfile:
+            write_prometheus_textfile(Path(prometheus_textfile).expanduser(), run_id, mode, timing_summary)
+
     lines = []
     lines.append("# GT Batch Runner Report (v1)")
     lines.append("")
     lines.append(f"- Run ID: `{run_id}`")
-    lines.append(f"- Mode: `{args.mode}`")
-    if args.mode == "reseed":
-        lines.append(f"- Reseed mode: `{args.reseed_mode}`")
+    lines.append(f"- Mode: `{mode}`")
+    if mode == "reseed":
+        lines.append(f"- Reseed mode: `{reseed_mode}`")
     lines.append(f"- Input: `{input_path}`")
     lines.append(f"- Output dir: `{run_dir}`")
+    if extra_metrics and extra_metrics.get("shard"):
+        lines.append(f"- Shard: `{extra_metrics['shard']}`")
+    if extra_metrics and extra_metrics.get("merged_from"):
+        lines.append(f"- Merged from {len(extra_metrics['merged_from'])} shards:")
+        lines.extend(f"  - `{d}`" for d in extra_metrics["merged_from"])
+    if extra_metrics and extra_metrics.get("rate_control"):
+        rc = extra_metrics["rate_control"]
+        lines.append(
+            f"- Adaptive rate: final concurrency `{rc['final_concurrency']}`, "
+            f"rate `{rc['final_per_minute'] or 'unlimited'}` per minute "
+            f"({rc['increases']} increases, {rc['decreases']} decreases; see `rate_control.jsonl`)"
+        )
     lines.append("")
     lines.append("## Metrics")
     lines.append(f"- accuracy: `{metrics['accuracy']}` ({correct_rows}/{expected_rows})")
@@ -804,15 +1552,34 @@ where interaction_id in ({in_list})
     lines.append(f"- multi_project_span_count: `{multi_project_span_count}`")
     lines.append(f"- missing_char_offsets_count: `{missing_char_offsets_count}`")
     lines.append(f"- trigger_fail_count: `{trigger_fail_count}`")
+    lines.append(f"- ready_timeout_count: `{ready_timeout_count}`")
+    if cache_enabled:
+        lines.append(f"- cache_hit_rate: `{metrics['cache_hit_rate']}` ({cache_hits}/{cache_lookups})")
     lines.append(f"- failures_count: `{len(failures)}`")
+    lines.append(f"- mean_confidence: `{metrics['mean_confidence']}`")
     lines.append("")
 
+    for title, groups in (("By Tag", breakdowns["by_tag"]), ("By Expected Project", breakdowns["by_project"])):
+        if not groups:
+            continue
+        lines.append(f"## {title}")
+        lines.append("| key | rows | accuracy | review_rate | failures |")
+        lines.append("|---|---:|---:|---:|---:|")
+        for key, b in groups.items():
+            lines.append(
+                f"| `{key}` | {b['rows']} | {b['accuracy']} ({b['correct_rows']}/{b['expected_rows']})"
+                f" | {b['review_rate']} | {b['failures_count']} |"
+            )
+        lines.append("")
+
     if diff_obj:
         lines.append("## Diff vs Baseline")
         lines.append(f"- baseline_metrics: `{diff_obj['baseline_metrics']}`")
         lines.append(f"- baseline_metrics_source: `{diff_obj['baseline_metrics_source']}`")
         if diff_obj["baseline_metrics_preserved"]:
             lines.append(f"- baseline_metrics_preserved: `{diff_obj['baseline_metrics_preserved']}`")
+        if diff_obj["baseline_match"]:
+            lines.append(f"- baseline selected by: `{diff_obj['baseline_match']}`")
         lines.append(f"- delta_accuracy: `{diff_obj['delta_accuracy']}`")
         lines.append(f"- delta_review_rate: `{diff_obj['delta_review_rate']}`")
         lines.append(f"- delta_staff_leak_count: `{diff_obj['delta_staff_leak_count']}`")
@@ -821,6 +1588,29 @@ where interaction_id in ({in_list})
         )
         lines.append(f"- delta_multi_project_span_count: `{diff_obj['delta_multi_project_span_count']}`")
         lines.append(f"- delta_missing_char_offsets_count: `{diff_obj['delta_missing_char_offsets_count']}`")
+        row_diff = diff_obj["row_diff"]
+        if row_diff:
+            lines.append(
+                f"- row flips: `{row_diff['flip_correct_to_incorrect']}` correct->incorrect, "
+                f"`{row_diff['flip_incorrect_to_correct']}` incorrect->correct"
+            )
+            lines.append(
+                f"- row changes: `{row_diff['decision_changed']}` decision, `{row_diff['project_changed']}` project "
+                f"({row_diff['rows_matched']} matched, {row_diff['rows_only_in_current']} new, "
+                f"{row_diff['rows_only_in_baseline']} dropped)"
+            )
+        else:
+            lines.append("- row flips: baseline has no results.csv")
+        lines.append("")
+
+    if timing_summary:
+        lines.append("## Timings")
+        lines.append("| phase | count | total_s | p50_s | p95_s | p99_s | max_s |")
+        lines.append("|---|---:|---:|---:|---:|---:|---:|")
+        for name, t in timing_summary.items():
+            lines.append(
+                f"| `{name}` | {t['count']} | {t['total_s']} | {t['p50_s']} | {t['p95_s']} | {t['p99_s']} | {t['max_s']} |"
+            )
         lines.append("")
 
     lines.append("## Artifacts")
@@ -828,19 +1618,789 @@ where interaction_id in ({in_list})
     lines.append(f"- `{run_dir / 'metrics.json'}`")
     lines.append(f"- `{run_dir / 'results.csv'}`")
     lines.append(f"- `{run_dir / 'failures.csv'}`")
+    lines.append(f"- `{run_dir / 'breakdowns.json'}`")
     lines.append(f"- `{run_dir / 'trigger_results.csv'}`")
+    lines.append(f"- `{run_dir / 'readiness.csv'}`")
+    if timing_summary:
+        lines.append(f"- `{run_dir / 'timings.json'}`")
     if diff_obj:
         lines.append(f"- `{run_dir / 'diff.json'}`")
+        if diff_obj["row_diff"] is not None:
+            lines.append(f"- `{run_dir / 'flips.csv'}`")
     lines.append("")
     lines.append("## Repro")
     lines.append("```bash")
     lines.append(
-        f"python3 scripts/gt_batch_runner.py --input {input_path} --mode {args.mode} --out-root {out_root}"
+        f"python3 scripts/gt_batch_runner.py --input {input_path} --mode {mode} --out-root {out_root}"
     )
     lines.append("```")
 
     (run_dir / "summary.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
 
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse --shard i/N (1-based i)."""
+    m = re.match(r"^(\d+)/(\d+)$", value.strip())
+    if not m or not (1 <= int(m.group(1)) <= int(m.group(2))):
+        raise RuntimeError(f"--shard must look like i/N with 1 <= i <= N (got '{value}')")
+    return int(m.group(1)), int(m.group(2))
+
+
+def shard_for_interaction(interaction_id: str, shard_count: int) -> int:
+    """Deterministic 1-based shard for an interaction (stable across hosts and Python runs)."""
+    digest = hashlib.sha256(interaction_id.encode("utf-8")).hexdigest()
+    return int(digest[:16], 16) % shard_count + 1
+
+
+class AttributionCache:
+    """Content-addressed store of resolved actuals for one interaction.
+
+    Entries are keyed by sha256(transcript_sha256 | prompt_version | model_id) and
+    hold the query_row_actual()-shaped actuals per span selector. Eviction is
+    size-based, least-recently-used first (hits refresh the file mtime).
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lookups = 0
+        self.hits = 0
+        self.writes = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(transcript_sha256: str, prompt_version: str, model_id: str) -> str:
+        material = f"{transcript_sha256}|{prompt_version}|{model_id}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str, selectors: List[str]) -> Optional[dict]:
+        self.lookups += 1
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if any(sel not in entry.get("actuals", {}) for sel in selectors):
+            return None
+        os.utime(path)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Runs and shards sharing --cache-dir may write the same key at once; each
+        # writer gets its own temp file so a rename never publishes a half-written one.
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+        try:
+            tmp.write_text(json.dumps(entry, sort_keys=True, default=json_default), encoding="utf-8")
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.writes += 1
+
+    def evict(self) -> int:
+        files = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.root.glob("*/*.json")]
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def hit_rate(self) -> Optional[float]:
+        return get_float(compute_ratio(self.hits, self.lookups))
+
+
+def query_transcript_hashes(db: Database, interaction_ids: List[str]) -> Dict[str, str]:
+    if not interaction_ids:
+        return {}
+    in_list = ",".join(sql_quote(iid) for iid in interaction_ids)
+    sql = f"""
+select
+  cr.interaction_id,
+  encode(sha256(convert_to(cr.transcript, 'UTF8')), 'hex') as transcript_sha256
+from calls_raw cr
+where cr.interaction_id in ({in_list})
+  and cr.transcript is not null;
+""".strip()
+    return {str(rec["interaction_id"]): str(rec["transcript_sha256"]) for rec in db.rows(sql)}
+
+
+def query_current_attribution_version(db: Database) -> Tuple[str, str]:
+    sql = """
+select coalesce(sa.prompt_version,'') as prompt_version, coalesce(sa.model_id,'') as model_id
+from span_attributions sa
+where sa.prompt_version is not null
+order by coalesce(sa.attributed_at, sa.applied_at_utc) desc nulls last, sa.id desc
+limit 1;
+""".strip()
+    rec = db.fetch_one(sql) or {}
+    return str(rec.get("prompt_version") or ""), str(rec.get("model_id") or "")
+
+
+class RunJournal:
+    """Append-only JSONL log of trigger outcomes and scored interactions.
+
+    Each event is flushed and fsync'd as it happens so a crashed run can be
+    resumed without re-triggering (and re-paying for) completed work. A crash
+    mid-write leaves a partial last line; opening the journal cuts it off so the
+    next event starts on a line of its own.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        truncate_partial_line(path)
+        self._fh = path.open("a", encoding="utf-8")
+
+    def append(self, event: str, **fields: object) -> None:
+        self._fh.write(json.dumps({"event": event, **fields}, sort_keys=True, default=json_default) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def truncate_partial_line(path: Path) -> None:
+    """Cut a file back to its last newline (drops a line torn by a crash mid-append)."""
+    if not path.exists():
+        return
+    with path.open("rb+") as fh:
+        size = end = fh.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - 4096)
+            fh.seek(start)
+            newline = fh.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            fh.truncate(end)
+
+
+def read_journal(path: Path) -> List[dict]:
+    events: List[dict] = []
+    if not path.exists():
+        return events
+    with path.open("r", encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A line torn by a crash mid-write; events on either side of it are intact.
+                continue
+    return events
+
+
+FORMAT_HELP = "also write results/failures/trigger_results as typed Parquet or Arrow IPC (needs pyarrow)"
+
+
+def add_run_index_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--run-index", default="", help=f"run index path (default: <out-root>/{INDEX_NAME})")
+    parser.add_argument("--no-run-index", action="store_true", help="do not record this run in the run index")
+    parser.add_argument(
+        "--baseline-match",
+        default="",
+        help=(
+            "pick the baseline from the run index: newest whole run matching KEY[=VALUE],... "
+            "(keys: mode, reseed_mode, prompt_version, model_id, input; a bare key = same as this run)"
+        ),
+    )
+
+
+def check_run_index_args(args: argparse.Namespace) -> None:
+    if args.baseline_match:
+        if args.no_run_index:
+            raise RuntimeError("--baseline-match needs the run index (drop --no-run-index)")
+        parse_match(args.baseline_match, {})  # reject unknown keys before any work is done
+
+
+def run_index_path_from_args(args: argparse.Namespace, out_root: Path) -> Optional[Path]:
+    if args.no_run_index:
+        return None
+    return Path(args.run_index).expanduser() if args.run_index else out_root / INDEX_NAME
+
+
+def check_output_format(output_format: str) -> None:
+    if output_format in COLUMNAR_FORMATS and pa is None:
+        raise RuntimeError(f"--format {output_format} requires pyarrow (pip install pyarrow)")
+
+
+def merge_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="gt_batch_runner.py merge",
+        description="Merge --shard i/N run dirs into one run (same artifacts as a single-process run)",
+    )
+    parser.add_argument("shard_dirs", nargs="+", help="shard run dirs (one per shard)")
+    parser.add_argument("--out", default="", help="merged run dir (default: <shard parent>/<run_id>)")
+    parser.add_argument("--baseline", default="", help="optional prior run dir or metrics.json for diff")
+    parser.add_argument("--format", choices=["csv", *COLUMNAR_FORMATS], default="csv", help=FORMAT_HELP)
+    add_run_index_args(parser)
+    args = parser.parse_args(argv)
+    check_output_format(args.format)
+    check_run_index_args(args)
+
+    shards: List[Tuple[Path, dict, List[dict], dict]] = []
+    for raw_dir in args.shard_dirs:
+        shard_dir = Path(raw_dir).expanduser()
+        events = read_journal(shard_dir / JOURNAL_NAME)
+        start = next((e for e in events if e.get("event") == "run_start"), None)
+        if start is None:
+            raise RuntimeError(f"no run journal in {shard_dir}")
+        metrics_path = shard_dir / "metrics.json"
+        if not metrics_path.exists():
+            raise RuntimeError(f"shard not finished (no metrics.json): {shard_dir}")
+        shards.append((shard_dir, start, events, json.loads(metrics_path.read_text(encoding="utf-8"))))
+
+    first_dir, first_start, _, _ = shards[0]
+    shard_count = int(first_start.get("shard_count") or 1)
+    input_digest = file_sha256(first_dir / "input_normalized.json")
+    seen_indexes: Set[int] = set()
+    for shard_dir, start, _, _ in shards:
+        for key in ("mode", "reseed_mode", "shard_count"):
+            if start.get(key) != first_start.get(key):
+                raise RuntimeError(f"shard {shard_dir} has different {key} than {first_dir}")
+        if file_sha256(shard_dir / "input_normalized.json") != input_digest:
+            raise RuntimeError(f"shard {shard_dir} was run on a different input than {first_dir}")
+        seen_indexes.add(int(start.get("shard_index") or 1))
+    if seen_indexes != set(range(1, shard_count + 1)) or len(shards) != shard_count:
+        raise RuntimeError(f"need exactly one run dir per shard 1..{shard_count} (got {sorted(seen_indexes)})")
+
+    rows = list(iter_normalized_rows(first_dir / "input_normalized.json"))
+    run_ids = {str(start["run_id"]) for _, start, _, _ in shards}
+    run_id = run_ids.pop() if len(run_ids) == 1 else f"{first_start['run_id']}_merged"
+    out_root = first_dir.parent
+    run_dir = Path(args.out).expanduser() if args.out else out_root / run_id
+    if run_dir.exists() and any(run_dir.iterdir()):
+        raise RuntimeError(f"merge output dir is not empty: {run_dir}")
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    # Later journal events win (a resumed shard may re-score retried interactions).
+    trigger_by_interaction: Dict[str, Dict[str, str]] = {}
+    scored_by_interaction: Dict[str, dict] = {}
+    for _, _, events, _ in shards:
+        for event in events:
+            if event.get("event") == "trigger":
+                trigger_by_interaction[event["trigger_row"]["interaction_id"]] = event["trigger_row"]
+            elif event.get("event") == "scored":
+                scored_by_interaction[event["readiness"]["interaction_id"]] = event
+
+    results_by_pos: List[Optional[GtResult]] = [None] * len(rows)
+    for event in scored_by_interaction.values():
+        for pos, result in event["results"]:
+            results_by_pos[int(pos)] = GtResult.from_mapping(result)
+    missing_rows = [rows[pos]["row_id"] for pos, r in enumerate(results_by_pos) if r is None]
+    if missing_rows:
+        raise RuntimeError(f"{len(missing_rows)} rows were not scored by any shard (first: {missing_rows[0]})")
+
+    shard_missing = [int(m.get("missing_char_offsets_count", 0)) for _, _, _, m in shards]
+    shutil.copyfile(first_dir / "input_normalized.json", run_dir / "input_normalized.json")
+    write_csv(run_dir / "input_normalized.csv", INPUT_FIELDS, rows)
+
+    write_run_artifacts(
+        run_dir,
+        run_id=run_id,
+        mode=str(first_start["mode"]),
+        reseed_mode=str(first_start["reseed_mode"]),
+        input_path=Path(str(first_start["input_file"])),
+        out_root=out_root,
+        baseline_arg=args.baseline.strip(),
+        trigger_rows=[trigger_by_interaction[iid] for iid in sorted(trigger_by_interaction)],
+        readiness_rows=[e["readiness"] for e in scored_by_interaction.values()],
+        results=[r for r in results_by_pos if r is not None],
+        missing_char_offsets_count=-1 if -1 in shard_missing else sum(shard_missing),
+        cache_enabled=any(m.get("cache_hit_rate") is not None for _, _, _, m in shards),
+        cache_lookups=sum(int(m.get("cache_lookups") or 0) for _, _, _, m in shards),
+        cache_hits=sum(int(m.get("cache_hits") or 0) for _, _, _, m in shards),
+        extra_metrics={"merged_from": [str(d) for d, _, _, _ in sorted(shards, key=lambda x: x[1]["shard_index"])]},
+        output_format=args.format,
+        run_index_path=run_index_path_from_args(args, out_root),
+        baseline_match=args.baseline_match.strip(),
+    )
+
+    print(f"GT_BATCH_RUN_READY {run_dir}")
+    return 0
+
+
+def main() -> int:
+    if len(sys.argv) > 1 and sys.argv[1] == "merge":
+        return merge_main(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="GT regression batch runner v1")
+    parser.add_argument("--input", default="", help="path to gt_batch_v1 csv/json")
+    parser.add_argument("--mode", choices=["shadow", "reseed", "none"], default="shadow")
+    parser.add_argument(
+        "--reseed-mode",
+        choices=["resegment_and_reroute", "reseed_and_close_loop"],
+        default="resegment_and_reroute",
+    )
+    parser.add_argument("--out-root", default="/Users/chadbarlow/Desktop/gt_batch_runs")
+    parser.add_argument(
+        "--wait-seconds",
+        type=int,
+        default=0,
+        help="fixed per-interaction settle delay instead of readiness polling (legacy; default: 0 = poll)",
+    )
+    parser.add_argument(
+        "--ready-timeout-seconds",
+        type=int,
+        default=240,
+        help="per-interaction deadline for spans+attributions to appear before scoring anyway",
+    )
+    parser.add_argument("--ready-poll-seconds", type=float, default=3.0, help="readiness poll interval")
+    parser.add_argument("--timeout-seconds", type=int, default=180)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="max in-flight shadow-replay/admin-reseed triggers (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--max-per-minute",
+        type=float,
+        default=0.0,
+        help="max shadow-replay/admin-reseed triggers per minute (default: 0 = unlimited)",
+    )
+    parser.add_argument(
+        "--query-batch-size",
+        type=int,
+        default=500,
+        help="GT rows resolved per span-actual query (default: 500; 1 = one query per row)",
+    )
+    parser.add_argument("--baseline", default="", help="optional prior run dir or metrics.json for diff")
+    parser.add_argument(
+        "--reuse-cache",
+        action="store_true",
+        help="skip triggering interactions whose transcript+prompt_version+model_id result is cached",
+    )
+    parser.add_argument("--cache-dir", default="", help="attribution cache dir (default: <out-root>/.attribution_cache)")
+    parser.add_argument("--cache-max-mb", type=int, default=256, help="attribution cache size cap (default: 256)")
+    parser.add_argument(
+        "--cache-prompt-version",
+        default="",
+        help="prompt_version expected for this run (default: latest span_attributions.prompt_version)",
+    )
+    parser.add_argument(
+        "--cache-model-id",
+        default="",
+        help="model_id expected for this run (default: latest span_attributions.model_id)",
+    )
+    parser.add_argument(
+        "--shard",
+        default="",
+        help="run only shard i of N (1-based, hash-partitioned by interaction_id); combine with `merge`",
+    )
+    parser.add_argument(
+        "--run-id",
+        default="",
+        help="explicit run id (default: UTC timestamp); pass the same value to every shard of one batch",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        default="",
+        help="also write per-phase latency to this node_exporter textfile (.prom)",
+    )
+    parser.add_argument(
+        "--resume",
+        default="",
+        help="resume an interrupted run dir from its run_journal.jsonl (skips triggered/scored interactions)",
+    )
+    parser.add_argument("--format", choices=["csv", *COLUMNAR_FORMATS], default="csv", help=FORMAT_HELP)
+    add_rate_control_args(parser)
+    add_run_index_args(parser)
+    args = parser.parse_args()
+    timings = LatencyRecorder()
+    if not args.input and not args.resume:
+        parser.error("--input is required unless --resume is given")
+    shard_index, shard_count = parse_shard(args.shard) if args.shard else (1, 1)
+    if args.run_id and not ID_RE.match(args.run_id):
+        raise RuntimeError(f"invalid --run-id '{args.run_id}'")
+    if args.concurrency < 1:
+        raise RuntimeError("--concurrency must be >= 1")
+    if args.max_per_minute < 0:
+        raise RuntimeError("--max-per-minute must be >= 0")
+    check_rate_control_args(args)
+    if args.ready_poll_seconds <= 0:
+        raise RuntimeError("--ready-poll-seconds must be > 0")
+    check_output_format(args.format)
+    check_run_index_args(args)
+
+    supabase_url = ensure_env("SUPABASE_URL")
+    service_role = ensure_env("SUPABASE_SERVICE_ROLE_KEY")
+    edge_secret = ensure_env("EDGE_SHARED_SECRET")
+    ensure_env("DATABASE_URL")
+    db = database_from_env(pool_size=args.concurrency)
+
+    baseline_arg = args.baseline.strip()
+    if baseline_arg:
+        baseline_probe = Path(baseline_arg).expanduser()
+        if baseline_probe.is_dir():
+            baseline_probe = baseline_probe / "metrics.json"
+        if not baseline_probe.exists():
+            raise RuntimeError(f"baseline not found: {baseline_probe}")
+
+    journal_events: List[dict] = []
+    start_event: Optional[dict] = None
+    if args.resume:
+        run_dir = Path(args.resume).expanduser().resolve()
+        journal_events = read_journal(run_dir / JOURNAL_NAME)
+        start_event = next((e for e in journal_events if e.get("event") == "run_start"), None)
+        if start_event is None:
+            raise RuntimeError(f"no run journal to resume in {run_dir}")
+        run_id = str(start_event["run_id"])
+        shard_index = int(start_event.get("shard_index") or 1)
+        shard_count = int(start_event.get("shard_count") or 1)
+        args.mode = str(start_event["mode"])
+        args.reseed_mode = str(start_event["reseed_mode"])
+        input_path = Path(str(start_event["input_file"]))
+        out_root = run_dir.parent
+        trigger_dir = run_dir / "trigger_responses"
+        trigger_dir.mkdir(parents=True, exist_ok=True)
+        rows = list(iter_normalized_rows(run_dir / "input_normalized.json"))
+    else:
+        input_path = Path(args.input).expanduser().resolve()
+        if not input_path.exists():
+            raise RuntimeError(f"input file not found: {input_path}")
+
+        run_id = args.run_id or utc_stamp()
+        out_root = Path(args.out_root).expanduser()
+        run_dir = out_root / (run_id if shard_count == 1 else f"{run_id}_shard{shard_index}of{shard_count}")
+        run_dir_created = not run_dir.exists()
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        # Rows are validated and written to input_normalized.* in the same pass.
+        normalized = NormalizedInputWriter(run_dir)
+        try:
+            rows = [normalized.write(row) for row in iter_input_rows(input_path)]
+        except BaseException:
+            normalized.abort()
+            if run_dir_created:
+                shutil.rmtree(run_dir, ignore_errors=True)
+            raise
+        normalized.commit()
+
+        trigger_dir = run_dir / "trigger_responses"
+        trigger_dir.mkdir(parents=True, exist_ok=True)
+
+    # Shadow ids / idempotency keys use the index in the full sorted list, so
+    # shards of one batch never collide and match a single-process run.
+    unique_interactions = sorted({r["interaction_id"] for r in rows})
+    trigger_index = {iid: idx for idx, iid in enumerate(unique_interactions, start=1)}
+    if shard_count > 1:
+        unique_interactions = [
+            iid for iid in unique_interactions if shard_for_interaction(iid, shard_count) == shard_index
+        ]
+
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {service_role}",
+        "apikey": service_role,
+        "X-Edge-Secret": edge_secret,
+        "X-Source": "gt-batch-runner",
+    }
+
+    rows_by_interaction: Dict[str, List[int]] = {}
+    for pos, row in enumerate(rows):
+        rows_by_interaction.setdefault(row["interaction_id"], []).append(pos)
+
+    # Reseed reuses the source interaction id, so readiness must ignore spans
+    # that existed before this run's triggers (server clock, not local).
+    created_after = ""
+    if start_event is not None:
+        created_after = str(start_event.get("created_after") or "")
+    elif args.mode == "reseed" and args.wait_seconds <= 0:
+        created_after = str((db.fetch_one("select now()::text as db_now") or {}).get("db_now") or "")
+
+    journal = RunJournal(run_dir / JOURNAL_NAME)
+    if start_event is None:
+        journal.append(
+            "run_start",
+            run_id=run_id,
+            mode=args.mode,
+            reseed_mode=args.reseed_mode,
+            input_file=str(input_path),
+            shard_index=shard_index,
+            shard_count=shard_count,
+            created_after=created_after,
+            started_at_utc=dt.datetime.utcnow().isoformat() + "Z",
+        )
+    else:
+        journal.append("run_resume", resumed_at_utc=dt.datetime.utcnow().isoformat() + "Z")
+
+    # Replay the journal: successful triggers are never re-sent; failed triggers
+    # are retried; interactions scored after a successful trigger are kept as-is.
+    prior_triggers: Dict[str, Dict[str, str]] = {}
+    prior_scored: Dict[str, dict] = {}
+    for event in journal_events:
+        if event.get("event") == "trigger" and event["trigger_row"]["ok"] == "true":
+            prior_triggers[event["trigger_row"]["interaction_id"]] = event["trigger_row"]
+        elif event.get("event") == "scored" and event["readiness"]["state"] != "trigger_failed":
+            prior_scored[event["readiness"]["interaction_id"]] = event
+    # A failed reseed trigger keeps its interaction_id as run id and is still scored;
+    # it is re-triggered and re-scored below, so its old score must not be replayed too.
+    prior_scored = {iid: event for iid, event in prior_scored.items() if iid in prior_triggers}
+
+    results_by_pos: List[Optional[GtResult]] = [None] * len(rows)
+    readiness_rows: List[Dict[str, str]] = []
+
+    cache: Optional[AttributionCache] = None
+    transcript_hashes: Dict[str, str] = {}
+    if args.reuse_cache and args.mode != "none":
+        cache_dir = Path(args.cache_dir).expanduser() if args.cache_dir else out_root / ".attribution_cache"
+        cache = AttributionCache(cache_dir, max(args.cache_max_mb, 0) * 1024 * 1024)
+        transcript_hashes = query_transcript_hashes(db, unique_interactions)
+
+    def maybe_cache_put(trigger_row: Dict[str, str], positions: List[int], actuals: List[Actual]) -> None:
+        # Only cache clean, fully attributed results produced by a single prompt/model.
+        transcript_sha256 = transcript_hashes.get(trigger_row["interaction_id"], "")
+        versions = {(a["actual_prompt_version"], a["actual_model_id"]) for a in actuals}
+        if cache is None or not transcript_sha256 or len(versions) != 1 or any(a["error"] for a in actuals):
+            return
+        prompt_version, model_id = versions.pop()
+        if not prompt_version or not model_id:
+            return
+        cache.put(
+            AttributionCache.make_key(transcript_sha256, prompt_version, model_id),
+            {
+                "interaction_id": trigger_row["interaction_id"],
+                "run_interaction_id": trigger_row["run_interaction_id"],
+                "run_id": run_id,
+                "transcript_sha256": transcript_sha256,
+                "prompt_version": prompt_version,
+                "model_id": model_id,
+                "actuals": {selector_key(rows[pos]): actual for pos, actual in zip(positions, actuals)},
+            },
+        )
+
+    def score_interaction(
+        trigger_row: Dict[str, str],
+        state: str,
+        waited_s: float,
+        counts: Tuple[int, int],
+        actuals: Optional[List[Actual]] = None,
+    ) -> None:
+        run_interaction_id = trigger_row["run_interaction_id"]
+        positions = rows_by_interaction[trigger_row["interaction_id"]]
+        if actuals is None and run_interaction_id:
+            t0 = time.monotonic()
+            actuals = resolve_actuals(db, [(run_interaction_id, rows[p]) for p in positions], args.query_batch_size)
+            elapsed = time.monotonic() - t0
+            timings.observe("actual_query", elapsed)
+            timings.observe("actual_query_per_row", elapsed / max(len(positions), 1))
+            if state == "ready":
+                maybe_cache_put(trigger_row, positions, actuals)
+        elif actuals is None:
+            actuals = [empty_actual("trigger_failed") for _ in positions]
+        scored = [(pos, build_result(rows[pos], run_interaction_id, actual)) for pos, actual in zip(positions, actuals)]
+        readiness = {
+            "interaction_id": trigger_row["interaction_id"],
+            "run_interaction_id": run_interaction_id,
+            "state": state,
+            "waited_seconds": f"{waited_s:.1f}",
+            "span_count": str(counts[0]),
+            "attributed_count": str(counts[1]),
+        }
+        if state in ("ready", "timeout", "fixed_wait"):
+            timings.observe(f"ready_wait_{state}", waited_s)
+        journal.append("scored", readiness=readiness, results=scored)
+        for pos, result in scored:
+            results_by_pos[pos] = result
+        readiness_rows.append(readiness)
+
+    for event in prior_scored.values():
+        for pos, result in event["results"]:
+            results_by_pos[int(pos)] = GtResult.from_mapping(result)
+        readiness_rows.append(event["readiness"])
+
+    # Pipeline: triggers run on the pool while the main thread polls readiness
+    # and scores each interaction as soon as it is ready (or its deadline passes).
+    # Shadow ids come from the sorted index and trigger rows are collected in
+    # submission order, so trigger_results.csv matches sequential runs.
+    trigger_by_interaction: Dict[str, Dict[str, str]] = dict(prior_triggers)
+
+    setup_done = time.monotonic()
+    timings.observe("phase:setup", setup_done - timings.started)
+
+    cache_hits: Set[str] = set()
+    if cache is not None:
+        prompt_version, model_id = args.cache_prompt_version, args.cache_model_id
+        if not prompt_version or not model_id:
+            latest_prompt_version, latest_model_id = query_current_attribution_version(db)
+            prompt_version = prompt_version or latest_prompt_version
+            model_id = model_id or latest_model_id
+        for interaction_id in unique_interactions:
+            transcript_sha256 = transcript_hashes.get(interaction_id, "")
+            if interaction_id in prior_triggers or not transcript_sha256:
+                continue
+            positions = rows_by_interaction[interaction_id]
+            entry = cache.get(
+                AttributionCache.make_key(transcript_sha256, prompt_version, model_id),
+                [selector_key(rows[pos]) for pos in positions],
+            )
+            if entry is None:
+                continue
+            cache_hits.add(interaction_id)
+            trigger_row = {
+                "interaction_id": interaction_id,
+                "run_interaction_id": str(entry["run_interaction_id"]),
+                "mode": args.mode,
+                "ok": "true",
+                "http_status": "",
+                "error": "",
+                "idempotency_key": "",
+                "shadow_id": "",
+                "response_file": "",
+            }
+            trigger_by_interaction[interaction_id] = trigger_row
+            journal.append("trigger", trigger_row=trigger_row)
+            score_interaction(
+                trigger_row,
+                "cache_hit",
+                0.0,
+                (0, 0),
+                actuals=[Actual.from_mapping(entry["actuals"][selector_key(rows[pos])]) for pos in positions],
+            )
+
+    # Concurrency/rate are enforced by the controller; the pool is sized for its ceiling.
+    rate = controller_from_args(
+        args, concurrency=args.concurrency, per_minute=args.max_per_minute, log_dir=run_dir, label="trigger_rate"
+    )
+    breaker = breaker_from_args(args, log_dir=run_dir, label="trigger_breaker")
+
+    pipeline_t0 = time.monotonic()
+    if cache is not None:
+        timings.observe("phase:cache_lookup", pipeline_t0 - setup_done)
+    with ThreadPoolExecutor(max_workers=rate.max_workers) as pool:
+        futures = [
+            pool.submit(
+                trigger_interaction,
+                trigger_index[interaction_id],
+                interaction_id,
+                mode=args.mode,
+                reseed_mode=args.reseed_mode,
+                run_id=run_id,
+                supabase_url=supabase_url,
+                headers=headers,
+                timeout_seconds=args.timeout_seconds,
+                trigger_dir=trigger_dir,
+                timings=timings,
+                rate=rate,
+                breaker=breaker,
+            )
+            for interaction_id in unique_interactions
+            if interaction_id not in prior_triggers and interaction_id not in cache_hits
+        ]
+        in_flight = set(futures)
+        # run_interaction_id -> (trigger_row, triggered_at, deadline)
+        waiting_ready: Dict[str, Tuple[Dict[str, str], float, float]] = {}
+        last_poll = 0.0
+        resumed_at = time.monotonic()
+        for interaction_id, trigger_row in prior_triggers.items():
+            if interaction_id in prior_scored:
+                continue
+            settle = args.wait_seconds if args.wait_seconds > 0 else args.ready_timeout_seconds
+            waiting_ready[trigger_row["run_interaction_id"]] = (trigger_row, resumed_at, resumed_at + settle)
+
+        while in_flight or waiting_ready:
+            if in_flight:
+                timeout = args.ready_poll_seconds if waiting_ready else None
+                done, in_flight_left = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                in_flight = set(in_flight_left)
+                now = time.monotonic()
+                for fut in done:
+                    trigger_row = fut.result()
+                    trigger_by_interaction[trigger_row["interaction_id"]] = trigger_row
+                    journal.append("trigger", trigger_row=trigger_row)
+                    if not trigger_row["run_interaction_id"]:
+                        score_interaction(trigger_row, "trigger_failed", 0.0, (0, 0))
+                    elif args.mode == "none":
+                        score_interaction(trigger_row, "immediate", 0.0, (0, 0))
+                    elif args.wait_seconds > 0:
+                        waiting_ready[trigger_row["run_interaction_id"]] = (trigger_row, now, now + args.wait_seconds)
+                    else:
+                        waiting_ready[trigger_row["run_interaction_id"]] = (
+                            trigger_row,
+                            now,
+                            now + args.ready_timeout_seconds,
+                        )
+            elif waiting_ready:
+                time.sleep(max(0.0, last_poll + args.ready_poll_seconds - time.monotonic()))
+
+            if not waiting_ready or time.monotonic() - last_poll < args.ready_poll_seconds:
+                continue
+
+            counts_by_run: Dict[str, Tuple[int, int]] = {}
+            if args.wait_seconds <= 0:
+                try:
+                    with timings.timed("readiness_poll"):
+                        counts_by_run = poll_readiness(db, sorted(waiting_ready), created_after)
+                except Exception:  # noqa: BLE001
+                    counts_by_run = {}
+            last_poll = now = time.monotonic()
+
+            for run_interaction_id in sorted(waiting_ready):
+                trigger_row, triggered_at, deadline = waiting_ready[run_interaction_id]
+                counts = counts_by_run.get(run_interaction_id, (0, 0))
+                if args.wait_seconds <= 0 and counts[0] > 0 and counts[1] >= counts[0]:
+                    state = "ready"
+                elif now >= deadline:
+                    state = "fixed_wait" if args.wait_seconds > 0 else "timeout"
+                else:
+                    continue
+                del waiting_ready[run_interaction_id]
+                score_interaction(trigger_row, state, now - triggered_at, counts)
+
+    timings.observe("phase:pipeline", time.monotonic() - pipeline_t0)
+    journal.close()
+    if cache is not None:
+        cache.evict()
+    trigger_rows = [trigger_by_interaction[iid] for iid in unique_interactions]
+    results = [r for r in results_by_pos if r is not None]
+    extra_metrics: Dict[str, object] = {}
+    if shard_count > 1:
+        extra_metrics["shard"] = f"{shard_index}/{shard_count}"
+    if args.adaptive_rate:
+        extra_metrics["rate_control"] = rate.summary()
+    if breaker is not None and breaker.trips:
+        extra_metrics["circuit_breaker"] = breaker.summary()
+    with timings.timed("missing_char_offsets_query"):
+        missing_char_offsets_count = query_missing_char_offsets(db, results)
+
+    write_run_artifacts(
+        run_dir,
+        run_id=run_id,
+        mode=args.mode,
+        reseed_mode=args.reseed_mode,
+        input_path=input_path,
+        out_root=out_root,
+        baseline_arg=baseline_arg,
+        trigger_rows=trigger_rows,
+        readiness_rows=readiness_rows,
+        results=results,
+        missing_char_offsets_count=missing_char_offsets_count,
+        cache_enabled=cache is not None,
+        cache_lookups=cache.lookups if cache else 0,
+        cache_hits=cache.hits if cache else 0,
+        extra_metrics=extra_metrics or None,
+        timings=timings,
+        prometheus_textfile=args.prometheus_textfile,
+        output_format=args.format,
+        run_index_path=run_index_path_from_args(args, out_root),
+        baseline_match=args.baseline_match.strip(),
+    )
+
+    db.close()
     print(f"GT_BATCH_RUN_READY {run_dir}")
     return 0
 
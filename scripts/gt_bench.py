@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+GT tooling benchmark suite.
+
+Generates deterministic synthetic batches (10k / 100k / 1M rows) and measures
+throughput (rows/sec) and peak RSS for the row-level hot paths:
+- gt_batch_runner.py: streaming input load + normalized output (CSV and JSON),
+  compute_correctness(),
+  write_csv(), the metrics pass (ResultColumns)
+- gt_db.py: COPY row decoding (what replaced parse_tsv)
+- gt_pick_fresh_review_items_v1.py: bundle building, selection, manifest rows
+- proofs/homeowner_override_proof_runner.py: evaluate_rows() + summarize()
+
+Each benchmark runs in its own subprocess so peak RSS is per benchmark (it
+includes the benchmark's in-memory input). Results are compared against
+gt_bench_thresholds.json; any benchmark slower or larger than its stored
+threshold fails the run (exit 1).
+
+Thresholds are relative, so one committed file holds on any host. Right after
+its timed run, each benchmark process times a fixed pure-Python row workload
+(csv write and read of dict rows, best of 3) on the same machine. The rate is
+stored as a multiple of that calibration rate. Memory is stored as RSS growth
+over the benchmark process's own startup RSS, so interpreter size does not count.
+
+Usage:
+  python3 scripts/gt_bench.py                      # 10k + 100k, check thresholds
+  python3 scripts/gt_bench.py --sizes 10k,100k,1m --only load_rows_csv,metrics
+  python3 scripts/gt_bench.py --update-thresholds  # re-record after an intended change
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import gc
+import io
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(SCRIPTS_DIR / "proofs"))
+
+THRESHOLDS_PATH = SCRIPTS_DIR / "gt_bench_thresholds.json"
+DEFAULT_SIZES = "10k,100k"
+# Headroom applied when recording thresholds, so normal run-to-run noise does not fail.
+RATE_TOLERANCE = 0.6
+RSS_TOLERANCE = 1.4
+RSS_FLOOR_MB = 5.0
+CALIBRATION_ROWS = 50_000
+CALIBRATION_REPEATS = 3
+
+PROJECTS = [f"proj-{i:03d}" for i in range(40)]
+PROJECT_NAMES = {p: f"Project {p[-3:]} Residence" for p in PROJECTS}
+DECISIONS = ["assign", "assign", "assign", "review", "none"]
+TAGS = ["homeowner_override", "bucket:voicemail", "bucket:multi_span", "bucket:low_confidence", "smoke", ""]
+REASONS = ["weak_anchor", "geo_only", "multi_project_span", "bizdev_without_commitment", "model_error", ""]
+
+
+def parse_size(value: str) -> int:
+    value = value.strip().lower()
+    for suffix, mult in (("m", 1_000_000), ("k", 1_000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * mult)
+    return int(value)
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def calibrate() -> float:
+    """Rows/sec of a fixed pure-Python row workload; benchmark rates are stored relative to it."""
+    rows = [
+        {
+            "interaction_id": f"cll_{i:08d}",
+            "project_id": PROJECTS[i % len(PROJECTS)],
+            "confidence": f"{i % 100 / 100:.2f}",
+        }
+        for i in range(CALIBRATION_ROWS)
+    ]
+    best = 0.0
+    for _ in range(CALIBRATION_REPEATS):
+        t0 = time.perf_counter()
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=list(rows[0]))
+        for row in rows:
+            writer.writerow({k: v.strip().lower() for k, v in row.items()})
+        buf.seek(0)
+        sum(float(r["confidence"]) for r in csv.DictReader(buf, fieldnames=list(rows[0])))
+        best = max(best, CALIBRATION_ROWS / (time.perf_counter() - t0))
+    return round(best, 1)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+
+def gen_input_rows(n: int, seed: int = 13) -> Iterator[Dict[str, str]]:
+    rng = random.Random(seed)
+    for i in range(n):
+        project = rng.choice(PROJECTS)
+        kind = rng.random()
+        yield {
+            "row_id": f"row_{i:07d}",
+            "interaction_id": f"cll_BENCH_{i // 3:07d}",
+            "span_index": str(i % 3),
+            "span_id": "",
+            "expected_project_id": project if kind < 0.5 else "",
+            "expected_project_name_contains": PROJECT_NAMES[project].split()[1] if 0.5 <= kind < 0.7 else "",
+            "expected_decision": rng.choice(DECISIONS) if kind < 0.9 else "",
+            "notes": "synthetic benchmark row",
+            "tags": ";".join(t for t in sorted({rng.choice(TAGS), rng.choice(TAGS)}) if t),
+        }
+
+
+def gen_actual(rng: random.Random, row: Dict[str, str]) -> Dict[str, str]:
+    project = row["expected_project_id"] if rng.random() < 0.8 and row["expected_project_id"] else rng.choice(PROJECTS)
+    return {
+        "resolved_span_id": f"00000000-0000-0000-0000-{rng.getrandbits(48):012x}",
+        "resolved_span_index": row["span_index"],
+        "char_start": "0",
+        "char_end": str(rng.randint(100, 4000)),
+        "actual_project_id": project,
+        "actual_project_name": PROJECT_NAMES[project],
+        "actual_decision": rng.choice(DECISIONS),
+        "actual_confidence": f"{rng.uniform(0.3, 1.0):.3f}",
+        "actual_prompt_version": "v1.10",
+        "actual_model_id": "bench-model",
+        "actual_reason_codes": "{" + rng.choice(REASONS) + "}",
+        "actual_reasoning": "anchored on address mention; multi-project span" if rng.random() < 0.05 else "anchored",
+        "error": "",
+    }
+
+
+def gen_results(n: int) -> List[Any]:
+    import gt_batch_runner as runner
+
+    rng = random.Random(17)
+    return [
+        runner.build_result(
+            runner.InputRow.from_mapping(row),
+            f"cll_SHADOW_GTBATCH_BENCH_{i // 3:07d}",
+            runner.Actual.from_mapping(gen_actual(rng, row)),
+        )
+        for i, row in enumerate(gen_input_rows(n))
+    ]
+
+
+def write_input_files(n: int, data_dir: Path) -> Tuple[Path, Path]:
+    """Stream synthetic input to CSV and JSON without holding it in memory."""
+    import csv
+
+    import gt_batch_runner as runner
+
+    csv_path = data_dir / f"gt_input_{n}.csv"
+    json_path = data_dir / f"gt_input_{n}.json"
+    if not csv_path.exists():
+        with csv_path.open("w", encoding="utf-8", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=runner.INPUT_FIELDS)
+            writer.writeheader()
+            writer.writerows(gen_input_rows(n))
+    if not json_path.exists():
+        with json_path.open("w", encoding="utf-8") as fh:
+            fh.write("[\n")
+            for i, row in enumerate(gen_input_rows(n)):
+                fh.write(("," if i else "") + json.dumps(row) + "\n")
+            fh.write("]\n")
+    return csv_path, json_path
+
+
+def gen_copy_lines(n: int) -> List[str]:
+    rng = random.Random(19)
+    lines = []
+    for row in gen_input_rows(n):
+        record = gen_actual(rng, row)
+        record["actual_reasoning"] = "line one\n\tline two \\ with escapes"
+        text = json.dumps({"row_pos": row["row_id"], **record}, sort_keys=True)
+        # COPY text format escapes backslash, newline and tab.
+        lines.append(text.replace("\\", "\\\\").replace("\n", "\\n").replace("\t", "\\t"))
+    return lines
+
+
+def gen_span_rows(n: int) -> List[Any]:
+    import gt_pick_fresh_review_items_v1 as picker
+
+    rng = random.Random(23)
+    contacts = ["Randy Booth", "Zack Sittler", "Pat Homeowner", "Lee Vendor", ""]
+    rows = []
+    for i in range(n):
+        project = rng.choice(PROJECTS)
+        rows.append(
+            picker.SpanRow(
+                interaction_id=f"cll_BENCH_{i // 3:07d}",
+                span_id=f"span-{i:08d}",
+                span_index=i % 3,
+                review_created_at=f"2026-{1 + (i // 3) % 12:02d}-{1 + (i // 3) % 28:02d}T00:00:{i % 60:02d}Z",
+                contact_name=rng.choice(contacts),
+                contact_phone="+15550000000",
+                owner_name="Owner",
+                event_at_utc="2026-01-01T00:00:00Z",
+                decision=rng.choice(DECISIONS),
+                confidence=rng.uniform(0.3, 1.0) if rng.random() < 0.9 else None,
+                reason_codes=rng.choice(REASONS),
+                predicted_project_id=project,
+                predicted_project_name=PROJECT_NAMES[project],
+                transcript_snippet="please leave a message after the tone" if rng.random() < 0.1 else "framing schedule",
+            )
+        )
+    return rows
+
+
+def gen_homeowner_rows(n: int) -> List[Dict[str, str]]:
+    rng = random.Random(29)
+    return [
+        {
+            "row_id": f"row_{i:07d}",
+            "interaction_id": f"cll_BENCH_{i // 3:07d}",
+            "span_id": f"span-{i:08d}",
+            "status": rng.choice(["review", "assign", "pending"]),
+            "override_active": rng.choice(["true", "false", "1", ""]),
+            "override_project_id": rng.choice(PROJECTS) if rng.random() < 0.7 else "",
+            "reason_codes": ";".join(sorted({rng.choice(REASONS), rng.choice(REASONS)})),
+        }
+        for i in range(n)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks: name -> (setup(n, data_dir) -> state, run(state) -> None)
+# ---------------------------------------------------------------------------
+
+
+def _setup_load_csv(n: int, data_dir: Path) -> Path:
+    return data_dir / f"gt_input_{n}.csv"
+
+
+def _setup_load_json(n: int, data_dir: Path) -> Path:
+    return data_dir / f"gt_input_{n}.json"
+
+
+def _run_load_rows(path: Path) -> None:
+    import gt_batch_runner as runner
+
+    # Same path as a fresh run: validate and write input_normalized.* row by row.
+    with tempfile.TemporaryDirectory(prefix="gt_bench_load_") as tmp:
+        normalized = runner.NormalizedInputWriter(Path(tmp))
+        for row in runner.iter_input_rows(path):
+            normalized.write(row)
+        normalized.commit()
+
+
+def _setup_correctness(n: int, data_dir: Path) -> Tuple[List[Any], List[Any]]:
+    import gt_batch_runner as runner
+
+    rng = random.Random(31)
+    rows = list(gen_input_rows(n))
+    actuals = [runner.Actual.from_mapping(gen_actual(rng, r)) for r in rows]
+    return [runner.InputRow.from_mapping(r) for r in rows], actuals
+
+
+def _run_correctness(state: Tuple[List[Any], List[Any]]) -> None:
+    import gt_batch_runner as runner
+
+    for row, actual in zip(*state):
+        runner.compute_correctness(row, actual)
+
+
+def _setup_write_csv(n: int, data_dir: Path) -> Tuple[Path, List[Any]]:
+    return data_dir / f"bench_results_{n}.csv", gen_results(n)
+
+
+def _run_write_csv(state: Tuple[Path, List[Any]]) -> None:
+    import gt_batch_runner as runner
+
+    path, results = state
+    runner.write_csv(path, runner.RESULT_FIELDS, results)
+    path.unlink()
+
+
+def _setup_metrics(n: int, data_dir: Path) -> List[Any]:
+    return gen_results(n)
+
+
+def _run_metrics(results: List[Any]) -> None:
+    import gt_batch_runner as runner
+
+    columns = runner.ResultColumns(results)
+    columns.totals()
+    columns.failure_rows(results)
+    columns.by_tag()
+    columns.by_project()
+
+
+def _setup_copy_decode(n: int, data_dir: Path) -> List[str]:
+    return gen_copy_lines(n)
+
+
+def _run_copy_decode(lines: List[str]) -> None:
+    from gt_db import copy_unescape
+
+    for line in lines:
+        json.loads(copy_unescape(line))
+
+
+def _setup_picker(n: int, data_dir: Path) -> List[Any]:
+    return gen_span_rows(n)
+
+
+def _run_picker(span_rows: List[Any]) -> None:
+    import gt_pick_fresh_review_items_v1 as picker
+
+    bundles = picker.build_bundles(span_rows, set())
+    selected = picker.select_interactions(bundles, max(15, len(span_rows) // 100), 0.75, picker.FLOATER_NAMES)
+    picker.build_manifest_rows(bundles, selected, 0.75, picker.FLOATER_NAMES)
+
+
+def _setup_homeowner(n: int, data_dir: Path) -> List[Dict[str, str]]:
+    return gen_homeowner_rows(n)
+
+
+def _run_homeowner(rows: List[Dict[str, str]]) -> None:
+    import homeowner_override_proof_runner as homeowner
+
+    homeowner.summarize(homeowner.evaluate_rows(rows))
+
+
+BENCHMARKS: Dict[str, Tuple[Callable[[int, Path], Any], Callable[[Any], None]]] = {
+    "load_rows_csv": (_setup_load_csv, _run_load_rows),
+    "load_rows_json": (_setup_load_json, _run_load_rows),
+    "compute_correctness": (_setup_correctness, _run_correctness),
+    "write_csv": (_setup_write_csv, _run_write_csv),
+    "metrics": (_setup_metrics, _run_metrics),
+    "db_copy_decode": (_setup_copy_decode, _run_copy_decode),
+    "picker_select": (_setup_picker, _run_picker),
+    "homeowner_evaluate": (_setup_homeowner, _run_homeowner),
+}
+
+
+def run_one(name: str, n: int, data_dir: Path) -> Dict[str, Any]:
+    setup, run = BENCHMARKS[name]
+    base_rss = peak_rss_mb()
+    state = setup(n, data_dir)
+    gc.collect()
+    setup_rss = peak_rss_mb()
+    t0 = time.perf_counter()
+    run(state)
+    elapsed = time.perf_counter() - t0
+    peak_rss = peak_rss_mb()
+    del state
+    gc.collect()
+    # Calibrated after the peak is read, so its own allocations never count.
+    calibration = calibrate()
+    rate = round(n / elapsed, 1) if elapsed > 0 else None
+    return {
+        "benchmark": name,
+        "rows": n,
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": rate,
+        "calibration_rows_per_sec": calibration,
+        "relative_rate": round(rate / calibration, 4) if rate is not None else None,
+        "base_rss_mb": base_rss,
+        "setup_rss_mb": setup_rss,
+        "peak_rss_mb": peak_rss,
+        "rss_growth_mb": round(peak_rss - base_rss, 1),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+def load_thresholds() -> Dict[str, Dict[str, Dict[str, float]]]:
+    if not THRESHOLDS_PATH.exists():
+        return {}
+    return json.loads(THRESHOLDS_PATH.read_text(encoding="utf-8")).get("benchmarks", {})
+
+
+def check(result: Dict[str, Any], thresholds: Dict[str, Dict[str, Dict[str, float]]]) -> List[str]:
+    limits = thresholds.get(result["benchmark"], {}).get(str(result["rows"]))
+    if not limits:
+        return []
+    problems = []
+    if result["relative_rate"] is not None and result["relative_rate"] < limits["min_relative_rate"]:
+        problems.append(f"relative rate {result['relative_rate']} < {limits['min_relative_rate']}")
+    if result["rss_growth_mb"] > limits["max_rss_growth_mb"]:
+        problems.append(f"RSS growth {result['rss_growth_mb']} MB > {limits['max_rss_growth_mb']} MB")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the GT tooling on synthetic batches")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma list of row counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--only", default="", help=f"comma list of benchmarks (default: all: {','.join(BENCHMARKS)})")
+    parser.add_argument("--data-dir", default="", help="where synthetic inputs are written (default: temp dir)")
+    parser.add_argument("--json-out", default="", help="optional path for the full results JSON")
+    parser.add_argument(
+        "--update-thresholds",
+        action="store_true",
+        help=f"record this run as the new thresholds (rate x{RATE_TOLERANCE}, RSS x{RSS_TOLERANCE})",
+    )
+    parser.add_argument("--run-one", nargs=3, metavar=("NAME", "ROWS", "DATA_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        name, rows, data_dir = args.run_one
+        print(json.dumps(run_one(name, int(rows), Path(data_dir))))
+        return 0
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    thresholds = load_thresholds()
+    results: List[Dict[str, Any]] = []
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory(prefix="gt_bench_") as tmp:
+        data_dir = Path(args.data_dir).expanduser() if args.data_dir else Path(tmp)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        print(
+            f"{'benchmark':<22} {'rows':>9} {'seconds':>9} {'rows/sec':>12} {'rel_rate':>9} "
+            f"{'rss_growth_mb':>13}  status"
+        )
+        for n in sizes:
+            if any(name.startswith("load_rows") for name in names):
+                write_input_files(n, data_dir)
+            for name in names:
+                proc = subprocess.run(
+                    [sys.executable, str(Path(__file__).resolve()), "--run-one", name, str(n), str(data_dir)],
+                    capture_output=True,
+                    text=True,
+                )
+                if proc.returncode != 0:
+                    failures.append(f"{name}@{n}: crashed: {proc.stderr.strip().splitlines()[-1:]}")
+                    print(f"{name:<22} {n:>9} {'-':>9} {'-':>12} {'-':>9} {'-':>13}  CRASH")
+                    continue
+                result = json.loads(proc.stdout.strip().splitlines()[-1])
+                problems = [] if args.update_thresholds else check(result, thresholds)
+                result["regressions"] = problems
+                results.append(result)
+                failures.extend(f"{name}@{n}: {p}" for p in problems)
+                status = "REGRESSED" if problems else ("ok" if str(n) in thresholds.get(name, {}) else "no threshold")
+                print(
+                    f"{name:<22} {n:>9} {result['seconds']:>9} {result['rows_per_sec']:>12} "
+                    f"{result['relative_rate']:>9} {result['rss_growth_mb']:>13}  {status}"
+                )
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.update_thresholds:
+        for r in results:
+            thresholds.setdefault(r["benchmark"], {})[str(r["rows"])] = {
+                "min_relative_rate": round(r["relative_rate"] * RATE_TOLERANCE, 4),
+                "max_rss_growth_mb": round(max(r["rss_growth_mb"] * RSS_TOLERANCE, RSS_FLOOR_MB), 1),
+            }
+        payload = {
+            "note": (
+                "Rates are multiples of the in-run calibration rate; memory is RSS growth over process start. "
+                "Re-record with `python3 scripts/gt_bench.py --update-thresholds`."
+            ),
+            "benchmarks": {k: thresholds[k] for k in sorted(thresholds)},
+        }
+        THRESHOLDS_PATH.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"thresholds_written={THRESHOLDS_PATH}")
+        return 0
+
+    if failures:
+        print("\nREGRESSIONS:")
+        for f in failures:
+            print(f"- {f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Shared read-only Postgres access for the GT scripts.
+
+Backends:
+- psycopg (v3), when importable: persistent pooled connections, reused across queries
+- psql (PSQL_PATH, default `psql`): one subprocess per query, for machines without a driver
+
+Every query is streamed as `COPY (select row_to_json(q) ...) TO STDOUT`, so rows
+arrive as JSON objects keyed by column name. Values are decoded to JSON types
+(str/int/float/bool/None/list/dict) identically on both backends, and embedded
+tabs/newlines in text columns cannot break row framing.
+
+Set GT_DB_DRIVER=psql to force the subprocess backend.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+try:  # optional driver
+    import psycopg  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on local install
+    psycopg = None
+
+Row = Dict[str, Any]
+
+COPY_ESCAPE_RE = re.compile(r"\\(.)")
+COPY_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+
+def copy_unescape(field: str) -> str:
+    """Decode one field of COPY text-format output."""
+    if "\\" not in field:
+        return field
+    return COPY_ESCAPE_RE.sub(lambda m: COPY_ESCAPES.get(m.group(1), m.group(1)), field)
+
+
+def copy_json_sql(sql: str) -> str:
+    body = sql.strip().rstrip(";").strip()
+    return f"copy (select row_to_json(q)::text from (\n{body}\n) q) to stdout"
+
+
+class ConnectionPool:
+    """Minimal thread-safe psycopg connection pool (lazily grows to max_size).
+
+    Callers that find the pool at max_size wait on a condition. It is signalled when
+    a connection comes back, and also when one is discarded, so a waiter can open
+    the replacement.
+    """
+
+    def __init__(self, database_url: str, max_size: int = 4) -> None:
+        self.database_url = database_url
+        self.max_size = max(1, int(max_size))
+        self._idle: List[Any] = []
+        self._cond = threading.Condition()
+        self._opened = 0
+
+    def acquire(self) -> Any:
+        with self._cond:
+            while not self._idle and self._opened >= self.max_size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+        try:
+            return psycopg.connect(self.database_url, autocommit=True)
+        except Exception:
+            self._discarded()
+            raise
+
+    def release(self, conn: Any) -> None:
+        # A connection left mid-COPY (abandoned generator) or broken is discarded.
+        if conn.closed or conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+            try:
+                conn.close()
+            finally:
+                self._discarded()
+            return
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def _discarded(self) -> None:
+        with self._cond:
+            self._opened -= 1
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+
+
+class Database:
+    def __init__(self, database_url: str, psql_bin: str = "psql", pool_size: int = 4, driver: str = "auto") -> None:
+        if driver not in {"auto", "psycopg", "psql"}:
+            raise RuntimeError(f"unknown db driver: {driver}")
+        if driver == "psycopg" and psycopg is None:
+            raise RuntimeError("db driver psycopg requested but not installed")
+        self.database_url = database_url
+        self.psql_bin = psql_bin
+        self.backend = "psycopg" if driver != "psql" and psycopg is not None else "psql"
+        self._pool: Optional[ConnectionPool] = (
+            ConnectionPool(database_url, pool_size) if self.backend == "psycopg" else None
+        )
+
+    def rows(self, sql: str) -> Iterator[Row]:
+        """Stream query rows as dicts without buffering the full result."""
+        copy_sql = copy_json_sql(sql)
+        if self._pool is not None:
+            yield from self._rows_psycopg(copy_sql)
+        else:
+            yield from self._rows_psql(copy_sql)
+
+    def fetch_all(self, sql: str) -> List[Row]:
+        return list(self.rows(sql))
+
+    def fetch_one(self, sql: str) -> Optional[Row]:
+        rows = self.fetch_all(sql)
+        return rows[0] if rows else None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+
+    def __enter__(self) -> "Database":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _rows_psycopg(self, copy_sql: str) -> Iterator[Row]:
+        assert self._pool is not None
+        conn = self._pool.acquire()
+        try:
+            with conn.cursor() as cur:
+                with cur.copy(copy_sql) as cp:
+                    for record in cp.rows():
+                        yield json.loads(record[0])
+        finally:
+            self._pool.release(conn)
+
+    def _rows_psql(self, copy_sql: str) -> Iterator[Row]:
+        cmd = [self.psql_bin, self.database_url, "-X", "-q", "-v", "ON_ERROR_STOP=1", "-c", copy_sql]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8")
+        assert proc.stdout is not None and proc.stderr is not None
+        try:
+            for line in proc.stdout:
+                # Skip anything that is not a row (e.g. a COPY command tag).
+                line = line.rstrip("\n")
+                if line.startswith("{"):
+                    yield json.loads(copy_unescape(line))
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise RuntimeError(f"psql_failed: {stderr.strip() or 'psql failed'}")
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+
+
+def database_from_env(pool_size: int = 4) -> Database:
+    database_url = os.environ.get("DATABASE_URL", "").strip()
+    if not database_url:
+        raise RuntimeError("missing required env var: DATABASE_URL")
+    return Database(
+        database_url,
+        psql_bin=os.environ.get("PSQL_PATH", "psql"),
+        pool_size=pool_size,
+        driver=os.environ.get("GT_DB_DRIVER", "auto").strip() or "auto",
+    )
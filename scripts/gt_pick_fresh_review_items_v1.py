@@ -17,12 +17,14 @@ import csv
 import datetime as dt
 import os
 import re
-import subprocess
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+from gt_db import database_from_env
+from gt_records import intern_decision
+
 
 MANIFEST_FIELDS = [
     "interaction_id",
@@ -36,8 +38,11 @@ MANIFEST_FIELDS = [
     "labeled_at_utc",
 ]
 
+# Deterministic feature buckets
+FLOATER_NAMES = {n.lower() for n in ["Randy Booth", "Zack Sittler", "Zachary Sittler", "Zach Sittler"]}
+
 
-@dataclass
+@dataclass(slots=True)
 class SpanRow:
     interaction_id: str
     span_id: str
@@ -55,7 +60,7 @@ class SpanRow:
     transcript_snippet: str
 
 
-@dataclass
+@dataclass(slots=True)
 class InteractionBundle:
     interaction_id: str
     spans: List[SpanRow] = field(default_factory=list)
@@ -105,38 +110,6 @@ def ensure_env(var: str) -> str:
     return val
 
 
-def run_psql(database_url: str, psql_bin: str, sql: str) -> str:
-    cmd = [
-        psql_bin,
-        database_url,
-        "-X",
-        "-v",
-        "ON_ERROR_STOP=1",
-        "-A",
-        "-t",
-        "-F",
-        "\t",
-        "-c",
-        sql,
-    ]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise RuntimeError(f"psql_failed: {proc.stderr.strip()}")
-    return proc.stdout
-
-
-def parse_tsv(stdout: str, headers: Sequence[str]) -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
-    for line in (stdout or "").splitlines():
-        if not line.strip():
-            continue
-        parts = line.split("\t")
-        if len(parts) != len(headers):
-            raise RuntimeError(f"unexpected_column_count: got={len(parts)} expected={len(headers)} line={line[:120]}")
-        rows.append({headers[i]: parts[i] for i in range(len(headers))})
-    return rows
-
-
 def load_dedupe_interaction_ids(root: Path) -> Set[str]:
     dedupe: Set[str] = set()
 
@@ -186,123 +159,7 @@ def compact_snippet(text: str, max_len: int = 160) -> str:
     return cleaned[: max_len - 1].rstrip() + "…"
 
 
-def main(argv: Sequence[str]) -> int:
-    ap = argparse.ArgumentParser(description="Pick fresh GT candidates from v_review_queue_spans (read-only).")
-    ap.add_argument("--out", default="", help="output csv path (default: proofs/gt/inputs/<UTC-date>/gt_manifest_v2.csv)")
-    ap.add_argument("--max-interactions", type=int, default=15, help="target number of unique interaction_ids")
-    ap.add_argument("--query-limit", type=int, default=2500, help="max review-queue span rows to consider")
-    ap.add_argument("--low-conf-threshold", type=float, default=0.75, help="bucket threshold for low-confidence spans")
-    ap.add_argument("--include-shadow", action="store_true", help="include cll_SHADOW_* test interactions (default: excluded)")
-    ap.add_argument("--dry-run", action="store_true", help="print selection summary only; do not write file")
-    args = ap.parse_args(list(argv))
-
-    root = repo_root()
-    database_url = ensure_env("DATABASE_URL")
-    psql_bin = os.environ.get("PSQL_PATH", "psql")
-
-    # Dedupe registry (labels + prior manifests)
-    dedupe_ids = load_dedupe_interaction_ids(root)
-
-    headers = [
-        "interaction_id",
-        "span_id",
-        "span_index",
-        "review_created_at",
-        "contact_name",
-        "contact_phone",
-        "owner_name",
-        "event_at_utc",
-        "decision",
-        "confidence",
-        "reason_codes",
-        "predicted_project_id",
-        "predicted_project_name",
-        "transcript_snippet",
-    ]
-
-    shadow_filter = "" if args.include_shadow else "and v.interaction_id not like 'cll_SHADOW_%'"
-
-    sql = f"""
-with rq as (
-  select
-    v.interaction_id,
-    v.span_id,
-    v.review_created_at::text as review_created_at,
-    v.review_status,
-    v.reason_codes::text as reason_codes,
-    v.transcript_snippet,
-    v.decision,
-    v.confidence,
-    v.predicted_project_id
-  from public.v_review_queue_spans v
-  where v.review_status in ('pending','open')
-    and v.span_id is not null
-    and v.interaction_id is not null
-    {shadow_filter}
-  order by v.review_created_at desc
-  limit {int(args.query_limit)}
-),
-spans as (
-  select
-    rq.*,
-    cs.span_index
-  from rq
-  join public.conversation_spans cs on cs.id = rq.span_id
-    and cs.is_superseded = false
-)
-select
-  s.interaction_id,
-  s.span_id::text as span_id,
-  s.span_index::text as span_index,
-  s.review_created_at,
-  coalesce(i.contact_name,'') as contact_name,
-  coalesce(i.contact_phone,'') as contact_phone,
-  coalesce(i.owner_name,'') as owner_name,
-  coalesce(i.event_at_utc::text,'') as event_at_utc,
-  coalesce(s.decision,'') as decision,
-  coalesce(s.confidence::text,'') as confidence,
-  coalesce(s.reason_codes,'') as reason_codes,
-  coalesce(s.predicted_project_id,'') as predicted_project_id,
-  coalesce(p.name,'') as predicted_project_name,
-  replace(replace(coalesce(s.transcript_snippet,''), E'\\n',' '), E'\\t',' ') as transcript_snippet
-from spans s
-left join public.interactions i on i.interaction_id = s.interaction_id
-left join public.projects p on p.id::text = s.predicted_project_id
-order by s.review_created_at desc, s.interaction_id, s.span_index;
-""".strip()
-
-    raw = run_psql(database_url, psql_bin, sql)
-    parsed = parse_tsv(raw, headers)
-
-    span_rows: List[SpanRow] = []
-    for r in parsed:
-        conf_raw = (r.get("confidence") or "").strip()
-        conf_val: Optional[float] = None
-        if conf_raw:
-            try:
-                conf_val = float(conf_raw)
-            except ValueError:
-                conf_val = None
-
-        span_rows.append(
-            SpanRow(
-                interaction_id=r["interaction_id"],
-                span_id=r["span_id"],
-                span_index=int(r["span_index"]),
-                review_created_at=r["review_created_at"],
-                contact_name=r["contact_name"],
-                contact_phone=r["contact_phone"],
-                owner_name=r["owner_name"],
-                event_at_utc=r["event_at_utc"],
-                decision=r["decision"],
-                confidence=conf_val,
-                reason_codes=r["reason_codes"],
-                predicted_project_id=r["predicted_project_id"],
-                predicted_project_name=r["predicted_project_name"],
-                transcript_snippet=r["transcript_snippet"],
-            )
-        )
-
+def build_bundles(span_rows: Iterable[SpanRow], dedupe_ids: Set[str]) -> Dict[str, InteractionBundle]:
     bundles: Dict[str, InteractionBundle] = {}
     for s in span_rows:
         if s.interaction_id in dedupe_ids:
@@ -321,13 +178,18 @@ order by s.review_created_at desc, s.interaction_id, s.span_index;
         if s.event_at_utc and not b.event_at_utc:
             b.event_at_utc = s.event_at_utc
         b.newest_review_created_at = max(b.newest_review_created_at, s.review_created_at)
+    return bundles
 
-    # Deterministic feature buckets
-    floater_names = {n.lower() for n in ["Randy Booth", "Zack Sittler", "Zachary Sittler", "Zach Sittler"]}
 
+def select_interactions(
+    bundles: Dict[str, InteractionBundle],
+    max_interactions: int,
+    low_conf_threshold: float,
+    floater_names: Set[str],
+) -> List[str]:
     scored: List[Tuple[str, Dict[str, object]]] = []
     for iid, b in bundles.items():
-        meta = b.compute(args.low_conf_threshold, floater_names)
+        meta = b.compute(low_conf_threshold, floater_names)
         scored.append((iid, meta))
 
     # Candidate lists (deterministic ordering: newest review_created_at first)
@@ -346,14 +208,14 @@ order by s.review_created_at desc, s.interaction_id, s.span_index;
     def take_from(pool: List[str], k: int) -> None:
         taken = 0
         for iid in pool:
-            if len(selected) >= int(args.max_interactions):
+            if len(selected) >= max_interactions:
                 return
             if iid in selected_set:
                 continue
             selected.append(iid)
             selected_set.add(iid)
             taken += 1
-            if taken >= k or len(selected) >= int(args.max_interactions):
+            if taken >= k or len(selected) >= max_interactions:
                 return
 
     # Diversity-first selection
@@ -361,9 +223,9 @@ order by s.review_created_at desc, s.interaction_id, s.span_index;
     take_from(floater, 3)
     take_from(multi_project, 3)
     take_from(low_conf, 5)
-    take_from(newest_any, int(args.max_interactions))
+    take_from(newest_any, max_interactions)
 
-    selected = selected[: int(args.max_interactions)]
+    selected = selected[:max_interactions]
 
     # Ensure at least 2 predicted projects represented (best-effort)
     covered_projects: Set[str] = set()
@@ -387,16 +249,20 @@ order by s.review_created_at desc, s.interaction_id, s.span_index;
                         break
             if len(covered_projects) >= 2:
                 break
+    return selected
 
-    # Emit manifest rows (one row per span)
-    utc_date = dt.datetime.utcnow().strftime("%Y-%m-%d")
-    out_path = Path(args.out) if args.out else default_out_path(root, utc_date)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
 
+def build_manifest_rows(
+    bundles: Dict[str, InteractionBundle],
+    selected: List[str],
+    low_conf_threshold: float,
+    floater_names: Set[str],
+) -> List[Dict[str, str]]:
+    # One manifest row per span
     manifest_rows: List[Dict[str, str]] = []
     for iid in selected:
         b = bundles[iid]
-        meta = b.compute(args.low_conf_threshold, floater_names)
+        meta = b.compute(low_conf_threshold, floater_names)
 
         tags: List[str] = []
         if meta["has_voicemail"]:
@@ -431,12 +297,121 @@ order by s.review_created_at desc, s.interaction_id, s.span_index;
                     "labeled_at_utc": "",
                 }
             )
+    return manifest_rows
+
+
+def main(argv: Sequence[str]) -> int:
+    ap = argparse.ArgumentParser(description="Pick fresh GT candidates from v_review_queue_spans (read-only).")
+    ap.add_argument("--out", default="", help="output csv path (default: proofs/gt/inputs/<UTC-date>/gt_manifest_v2.csv)")
+    ap.add_argument("--max-interactions", type=int, default=15, help="target number of unique interaction_ids")
+    ap.add_argument("--query-limit", type=int, default=2500, help="max review-queue span rows to consider")
+    ap.add_argument("--low-conf-threshold", type=float, default=0.75, help="bucket threshold for low-confidence spans")
+    ap.add_argument("--include-shadow", action="store_true", help="include cll_SHADOW_* test interactions (default: excluded)")
+    ap.add_argument("--dry-run", action="store_true", help="print selection summary only; do not write file")
+    args = ap.parse_args(list(argv))
+
+    root = repo_root()
+    ensure_env("DATABASE_URL")
+    db = database_from_env(pool_size=1)
+
+    # Dedupe registry (labels + prior manifests)
+    dedupe_ids = load_dedupe_interaction_ids(root)
+
+    shadow_filter = "" if args.include_shadow else "and v.interaction_id not like 'cll_SHADOW_%'"
+
+    sql = f"""
+with rq as (
+  select
+    v.interaction_id,
+    v.span_id,
+    v.review_created_at::text as review_created_at,
+    v.review_status,
+    v.reason_codes::text as reason_codes,
+    v.transcript_snippet,
+    v.decision,
+    v.confidence,
+    v.predicted_project_id
+  from public.v_review_queue_spans v
+  where v.review_status in ('pending','open')
+    and v.span_id is not null
+    and v.interaction_id is not null
+    {shadow_filter}
+  order by v.review_created_at desc
+  limit {int(args.query_limit)}
+),
+spans as (
+  select
+    rq.*,
+    cs.span_index
+  from rq
+  join public.conversation_spans cs on cs.id = rq.span_id
+    and cs.is_superseded = false
+)
+select
+  s.interaction_id,
+  s.span_id::text as span_id,
+  s.span_index,
+  s.review_created_at,
+  coalesce(i.contact_name,'') as contact_name,
+  coalesce(i.contact_phone,'') as contact_phone,
+  coalesce(i.owner_name,'') as owner_name,
+  coalesce(i.event_at_utc::text,'') as event_at_utc,
+  coalesce(s.decision,'') as decision,
+  s.confidence,
+  coalesce(s.reason_codes,'') as reason_codes,
+  coalesce(s.predicted_project_id,'') as predicted_project_id,
+  coalesce(p.name,'') as predicted_project_name,
+  coalesce(s.transcript_snippet,'') as transcript_snippet
+from spans s
+left join public.interactions i on i.interaction_id = s.interaction_id
+left join public.projects p on p.id::text = s.predicted_project_id
+order by s.review_created_at desc, s.interaction_id, s.span_index;
+""".strip()
+
+    span_rows: List[SpanRow] = []
+    for r in db.rows(sql):
+        conf_raw = r.get("confidence")
+        conf_val: Optional[float] = None
+        if conf_raw is not None:
+            try:
+                conf_val = float(conf_raw)
+            except (TypeError, ValueError):
+                conf_val = None
+
+        span_rows.append(
+            SpanRow(
+                interaction_id=r["interaction_id"],
+                span_id=r["span_id"],
+                span_index=int(r["span_index"]),
+                review_created_at=r["review_created_at"],
+                contact_name=r["contact_name"],
+                contact_phone=r["contact_phone"],
+                owner_name=r["owner_name"],
+                event_at_utc=r["event_at_utc"],
+                decision=intern_decision(r["decision"]),
+                confidence=conf_val,
+                reason_codes=r["reason_codes"],
+                predicted_project_id=r["predicted_project_id"],
+                predicted_project_name=r["predicted_project_name"],
+                transcript_snippet=r["transcript_snippet"],
+            )
+        )
+    db.close()
+
+    bundles = build_bundles(span_rows, dedupe_ids)
+    selected = select_interactions(bundles, int(args.max_interactions), args.low_conf_threshold, FLOATER_NAMES)
+    manifest_rows = build_manifest_rows(bundles, selected, args.low_conf_threshold, FLOATER_NAMES)
+
+    # Output path
+    utc_date = dt.datetime.utcnow().strftime("%Y-%m-%d")
+    out_path = Path(args.out) if args.out else default_out_path(root, utc_date)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Summary
     print(f"picked_interactions={len(selected)} span_rows={len(manifest_rows)} dedupe_interactions={len(dedupe_ids)}")
     for iid in selected:
         b = bundles[iid]
-        meta = b.compute(args.low_conf_threshold, floater_names)
+        meta = b.compute(args.low_conf_threshold, FLOATER_NAMES)
         tag_bits = []
         if meta["has_voicemail"]:
             tag_bits.append("voicemail")
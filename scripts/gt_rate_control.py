@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Adaptive (AIMD) rate and concurrency control for the batch edge-function callers.
+
+Shared by gt_batch_runner.py (shadow-replay / admin-reseed triggers) and
+admin_reseed_batch_backfill.py. Both expose it through the same flags
+(add_rate_control_args): `--adaptive-rate` plus optional ceilings and tuning.
+
+Callers bracket every request with guarded_call(), which holds a breaker pass and
+a rate slot and returns both even if the request raises:
+
+    with guarded_call(controller, breaker) as call:   # blocks on the breaker, then for a slot
+        status, data = post(...)
+        call.status = status                          # fed back to the controller and breaker
+
+Policy (additive increase, multiplicative decrease):
+- A window is `--adaptive-window` completed calls. A window with no 429s, at most
+  an error budget of 5xx/timeouts (status 0) and p95 latency within
+  `--adaptive-p95-factor` x the healthy baseline raises concurrency by 1 and the
+  rate by 10% of its starting value (at least 1 call/minute), up to the ceilings.
+- A 429, an error budget overrun or a p95 above the threshold halves both
+  (down to 1 in flight / the floor rate) and starts a new window.
+- Only calls that started after the last decrease can trigger another one, so a
+  burst of failures that were already in flight backs off once, not N times.
+
+CircuitBreaker pauses dispatch entirely during an outage. After `--breaker-threshold`
+consecutive 5xx/timeouts it opens, and callers block in before_call() for
+`--breaker-cooldown-seconds`. Then exactly one probe call is let through (half-open).
+A healthy probe closes the breaker. A failed probe reopens it with double the
+cooldown (capped at 10 minutes). Transitions go to circuit_breaker.jsonl.
+
+The rate is enforced by a token bucket shared by every worker thread. Without
+`--adaptive-rate` the controller just enforces the fixed starting rate and
+concurrency. Every adjustment is printed and appended to rate_control.jsonl.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+LOG_NAME = "rate_control.jsonl"
+BREAKER_LOG_NAME = "circuit_breaker.jsonl"
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN_S = 30.0
+MAX_BREAKER_COOLDOWN_S = 600.0
+DEFAULT_WINDOW = 20
+DEFAULT_P95_FACTOR = 1.5
+DEFAULT_CEILING_MULTIPLE = 4
+ERROR_BUDGET = 0.05
+DECREASE_FACTOR = 0.5
+INCREASE_FRACTION = 0.1
+# Without a floor, a slow starting rate (e.g. 2/min) would take dozens of windows to climb.
+MIN_RATE_STEP = 1.0
+MIN_PER_MINUTE = 0.5
+# Baseline p95 follows healthy windows with this smoothing weight.
+BASELINE_ALPHA = 0.2
+
+
+def is_throttled(status: int) -> bool:
+    return status == 429
+
+
+def is_error(status: int) -> bool:
+    """5xx or no response at all (timeout, connection failure)."""
+    return status == 0 or status >= 500
+
+
+def nearest_rank(sorted_values: List[float], q: float) -> float:
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class TokenBucket:
+    """Global request-rate limiter: per_minute tokens a minute, up to `burst` banked.
+
+    A caller that finds the bucket empty reserves a future token (the balance goes
+    negative) and sleeps until it is due. Waiters are therefore served in arrival
+    order, and the long-run rate never exceeds per_minute however many threads share
+    the bucket.
+    """
+
+    def __init__(self, per_minute: float, burst: float = 1.0) -> None:
+        self.per_minute = per_minute
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.per_minute / 60.0)
+        self._stamp = now
+
+    def take(self) -> float:
+        """Block until one token is available; returns the time it became due (monotonic)."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+            due = now if self._tokens >= 0 else now + -self._tokens * 60.0 / self.per_minute
+        if due > now:
+            time.sleep(due - now)
+        return due
+
+    def set_rate(self, per_minute: float, drain: bool = False) -> None:
+        """Change the refill rate; drain=True also drops banked tokens (after a back-off)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.per_minute = per_minute
+            if drain:
+                self._tokens = min(self._tokens, 0.0)
+
+
+class AdaptiveRateController:
+    """Thread-safe concurrency + request-rate limiter with optional AIMD adjustment.
+
+    per_minute <= 0 means no rate limit (only concurrency is enforced/adapted).
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        per_minute: float,
+        adaptive: bool = False,
+        max_concurrency: int = 0,
+        max_per_minute: float = 0.0,
+        window: int = DEFAULT_WINDOW,
+        p95_factor: float = DEFAULT_P95_FACTOR,
+        log_path: Optional[Path] = None,
+        label: str = "rate_control",
+        burst: float = 1.0,
+    ) -> None:
+        self.adaptive = adaptive
+        self.concurrency = max(1, concurrency)
+        self.per_minute = max(0.0, per_minute)
+        self.max_concurrency = max(self.concurrency, max_concurrency or self.concurrency * DEFAULT_CEILING_MULTIPLE)
+        if not adaptive:
+            self.max_concurrency = self.concurrency
+        if self.per_minute > 0:
+            self.max_per_minute = max(self.per_minute, max_per_minute or self.per_minute * DEFAULT_CEILING_MULTIPLE)
+        else:
+            self.max_per_minute = 0.0
+        self.rate_step = max(MIN_RATE_STEP, self.per_minute * INCREASE_FRACTION)
+        self.window = max(1, window)
+        self.p95_factor = p95_factor
+        self.error_budget = max(1, math.ceil(self.window * ERROR_BUDGET))
+        self.log_path = log_path
+        self.label = label
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._bucket = TokenBucket(self.per_minute, burst) if self.per_minute > 0 else None
+        self._last_decrease = float("-inf")
+        self._window_latencies: List[float] = []
+        self._window_errors = 0
+        self._window_throttled = 0
+        self.baseline_p95_s: Optional[float] = None
+        self.calls = 0
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def max_workers(self) -> int:
+        """Thread pool size callers need so the ceiling is reachable."""
+        return self.max_concurrency
+
+    @property
+    def in_flight(self) -> int:
+        """Requests holding a concurrency slot (including any waiting on the rate limit)."""
+        with self._cond:
+            return self._in_flight
+
+    def acquire(self) -> float:
+        """Block until a request may start; returns its start time (monotonic)."""
+        with self._cond:
+            while self._in_flight >= self.concurrency:
+                self._cond.wait()
+            self._in_flight += 1
+        if self._bucket is None:
+            return time.monotonic()
+        try:
+            return self._bucket.take()
+        except BaseException:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, started_at: float, status: int, latency_s: Optional[float] = None) -> None:
+        """Record one finished request (HTTP status, 0 = no response)."""
+        if latency_s is None:
+            latency_s = time.monotonic() - started_at
+        with self._cond:
+            self._in_flight -= 1
+            self.calls += 1
+            self._cond.notify()
+            if not self.adaptive:
+                return
+            throttled = is_throttled(status)
+            if throttled:
+                self._window_throttled += 1
+            elif is_error(status):
+                self._window_errors += 1
+            else:
+                self._window_latencies.append(latency_s)
+
+            may_decrease = started_at >= self._last_decrease
+            if throttled and may_decrease:
+                self._decrease("throttled_429")
+            elif self._window_errors > self.error_budget and may_decrease:
+                self._decrease("error_budget_exceeded")
+            elif self._window_calls() >= self.window:
+                self._close_window(may_decrease)
+
+    def _window_calls(self) -> int:
+        return len(self._window_latencies) + self._window_errors + self._window_throttled
+
+    def _window_p95(self) -> Optional[float]:
+        if not self._window_latencies:
+            return None
+        return nearest_rank(sorted(self._window_latencies), 0.95)
+
+    def _close_window(self, may_decrease: bool) -> None:
+        p95 = self._window_p95()
+        baseline = self.baseline_p95_s
+        if p95 is not None and baseline is not None and p95 > baseline * self.p95_factor and may_decrease:
+            self._decrease("p95_rising")
+            return
+        if self._window_throttled == 0 and self._window_errors <= self.error_budget:
+            if p95 is not None:
+                self.baseline_p95_s = p95 if baseline is None else baseline + BASELINE_ALPHA * (p95 - baseline)
+            self._increase()
+        self._reset_window()
+
+    def _increase(self) -> None:
+        old = (self.concurrency, self.per_minute)
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+        if self._bucket is not None:
+            self.per_minute = min(self.max_per_minute, self.per_minute + self.rate_step)
+            self._bucket.set_rate(self.per_minute)
+        if (self.concurrency, self.per_minute) != old:
+            self.increases += 1
+            self._log("increase", "healthy_window", old)
+            self._cond.notify_all()
+
+    def _decrease(self, reason: str) -> None:
+        old = (self.concurrency, self.per_minute)
+        self.concurrency = max(1, int(self.concurrency * DECREASE_FACTOR))
+        if self._bucket is not None:
+            self.per_minute = max(min(MIN_PER_MINUTE, self.per_minute), self.per_minute * DECREASE_FACTOR)
+            self._bucket.set_rate(self.per_minute, drain=True)
+        self._last_decrease = time.monotonic()
+        self.decreases += 1
+        self._log("decrease", reason, old)
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._window_latencies = []
+        self._window_errors = 0
+        self._window_throttled = 0
+
+    def _log(self, action: str, reason: str, old: tuple) -> None:
+        p95 = self._window_p95()
+        decision = {
+            "at_utc": dt.datetime.utcnow().isoformat() + "Z",
+            "action": action,
+            "reason": reason,
+            "concurrency": self.concurrency,
+            "previous_concurrency": old[0],
+            "per_minute": round(self.per_minute, 2),
+            "previous_per_minute": round(old[1], 2),
+            "window_calls": self._window_calls(),
+            "window_errors": self._window_errors,
+            "window_throttled": self._window_throttled,
+            "window_p95_ms": round(p95 * 1000.0, 1) if p95 is not None else None,
+            "baseline_p95_ms": round(self.baseline_p95_s * 1000.0, 1) if self.baseline_p95_s is not None else None,
+            "calls": self.calls,
+        }
+        parts = [f"{self.label}: {action} ({reason})"]
+        if self.max_concurrency > 1:
+            parts.append(f"concurrency {old[0]}->{self.concurrency}")
+        if self.per_minute > 0:
+            parts.append(f"rate {old[1]:.1f}->{self.per_minute:.1f}/min")
+        parts.append(f"p95_ms={decision['window_p95_ms']} baseline_ms={decision['baseline_p95_ms']}")
+        print(" ".join(parts), flush=True)
+        if self.log_path is not None:
+            with self.log_path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(decision, sort_keys=True) + "\n")
+
+    def summary(self) -> Dict[str, object]:
+        with self._cond:
+            return {
+                "adaptive": self.adaptive,
+                "calls": self.calls,
+                "final_concurrency": self.concurrency,
+                "max_concurrency": self.max_concurrency,
+                "final_per_minute": round(self.per_minute, 2) if self.per_minute > 0 else None,
+                "max_per_minute": round(self.max_per_minute, 2) if self.max_per_minute > 0 else None,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "baseline_p95_ms": round(self.baseline_p95_s * 1000.0, 1) if self.baseline_p95_s is not None else None,
+            }
+
+
+class CircuitBreaker:
+    """closed -> open (after `threshold` consecutive 5xx/timeouts) -> half_open (one probe) -> closed.
+
+    Callers wrap each request (guarded_call() does this):
+
+        probe = breaker.before_call()    # blocks while open, or while another probe is out
+        status = post(...)
+        breaker.record(probe, status)    # always, or a probe that raised would block every caller
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        *,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        cooldown_s: float = DEFAULT_BREAKER_COOLDOWN_S,
+        log_path: Optional[Path] = None,
+        label: str = "circuit_breaker",
+    ) -> None:
+        self.threshold = max(1, threshold)
+        self.base_cooldown_s = cooldown_s
+        self.cooldown_s = cooldown_s
+        self.log_path = log_path
+        self.label = label
+        self.state = self.CLOSED
+        self.trips = 0
+        self.open_seconds = 0.0
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_out = False
+        self._cond = threading.Condition()
+
+    def before_call(self) -> bool:
+        """Block until a call may be dispatched; returns True if it is the half-open probe."""
+        with self._cond:
+            while True:
+                if self.state == self.CLOSED:
+                    return False
+                if self.state == self.OPEN:
+                    remaining = self._opened_at + self.cooldown_s - time.monotonic()
+                    if remaining > 0:
+                        self._cond.wait(remaining)
+                        continue
+                    self.open_seconds += time.monotonic() - self._opened_at
+                    self._transition(self.HALF_OPEN, "cooldown_elapsed")
+                if not self._probe_out:
+                    self._probe_out = True
+                    return True
+                self._cond.wait()
+
+    def record(self, probe: bool, status: int) -> None:
+        failed = is_error(status)
+        with self._cond:
+            if probe:
+                self._probe_out = False
+                if failed:
+                    self.cooldown_s = min(MAX_BREAKER_COOLDOWN_S, self.cooldown_s * 2)
+                    self._open(f"probe_failed_http_{status}")
+                else:
+                    self.cooldown_s = self.base_cooldown_s
+                    self._consecutive_failures = 0
+                    self._transition(self.CLOSED, f"probe_ok_http_{status}")
+                self._cond.notify_all()
+                return
+            if self.state != self.CLOSED:
+                # Calls dispatched before the breaker opened; the probe decides.
+                return
+            if not failed:
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.threshold:
+                self._open(f"{self._consecutive_failures}_consecutive_failures_last_http_{status}")
+
+    def _open(self, reason: str) -> None:
+        self._opened_at = time.monotonic()
+        self.trips += 1
+        self._transition(self.OPEN, reason)
+
+    def _transition(self, state: str, reason: str) -> None:
+        previous, self.state = self.state, state
+        event = {
+            "at_utc": dt.datetime.utcnow().isoformat() + "Z",
+            "from": previous,
+            "to": state,
+            "reason": reason,
+            "cooldown_s": round(self.cooldown_s, 1),
+            "trips": self.trips,
+        }
+        suffix = f" for {self.cooldown_s:.0f}s" if state == self.OPEN else ""
+        print(f"{self.label}: {previous} -> {state}{suffix} ({reason})", flush=True)
+        if self.log_path is not None:
+            with self.log_path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(event, sort_keys=True) + "\n")
+
+    def summary(self) -> Dict[str, object]:
+        with self._cond:
+            open_seconds = self.open_seconds
+            if self.state == self.OPEN:
+                open_seconds += time.monotonic() - self._opened_at
+            return {"state": self.state, "trips": self.trips, "open_seconds": round(open_seconds, 1)}
+
+
+class CallResult:
+    """Set by the body of guarded_call(): HTTP status (0 = no response) and optional latency."""
+
+    __slots__ = ("status", "latency_s")
+
+    def __init__(self) -> None:
+        self.status = 0
+        self.latency_s: Optional[float] = None
+
+
+@contextlib.contextmanager
+def guarded_call(
+    rate: Optional[AdaptiveRateController], breaker: Optional[CircuitBreaker]
+) -> Iterator[CallResult]:
+    """Hold a breaker pass and a rate slot for one request.
+
+    Both are returned when the block exits, with the status the block set. If the
+    block raises, the call counts as no response (status 0): the slot is freed and
+    a half-open probe fails, so neither stays taken.
+    """
+    call = CallResult()
+    probe = breaker.before_call() if breaker is not None else False
+    try:
+        slot = rate.acquire() if rate is not None else 0.0
+        try:
+            yield call
+        finally:
+            if rate is not None:
+                rate.release(slot, call.status, call.latency_s)
+    finally:
+        if breaker is not None:
+            breaker.record(probe, call.status)
+
+
+def add_rate_control_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("rate control and circuit breaker")
+    group.add_argument(
+        "--adaptive-rate",
+        action="store_true",
+        help="adapt concurrency and request rate to backend health (AIMD); decisions go to " + LOG_NAME,
+    )
+    group.add_argument(
+        "--adaptive-max-concurrency",
+        type=int,
+        default=0,
+        help=f"concurrency ceiling when adapting (default: {DEFAULT_CEILING_MULTIPLE}x the starting concurrency)",
+    )
+    group.add_argument(
+        "--adaptive-max-per-minute",
+        type=float,
+        default=0.0,
+        help=f"rate ceiling when adapting (default: {DEFAULT_CEILING_MULTIPLE}x the starting rate)",
+    )
+    group.add_argument(
+        "--adaptive-window",
+        type=int,
+        default=DEFAULT_WINDOW,
+        help=f"completed calls per adjustment window (default: {DEFAULT_WINDOW})",
+    )
+    group.add_argument(
+        "--adaptive-p95-factor",
+        type=float,
+        default=DEFAULT_P95_FACTOR,
+        help=f"back off when window p95 latency exceeds this multiple of the healthy baseline (default: {DEFAULT_P95_FACTOR})",
+    )
+    group.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=DEFAULT_BREAKER_THRESHOLD,
+        help=f"consecutive 5xx/timeouts that pause dispatch (default: {DEFAULT_BREAKER_THRESHOLD}; 0 = no circuit breaker)",
+    )
+    group.add_argument(
+        "--breaker-cooldown-seconds",
+        type=float,
+        default=DEFAULT_BREAKER_COOLDOWN_S,
+        help=f"pause before the half-open probe; doubles per failed probe (default: {DEFAULT_BREAKER_COOLDOWN_S:.0f})",
+    )
+
+
+def check_rate_control_args(args: argparse.Namespace) -> None:
+    if args.adaptive_max_concurrency < 0 or args.adaptive_max_per_minute < 0:
+        raise RuntimeError("--adaptive-max-concurrency / --adaptive-max-per-minute must be >= 0")
+    if args.adaptive_window < 1:
+        raise RuntimeError("--adaptive-window must be >= 1")
+    if args.adaptive_p95_factor <= 1.0:
+        raise RuntimeError("--adaptive-p95-factor must be > 1")
+    if args.breaker_threshold < 0:
+        raise RuntimeError("--breaker-threshold must be >= 0")
+    if args.breaker_cooldown_seconds <= 0:
+        raise RuntimeError("--breaker-cooldown-seconds must be > 0")
+
+
+def controller_from_args(
+    args: argparse.Namespace,
+    *,
+    concurrency: int,
+    per_minute: float,
+    log_dir: Path,
+    label: str = "rate_control",
+    max_concurrency: Optional[int] = None,
+    burst: float = 1.0,
+) -> AdaptiveRateController:
+    """Build the controller for one run; max_concurrency pins the ceiling (e.g. a sequential caller)."""
+    return AdaptiveRateController(
+        concurrency=concurrency,
+        per_minute=per_minute,
+        adaptive=args.adaptive_rate,
+        max_concurrency=args.adaptive_max_concurrency if max_concurrency is None else max_concurrency,
+        max_per_minute=args.adaptive_max_per_minute,
+        window=args.adaptive_window,
+        p95_factor=args.adaptive_p95_factor,
+        log_path=log_dir / LOG_NAME if args.adaptive_rate else None,
+        label=label,
+        burst=burst,
+    )
+
+
+def breaker_from_args(args: argparse.Namespace, *, log_dir: Path, label: str = "circuit_breaker") -> Optional[CircuitBreaker]:
+    if args.breaker_threshold <= 0:
+        return None
+    return CircuitBreaker(
+        threshold=args.breaker_threshold,
+        cooldown_s=args.breaker_cooldown_seconds,
+        log_path=log_dir / BREAKER_LOG_NAME,
+        label=label,
+    )
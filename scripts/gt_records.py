@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compact record types shared by the GT scripts.
+
+Per-row data (batch input rows, resolved actuals, scored results, picker spans,
+proof-runner evaluations, reseed outcomes) is held in slotted dataclasses rather
+than dicts: no per-instance __dict__, one class-level field list, and attribute
+access instead of key hashing.
+
+Records still support read-only mapping access (record["field"], .get(), .keys(),
+.items()), so the CSV/JSON writers and code that also handles plain dict rows
+(e.g. a baseline results.csv read back with DictReader) accept either.
+
+Decision values pass through intern_decision(), so every "assign"/"review"/"none"
+in a batch is one shared string object. Interning never changes the value, so
+artifacts are byte-identical to the dict-based output.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, ClassVar, Dict, Iterator, Mapping, Tuple, Type, TypeVar
+
+DECISION_ASSIGN = "assign"
+DECISION_REVIEW = "review"
+DECISION_NONE = "none"
+DECISIONS = (DECISION_ASSIGN, DECISION_REVIEW, DECISION_NONE)
+_CANONICAL_DECISIONS = {d: d for d in (*DECISIONS, "")}
+
+R = TypeVar("R", bound="Record")
+
+
+def intern_decision(value: str) -> str:
+    """Return the shared instance of a decision value (callers normalize case first)."""
+    canonical = _CANONICAL_DECISIONS.get(value)
+    return canonical if canonical is not None else sys.intern(value)
+
+
+class Record:
+    """Mapping-style access for @record classes."""
+
+    __slots__ = ()
+    FIELDS: ClassVar[Tuple[str, ...]] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for key in self.FIELDS:
+            yield key, getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    @classmethod
+    def from_mapping(cls: Type[R], values: Mapping[str, Any]) -> R:
+        """Build from a dict (e.g. a journal or cache entry); missing fields become ""."""
+        return cls(*(values.get(key, "") for key in cls.FIELDS))
+
+
+def record(cls: Type[R]) -> Type[R]:
+    """Turn a Record subclass into a slotted dataclass with FIELDS set."""
+    cls = dataclass(slots=True)(cls)
+    cls.FIELDS = tuple(f.name for f in fields(cls))
+    return cls
+
+
+def json_default(value: object) -> Any:
+    """json.dumps(default=...) hook so records serialize like the dicts they replace."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+SQLite index of GT batch runs: metrics, row-level results, prompt/model versions
+and the normalized input hash of every run.
+
+gt_batch_runner.py records each finished run (and merge) into
+<out-root>/run_index.sqlite, so trend, per-row history and baseline questions are
+indexed lookups instead of a walk over every run dir's metrics.json/results.csv.
+
+Usage:
+  python3 scripts/gt_run_index.py trend --prompt-version v1.10 --last 90
+  python3 scripts/gt_run_index.py rows --interaction-id cll_... [--span-selector span_index:0]
+  python3 scripts/gt_run_index.py baseline --match mode=shadow,prompt_version=v1.10
+  python3 scripts/gt_run_index.py runs --last 20
+  python3 scripts/gt_run_index.py backfill   # index run dirs recorded before the index existed
+
+Every command takes --out-root (index at <out-root>/run_index.sqlite) or --index,
+and --json for machine-readable output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime as dt
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_OUT_ROOT = "/Users/chadbarlow/Desktop/gt_batch_runs"
+INDEX_NAME = "run_index.sqlite"
+
+# metrics.json keys copied into typed runs columns (everything is also kept in metrics_json).
+METRIC_COLUMNS = {
+    "total_rows": "integer",
+    "expected_rows": "integer",
+    "correct_rows": "integer",
+    "accuracy": "real",
+    "review_rate": "real",
+    "failures_count": "integer",
+    "homeowner_override_fail_count": "integer",
+    "staff_leak_count": "integer",
+    "multi_project_span_count": "integer",
+    "missing_char_offsets_count": "integer",
+    "trigger_fail_count": "integer",
+    "ready_timeout_count": "integer",
+    "cache_hit_rate": "real",
+    "mean_confidence": "real",
+}
+
+ROW_COLUMNS = [
+    "row_id",
+    "interaction_id",
+    "span_selector",
+    "expected_decision",
+    "expected_project_id",
+    "expected_project_name_contains",
+    "actual_decision",
+    "actual_project_id",
+    "actual_project_name",
+    "actual_confidence",
+    "actual_prompt_version",
+    "actual_model_id",
+    "has_expectation",
+    "is_correct",
+    "error",
+]
+
+# --match keys -> runs column ("input" is shorthand for the normalized input hash).
+MATCH_KEYS = {
+    "mode": "mode",
+    "reseed_mode": "reseed_mode",
+    "prompt_version": "prompt_version",
+    "model_id": "model_id",
+    "input": "input_sha256",
+    "input_sha256": "input_sha256",
+}
+
+SCHEMA = f"""
+create table if not exists runs (
+  run_dir text primary key,
+  run_id text not null,
+  generated_at_utc text not null,
+  indexed_at_utc text not null,
+  mode text not null default '',
+  reseed_mode text not null default '',
+  input_file text not null default '',
+  input_sha256 text not null default '',
+  prompt_version text not null default '',
+  model_id text not null default '',
+  prompt_versions text not null default '',
+  model_ids text not null default '',
+  is_partial integer not null default 0,
+  {", ".join(f"{name} {kind}" for name, kind in METRIC_COLUMNS.items())},
+  metrics_json text not null
+);
+create index if not exists runs_by_time on runs(generated_at_utc);
+create index if not exists runs_by_prompt on runs(prompt_version, generated_at_utc);
+create index if not exists runs_by_model on runs(model_id, generated_at_utc);
+create index if not exists runs_by_input on runs(input_sha256, generated_at_utc);
+
+create table if not exists row_results (
+  run_dir text not null references runs(run_dir) on delete cascade,
+  row_id text not null,
+  interaction_id text not null,
+  span_selector text not null,
+  expected_decision text not null,
+  expected_project_id text not null,
+  expected_project_name_contains text not null,
+  actual_decision text not null,
+  actual_project_id text not null,
+  actual_project_name text not null,
+  actual_confidence real,
+  actual_prompt_version text not null,
+  actual_model_id text not null,
+  has_expectation integer not null,
+  is_correct integer not null,
+  error text not null
+);
+create index if not exists row_results_by_run on row_results(run_dir);
+create index if not exists row_results_by_row on row_results(interaction_id, span_selector);
+create index if not exists row_results_by_row_id on row_results(row_id);
+"""
+
+
+def utc_now() -> str:
+    return dt.datetime.utcnow().isoformat() + "Z"
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def dominant(values: Iterable[str]) -> Tuple[str, List[str]]:
+    """Most common non-empty value (ties -> lexically first) and all distinct values."""
+    counts = Counter(v for v in values if v)
+    if not counts:
+        return "", []
+    top = min(counts, key=lambda v: (-counts[v], v))
+    return top, sorted(counts)
+
+
+def parse_match(spec: str, current: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+    """Parse "key[=value],..." into {runs column: value}.
+
+    A bare key means "same as the current run" and needs `current`.
+    """
+    criteria: Dict[str, str] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        key, has_value, value = part.partition("=")
+        column = MATCH_KEYS.get(key.strip())
+        if column is None:
+            raise RuntimeError(f"unknown baseline match key '{key}' (expected one of {', '.join(sorted(MATCH_KEYS))})")
+        if not has_value:
+            if current is None:
+                raise RuntimeError(f"baseline match key '{key}' needs a value here (e.g. {key}=...)")
+            value = current.get(column, "")
+        criteria[column] = value.strip()
+    return criteria
+
+
+def _float_or_none(value: str) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class RunIndex:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shards of one batch finish concurrently; WAL + busy timeout lets them queue.
+        self.conn = sqlite3.connect(str(path), timeout=30.0)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("pragma journal_mode=wal")
+        self.conn.execute("pragma foreign_keys=on")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "RunIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def record_run(
+        self,
+        run_dir: Path,
+        metrics: Mapping[str, Any],
+        results: Iterable[Mapping[str, str]],
+        input_sha256: str,
+    ) -> int:
+        """Insert or replace one run and its row results; returns the row count."""
+        key = str(run_dir.resolve())
+        rows = [
+            (
+                key,
+                *(r.get(c, "") for c in ROW_COLUMNS[:9]),
+                _float_or_none(r.get("actual_confidence", "")),
+                r.get("actual_prompt_version", ""),
+                r.get("actual_model_id", ""),
+                int(r.get("has_expectation", "") == "true"),
+                int(r.get("is_correct", "") == "true"),
+                r.get("error", ""),
+            )
+            for r in results
+        ]
+        prompt_version, prompt_versions = dominant(row[11] for row in rows)
+        model_id, model_ids = dominant(row[12] for row in rows)
+        run_values = {
+            "run_dir": key,
+            "run_id": str(metrics.get("run_id", "")),
+            "generated_at_utc": str(metrics.get("generated_at_utc") or utc_now()),
+            "indexed_at_utc": utc_now(),
+            "mode": str(metrics.get("mode", "")),
+            "reseed_mode": str(metrics.get("reseed_mode", "")),
+            "input_file": str(metrics.get("input_file", "")),
+            "input_sha256": input_sha256,
+            "prompt_version": prompt_version,
+            "model_id": model_id,
+            "prompt_versions": ",".join(prompt_versions),
+            "model_ids": ",".join(model_ids),
+            "is_partial": int(bool(metrics.get("shard"))),
+            **{name: metrics.get(name) for name in METRIC_COLUMNS},
+            "metrics_json": json.dumps(metrics, sort_keys=True),
+        }
+        placeholders = ", ".join("?" for _ in run_values)
+        with self.conn:
+            self.conn.execute("delete from runs where run_dir = ?", (key,))
+            self.conn.execute(
+                f"insert into runs ({', '.join(run_values)}) values ({placeholders})", list(run_values.values())
+            )
+            self.conn.executemany(
+                f"insert into row_results (run_dir, {', '.join(ROW_COLUMNS)}) "
+                f"values ({', '.join('?' for _ in range(len(ROW_COLUMNS) + 1))})",
+                rows,
+            )
+        return len(rows)
+
+    def has_run(self, run_dir: Path) -> bool:
+        cur = self.conn.execute("select 1 from runs where run_dir = ?", (str(run_dir.resolve()),))
+        return cur.fetchone() is not None
+
+    def runs(
+        self,
+        criteria: Optional[Mapping[str, str]] = None,
+        last: int = 0,
+        include_partial: bool = False,
+        exclude_run_dir: Optional[Path] = None,
+    ) -> List[Dict[str, Any]]:
+        """Matching runs, oldest first (the newest `last` when last > 0)."""
+        where = ["1 = 1"]
+        params: List[Any] = []
+        for column, value in (criteria or {}).items():
+            where.append(f"{column} = ?")
+            params.append(value)
+        if not include_partial:
+            where.append("is_partial = 0")
+        if exclude_run_dir is not None:
+            where.append("run_dir != ?")
+            params.append(str(exclude_run_dir.resolve()))
+        sql = f"select * from runs where {' and '.join(where)} order by generated_at_utc desc, run_dir desc"
+        if last > 0:
+            sql += f" limit {int(last)}"
+        rows = [dict(r) for r in self.conn.execute(sql, params)]
+        rows.reverse()
+        for r in rows:
+            r.pop("metrics_json", None)
+        return rows
+
+    def select_baseline(self, criteria: Mapping[str, str], exclude_run_dir: Optional[Path] = None) -> Optional[Path]:
+        """metrics.json of the newest whole run matching criteria whose run dir still exists."""
+        for run in reversed(self.runs(criteria, exclude_run_dir=exclude_run_dir)):
+            metrics_path = Path(run["run_dir"]) / "metrics.json"
+            if metrics_path.exists():
+                return metrics_path
+        return None
+
+    def row_history(
+        self,
+        interaction_id: str = "",
+        span_selector: str = "",
+        row_id: str = "",
+        last: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """The row's results in whole runs, oldest first (from the newest `last` runs when last > 0)."""
+        selectors = (("interaction_id", interaction_id), ("span_selector", span_selector), ("row_id", row_id))
+        filters = [(column, value) for column, value in selectors if value]
+        if not filters:
+            raise RuntimeError("row history needs --interaction-id or --row-id")
+        params: List[Any] = [value for _, value in filters]
+
+        def where(alias: str) -> str:
+            return " and ".join(f"{alias}.{column} = ?" for column, _ in filters)
+
+        # A selector can match several rows per run, so `last` limits runs, not rows.
+        runs_filter = ""
+        if last > 0:
+            runs_filter = f"""
+  and rr.run_dir in (
+    select rr2.run_dir
+    from row_results rr2
+    join runs r2 on r2.run_dir = rr2.run_dir
+    where {where('rr2')} and r2.is_partial = 0
+    group by rr2.run_dir
+    order by r2.generated_at_utc desc, rr2.run_dir desc
+    limit {int(last)}
+  )"""
+            params = params * 2
+        sql = f"""
+select r.run_id, r.generated_at_utc, r.mode, r.prompt_version, r.model_id, rr.*
+from row_results rr
+join runs r on r.run_dir = rr.run_dir
+where {where('rr')} and r.is_partial = 0{runs_filter}
+order by r.generated_at_utc desc, r.run_dir desc, rr.rowid desc
+"""
+        rows = [dict(r) for r in self.conn.execute(sql, params)]
+        rows.reverse()
+        return rows
+
+
+def read_results_csv(path: Path) -> List[Dict[str, str]]:
+    with path.open("r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def backfill(index: RunIndex, out_root: Path, force: bool = False) -> Tuple[int, int]:
+    """Index every run dir under out_root that has metrics.json + results.csv."""
+    indexed = skipped = 0
+    for child in sorted(out_root.iterdir()) if out_root.exists() else []:
+        metrics_path = child / "metrics.json"
+        results_path = child / "results.csv"
+        if not (child.is_dir() and metrics_path.exists() and results_path.exists()):
+            continue
+        if not force and index.has_run(child):
+            skipped += 1
+            continue
+        input_path = child / "input_normalized.json"
+        index.record_run(
+            child,
+            json.loads(metrics_path.read_text(encoding="utf-8")),
+            read_results_csv(results_path),
+            file_sha256(input_path) if input_path.exists() else "",
+        )
+        indexed += 1
+    return indexed, skipped
+
+
+def print_table(rows: List[Dict[str, Any]], columns: List[str]) -> None:
+    if not rows:
+        print("(no rows)")
+        return
+
+    def fmt(value: Any) -> str:
+        if value is None:
+            return "n/a"
+        if isinstance(value, float):
+            return f"{value:.4f}"
+        return str(value)
+
+    cells = [[fmt(r.get(c)) for c in columns] for r in rows]
+    widths = [max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+TREND_COLUMNS = ["generated_at_utc", "run_id", "mode", "prompt_version", "model_id", "total_rows", "accuracy",
+                 "review_rate", "failures_count", "mean_confidence"]
+ROW_HISTORY_COLUMNS = ["generated_at_utc", "run_id", "prompt_version", "row_id", "span_selector",
+                       "expected_decision", "actual_decision", "actual_project_name", "actual_confidence",
+                       "is_correct", "error"]
+
+
+def main() -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--out-root", default=DEFAULT_OUT_ROOT, help="gt_batch_runner --out-root")
+    common.add_argument("--index", default="", help=f"index path (default: <out-root>/{INDEX_NAME})")
+    common.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    parser = argparse.ArgumentParser(description="Query the GT batch run index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("trend", "metric trend over matching runs"), ("runs", "list indexed runs")):
+        p = sub.add_parser(name, help=help_text, parents=[common])
+        p.add_argument("--match", default="", help="criteria, e.g. mode=shadow,input=<sha256>")
+        p.add_argument("--prompt-version", default="", help="shorthand for --match prompt_version=...")
+        p.add_argument("--model-id", default="", help="shorthand for --match model_id=...")
+        p.add_argument("--last", type=int, default=90, help="newest N runs (default: 90; 0 = all)")
+        p.add_argument("--include-partial", action="store_true", help="include unmerged shard runs")
+
+    p = sub.add_parser("rows", help="history of one GT row across runs", parents=[common])
+    p.add_argument("--interaction-id", default="")
+    p.add_argument("--span-selector", default="", help="e.g. span_index:0 or span_id:<uuid>")
+    p.add_argument("--row-id", default="")
+    p.add_argument("--last", type=int, default=0, help="newest N runs (default: all)")
+
+    p = sub.add_parser("baseline", help="newest whole run matching criteria", parents=[common])
+    p.add_argument("--match", required=True, help="criteria, e.g. mode=shadow,prompt_version=v1.10")
+    p.add_argument("--exclude", default="", help="run dir to skip (e.g. the current run)")
+
+    p = sub.add_parser("backfill", help="index existing run dirs under --out-root", parents=[common])
+    p.add_argument("--force", action="store_true", help="re-index runs that are already indexed")
+
+    args = parser.parse_args()
+    out_root = Path(args.out_root).expanduser()
+    index_path = Path(args.index).expanduser() if args.index else out_root / INDEX_NAME
+    if args.command != "backfill" and not index_path.exists():
+        raise RuntimeError(f"run index not found: {index_path} (run `backfill` first)")
+
+    t0 = time.monotonic()
+    with RunIndex(index_path) as index:
+        if args.command in ("trend", "runs"):
+            criteria = parse_match(args.match)
+            if args.prompt_version:
+                criteria["prompt_version"] = args.prompt_version
+            if args.model_id:
+                criteria["model_id"] = args.model_id
+            rows = index.runs(criteria, last=args.last, include_partial=args.include_partial)
+            columns = TREND_COLUMNS if args.command == "trend" else TREND_COLUMNS[:5] + ["input_sha256", "run_dir"]
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            else:
+                print_table(rows, columns)
+        elif args.command == "rows":
+            rows = index.row_history(args.interaction_id, args.span_selector, args.row_id, args.last)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            else:
+                print_table(rows, ROW_HISTORY_COLUMNS)
+        elif args.command == "baseline":
+            exclude = Path(args.exclude).expanduser() if args.exclude else None
+            chosen = index.select_baseline(parse_match(args.match), exclude_run_dir=exclude)
+            if chosen is None:
+                print("no matching baseline", file=sys.stderr)
+                return 1
+            print(json.dumps({"baseline_metrics": str(chosen)}) if args.json else chosen)
+        else:
+            indexed, skipped = backfill(index, out_root, force=args.force)
+            print(f"indexed={indexed} skipped_already_indexed={skipped} index={index_path}")
+    if not args.json:
+        print(f"({(time.monotonic() - t0) * 1000:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        raise SystemExit(1)
@@ -16,6 +16,7 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import sys
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Iterable
@@ -40,7 +41,7 @@ def split_reason_codes(raw: str | None) -> list[str]:
     return [code.strip() for code in raw.split(";") if code.strip()]
 
 
-@dataclass
+@dataclass(slots=True)
 class RowEval:
     row_id: str
     interaction_id: str
@@ -82,7 +83,7 @@ def evaluate_rows(rows: Iterable[dict[str, str]]) -> list[RowEval]:
             after_failed = False
             note = "documented exception: multi_project_span"
         else:
-            after_expected_decision = row.get("status", "").strip() or "unchanged"
+            after_expected_decision = sys.intern(row.get("status", "").strip() or "unchanged")
             after_expected_project_id = ""
             after_failed = False
             note = "not eligible homeowner override row"
@@ -92,7 +93,7 @@ def evaluate_rows(rows: Iterable[dict[str, str]]) -> list[RowEval]:
                 row_id=(row.get("row_id") or "").strip(),
                 interaction_id=(row.get("interaction_id") or "").strip(),
                 span_id=(row.get("span_id") or "").strip(),
-                status=(row.get("status") or "").strip(),
+                status=sys.intern((row.get("status") or "").strip()),
                 override_active=override_active,
                 override_project_id=override_project_id,
                 eligible_homeowner_override=eligible,
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Cost-aware ordering of admin-reseed backfill candidates.
+
+Used by admin_reseed_batch_backfill.py --schedule priority. Each candidate is
+scored from the reseed_candidate_features RPC:
+
+    value    = w_recency * 0.5 ** (age_days / half_life) + w_review * (1 - 0.5 ** open_review_items)
+    priority = value - w_cost * est_cost_s / max_est_cost_s
+
+age_days is measured from the newest candidate, so recency is relative to the
+batch, not to today. Both value terms and the cost term lie in [0, 1]; the
+weights (--priority-weights recency=1,review=1,cost=0.5) trade them off.
+
+est_cost_s is the expected admin-reseed latency: a fixed overhead plus
+segmentation time proportional to transcript size.
+
+After sorting by priority, consecutive windows of 2 x workers candidates are
+packed longest/shortest/next-longest/... so no window puts every worker on a
+long transcript at once. A worker stays free to spend rate tokens, and long
+calls do not pile up against the edge timeout. A candidate moves at most one
+window from its priority rank.
+
+The expected completion curve replays the chosen order through the same token
+bucket and worker pool, using est_cost_s as the call duration. It is compared
+with interaction_id order, which is what the run would do without the scheduler.
+Retries and adaptive rate changes are not modelled.
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import heapq
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+SCHEDULE_NAME = "schedule.csv"
+CURVE_NAME = "completion_curve.csv"
+SCHEDULE_FIELDS = [
+    "position",
+    "interaction_id",
+    "priority",
+    "value",
+    "event_at_utc",
+    "open_review_items",
+    "transcript_bytes",
+    "est_cost_s",
+    "expected_start_s",
+    "expected_finish_s",
+]
+CURVE_FIELDS = ["pct_complete", "completed", "expected_elapsed_s", "value_pct", "id_order_value_pct"]
+WEIGHT_KEYS = ("recency", "review", "cost")
+DEFAULT_WEIGHTS = "recency=1,review=1,cost=0.5"
+DEFAULT_HALF_LIFE_DAYS = 30.0
+# admin-reseed latency model: fixed overhead plus segmentation time per transcript byte.
+COST_BASE_S = 4.0
+COST_BYTES_PER_S = 500.0
+PACK_WINDOW_PER_WORKER = 2
+
+
+@dataclass(slots=True)
+class Candidate:
+    interaction_id: str
+    event_at_utc: str = ""
+    transcript_bytes: int = 0
+    open_review_items: int = 0
+    est_cost_s: float = COST_BASE_S
+    value: float = 0.0
+    priority: float = 0.0
+
+
+def parse_weights(text: str) -> dict[str, float]:
+    """Parse "recency=1,review=2,cost=0.5"; keys not given are 0."""
+    weights = dict.fromkeys(WEIGHT_KEYS, 0.0)
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        key, sep, raw = part.partition("=")
+        key = key.strip()
+        if not sep or key not in weights:
+            raise ValueError(f"--priority-weights: expected {'/'.join(WEIGHT_KEYS)}=<number>, got {part.strip()!r}")
+        try:
+            weights[key] = float(raw)
+        except ValueError:
+            raise ValueError(f"--priority-weights: {key} is not a number: {raw.strip()!r}") from None
+        if weights[key] < 0 or not math.isfinite(weights[key]):
+            raise ValueError(f"--priority-weights: {key} must be >= 0")
+    return weights
+
+
+def estimate_cost_s(transcript_bytes: int) -> float:
+    return COST_BASE_S + max(transcript_bytes, 0) / COST_BYTES_PER_S
+
+
+def _parse_ts(value: str) -> datetime | None:
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo is not None else None
+
+
+def score(candidates: list[Candidate], weights: dict[str, float], *, half_life_days: float) -> None:
+    """Set value and priority on every candidate (see module docstring)."""
+    stamps = [_parse_ts(c.event_at_utc) for c in candidates]
+    newest = max((ts for ts in stamps if ts is not None), default=None)
+    max_cost = max((c.est_cost_s for c in candidates), default=0.0) or 1.0
+    for candidate, ts in zip(candidates, stamps):
+        recency = 0.0
+        if ts is not None and newest is not None:
+            age_days = (newest - ts).total_seconds() / 86400.0
+            recency = 0.5 ** (age_days / half_life_days)
+        review = 1.0 - 0.5 ** max(candidate.open_review_items, 0)
+        candidate.value = weights["recency"] * recency + weights["review"] * review
+        candidate.priority = candidate.value - weights["cost"] * candidate.est_cost_s / max_cost
+
+
+def pack(ordered: list[Candidate], window: int) -> list[Candidate]:
+    """Within each window, alternate the longest and shortest remaining calls."""
+    window = max(window, 2)
+    packed: list[Candidate] = []
+    for start in range(0, len(ordered), window):
+        by_cost = sorted(ordered[start : start + window], key=lambda c: -c.est_cost_s)
+        lo, hi = 0, len(by_cost) - 1
+        while lo <= hi:
+            packed.append(by_cost[lo])
+            if lo != hi:
+                packed.append(by_cost[hi])
+            lo += 1
+            hi -= 1
+    return packed
+
+
+def prioritize(
+    candidates: list[Candidate],
+    weights: dict[str, float],
+    *,
+    half_life_days: float,
+    workers: int,
+) -> list[Candidate]:
+    score(candidates, weights, half_life_days=half_life_days)
+    ordered = sorted(candidates, key=lambda c: (-c.priority, c.interaction_id))
+    return pack(ordered, PACK_WINDOW_PER_WORKER * workers)
+
+
+def simulate(
+    ordered: list[Candidate], *, workers: int, per_minute: float, burst: float
+) -> list[tuple[float, float]]:
+    """Expected (start_s, finish_s) per candidate: dispatch in order through the token bucket and pool."""
+    interval = 60.0 / per_minute
+    tolerance = (max(burst, 1.0) - 1.0) * interval
+    # Theoretical arrival time of the next token (GCRA form of the token bucket).
+    tat = 0.0
+    free = [0.0] * workers
+    timings: list[tuple[float, float]] = []
+    for candidate in ordered:
+        start = max(heapq.heappop(free), tat - tolerance)
+        tat = max(tat, start) + interval
+        finish = start + candidate.est_cost_s
+        heapq.heappush(free, finish)
+        timings.append((start, finish))
+    return timings
+
+
+def write_schedule(path: Path, ordered: list[Candidate], timings: list[tuple[float, float]]) -> None:
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(SCHEDULE_FIELDS)
+        for position, (candidate, (start, finish)) in enumerate(zip(ordered, timings), start=1):
+            writer.writerow(
+                [
+                    position,
+                    candidate.interaction_id,
+                    round(candidate.priority, 4),
+                    round(candidate.value, 4),
+                    candidate.event_at_utc,
+                    candidate.open_review_items,
+                    candidate.transcript_bytes,
+                    round(candidate.est_cost_s, 1),
+                    round(start, 1),
+                    round(finish, 1),
+                ]
+            )
+
+
+def _value_curve(ordered: list[Candidate], timings: list[tuple[float, float]]) -> tuple[list[float], list[float]]:
+    """Finish times ascending and the cumulative value completed by each."""
+    uniform = sum(c.value for c in ordered) <= 0
+    pairs = sorted((finish, 1.0 if uniform else c.value) for c, (_, finish) in zip(ordered, timings))
+    finishes: list[float] = []
+    cumulative: list[float] = []
+    total = 0.0
+    for finish, value in pairs:
+        total += value
+        finishes.append(finish)
+        cumulative.append(total)
+    return finishes, cumulative
+
+
+def write_completion_curve(
+    path: Path,
+    ordered: list[Candidate],
+    timings: list[tuple[float, float]],
+    baseline: list[Candidate],
+    baseline_timings: list[tuple[float, float]],
+) -> dict[str, Any]:
+    """One row per percent of candidates completed; returns headline numbers for summary.json."""
+    finishes, cumulative = _value_curve(ordered, timings)
+    base_finishes, base_cumulative = _value_curve(baseline, baseline_timings)
+    total = cumulative[-1] if cumulative else 0.0
+
+    def value_pct(curve: tuple[list[float], list[float]], elapsed: float) -> float:
+        done = bisect.bisect_right(curve[0], elapsed)
+        return 100.0 * curve[1][done - 1] / total if done and total else 0.0
+
+    def value_time(curve: tuple[list[float], list[float]], fraction: float) -> float:
+        done = bisect.bisect_left(curve[1], fraction * total - 1e-9)
+        return curve[0][min(done, len(curve[0]) - 1)] if curve[0] else 0.0
+
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(CURVE_FIELDS)
+        n = len(finishes)
+        last = 0
+        for pct in range(1, 101):
+            completed = math.ceil(n * pct / 100)
+            if completed == last or completed == 0:
+                continue
+            last = completed
+            elapsed = finishes[completed - 1]
+            writer.writerow(
+                [
+                    pct,
+                    completed,
+                    round(elapsed, 1),
+                    round(value_pct((finishes, cumulative), elapsed), 1),
+                    round(value_pct((base_finishes, base_cumulative), elapsed), 1),
+                ]
+            )
+
+    return {
+        "expected_duration_s": round(finishes[-1], 1) if finishes else 0.0,
+        "value_50pct_s": round(value_time((finishes, cumulative), 0.5), 1),
+        "value_90pct_s": round(value_time((finishes, cumulative), 0.9), 1),
+        "id_order_value_50pct_s": round(value_time((base_finishes, base_cumulative), 0.5), 1),
+        "id_order_value_90pct_s": round(value_time((base_finishes, base_cumulative), 0.9), 1),
+    }
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Live telemetry for admin_reseed_batch_backfill.py.
+
+While the backfill runs, Telemetry keeps rolling statistics and publishes one
+JSON snapshot in two places:
+- `status.json` in the output directory, rewritten every --status-every seconds
+  (atomically, via a temp file and rename);
+- optionally GET http://127.0.0.1:<--status-port>/status, computed on request.
+
+The snapshot reports calls/minute and interactions/minute, p50/p95 latency_ms,
+and the 5xx/timeout and 429 rates. Each is given over the last 1, 5 and 15
+minutes, so a degrading run shows up as the short window falling behind the long
+one. It also reports the ETA (remaining interactions at the 5-minute completion
+rate) and the current rate limit, worker count and breaker state.
+
+Everything is computed incrementally in constant memory. Calls land in a ring of
+10-second buckets covering 15 minutes. Each bucket holds counters and a
+log-scaled latency histogram (bins 25% apart, 10 ms to ~6 min). Window stats sum
+the buckets in range, and percentiles are read from the summed histogram, to
+within one bin.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from gt_rate_control import AdaptiveRateController, CircuitBreaker, is_error, is_throttled
+
+STATUS_NAME = "status.json"
+DEFAULT_STATUS_EVERY_S = 15.0
+BUCKET_S = 10
+WINDOWS_S = {"1m": 60, "5m": 300, "15m": 900}
+ETA_WINDOW = "5m"
+LATENCY_MIN_MS = 10.0
+LATENCY_GROWTH = 1.25
+LATENCY_BINS = 48
+
+
+def _latency_bin(latency_ms: float) -> int:
+    if latency_ms <= LATENCY_MIN_MS:
+        return 0
+    return min(LATENCY_BINS - 1, math.ceil(math.log(latency_ms / LATENCY_MIN_MS, LATENCY_GROWTH)))
+
+
+def _bin_upper_ms(index: int) -> float:
+    return LATENCY_MIN_MS * LATENCY_GROWTH**index
+
+
+def _utc_iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _format_duration(seconds: float) -> str:
+    return str(timedelta(seconds=round(seconds)))
+
+
+@dataclass(slots=True)
+class _Bucket:
+    tick: int = -1
+    calls: int = 0
+    errors: int = 0
+    throttled: int = 0
+    done: int = 0
+    latency: list[int] = field(default_factory=lambda: [0] * LATENCY_BINS)
+
+    def reset(self, tick: int) -> None:
+        self.tick = tick
+        self.calls = self.errors = self.throttled = self.done = 0
+        self.latency = [0] * LATENCY_BINS
+
+
+class Telemetry:
+    """Rolling run statistics plus the status.json writer and localhost endpoint. Thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        total: int,
+        status_path: Path,
+        rate: AdaptiveRateController,
+        breaker: CircuitBreaker | None,
+        every_s: float = DEFAULT_STATUS_EVERY_S,
+        port: int = 0,
+    ) -> None:
+        self.total = total
+        self.status_path = status_path
+        self.rate = rate
+        self.breaker = breaker
+        self.every_s = every_s
+        self.port = port
+        self.state = "running"
+        self._buckets = [_Bucket() for _ in range(max(WINDOWS_S.values()) // BUCKET_S)]
+        self._results: Counter[str] = Counter()
+        self._calls = 0
+        self._done = 0
+        self._started = time.monotonic()
+        self._started_wall = time.time()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer: threading.Thread | None = None
+        self._server: ThreadingHTTPServer | None = None
+
+    def _bucket(self, now: float) -> _Bucket:
+        tick = int((now - self._started) // BUCKET_S)
+        bucket = self._buckets[tick % len(self._buckets)]
+        if bucket.tick != tick:
+            bucket.reset(tick)
+        return bucket
+
+    def record_call(self, status: int, latency_ms: float) -> None:
+        """One admin-reseed call (retries count separately)."""
+        with self._lock:
+            bucket = self._bucket(time.monotonic())
+            bucket.calls += 1
+            self._calls += 1
+            if is_throttled(status):
+                bucket.throttled += 1
+            elif is_error(status):
+                bucket.errors += 1
+            bucket.latency[_latency_bin(latency_ms)] += 1
+
+    def record_done(self, result: str) -> None:
+        """One interaction finished with its final result."""
+        with self._lock:
+            self._bucket(time.monotonic()).done += 1
+            self._done += 1
+            self._results[result] += 1
+
+    def _window(self, now: float, window_s: int) -> dict[str, Any]:
+        current = int((now - self._started) // BUCKET_S)
+        first = current - window_s // BUCKET_S + 1
+        calls = errors = throttled = done = 0
+        latency = [0] * LATENCY_BINS
+        for bucket in self._buckets:
+            if first <= bucket.tick <= current:
+                calls += bucket.calls
+                errors += bucket.errors
+                throttled += bucket.throttled
+                done += bucket.done
+                latency = [a + b for a, b in zip(latency, bucket.latency)]
+        # Early in the run the window is only as long as the run so far.
+        minutes = max(min(window_s, now - self._started), 1.0) / 60.0
+
+        def percentile(q: float) -> float | None:
+            n = sum(latency)
+            if n == 0:
+                return None
+            rank = max(1, math.ceil(q * n))
+            seen = 0
+            for index, count in enumerate(latency):
+                seen += count
+                if seen >= rank:
+                    return round(_bin_upper_ms(index), 1)
+            return None
+
+        return {
+            "calls": calls,
+            "calls_per_minute": round(calls / minutes, 2),
+            "interactions_per_minute": round(done / minutes, 2),
+            "error_rate": round(errors / calls, 4) if calls else None,
+            "throttle_rate": round(throttled / calls, 4) if calls else None,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p95_ms": percentile(0.95),
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            windows = {name: self._window(now, seconds) for name, seconds in WINDOWS_S.items()}
+            done = self._done
+            calls = self._calls
+            results = dict(self._results)
+
+        remaining = max(self.total - done, 0)
+        per_minute = windows[ETA_WINDOW]["interactions_per_minute"]
+        eta_s = remaining * 60.0 / per_minute if per_minute > 0 else None
+        if remaining == 0:
+            eta_s = 0.0
+        limits: dict[str, Any] = {
+            "max_per_minute": round(self.rate.per_minute, 2) if self.rate.per_minute > 0 else None,
+            "workers": self.rate.concurrency,
+            "in_flight": self.rate.in_flight,
+            "adaptive": self.rate.adaptive,
+        }
+        if self.breaker is not None:
+            limits["breaker"] = self.breaker.state
+        return {
+            "state": self.state,
+            "started_at_utc": _utc_iso(self._started_wall),
+            "updated_at_utc": _utc_iso(time.time()),
+            "elapsed_s": round(now - self._started, 1),
+            "progress": {
+                "total": self.total,
+                "done": done,
+                "remaining": remaining,
+                "pct": round(100.0 * done / self.total, 1) if self.total else 100.0,
+                "calls": calls,
+                "results": results,
+            },
+            "windows": windows,
+            "eta": {
+                "seconds": round(eta_s) if eta_s is not None else None,
+                "at_utc": _utc_iso(time.time() + eta_s) if eta_s is not None else None,
+                "basis": f"interactions_per_minute over {ETA_WINDOW}",
+            },
+            "rate_limit": limits,
+        }
+
+    def brief(self) -> str:
+        """Short suffix for the progress line."""
+        snap = self.snapshot()
+        recent = snap["windows"][ETA_WINDOW]
+        p95 = recent["latency_p95_ms"]
+        eta = snap["eta"]["seconds"]
+        return (
+            f"{recent['calls_per_minute']:.1f} calls/min p95={p95:.0f}ms" if p95 is not None else "no calls yet"
+        ) + (f" eta={_format_duration(eta)}" if eta is not None else " eta=?")
+
+    def write(self) -> None:
+        payload = json.dumps(self.snapshot(), indent=2) + "\n"
+        tmp = self.status_path.with_name(self.status_path.name + ".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.status_path)
+
+    def _write_loop(self) -> None:
+        while not self._stop.wait(self.every_s):
+            self.write()
+
+    def start(self) -> None:
+        self.write()
+        if self.every_s > 0:
+            self._writer = threading.Thread(target=self._write_loop, name="status-writer", daemon=True)
+            self._writer.start()
+        if self.port:
+            self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _make_handler(self))
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="status-http", daemon=True).start()
+            print(f"status endpoint: http://127.0.0.1:{self._server.server_port}/status")
+
+    def close(self, state: str) -> None:
+        self.state = state
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        self.write()
+
+    def __enter__(self) -> Telemetry:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is not None:
+            self.close("interrupted")
+        else:
+            # The caller may have marked the run as ended early (e.g. "aborted").
+            self.close("complete" if self.state == "running" else self.state)
+
+
+def _make_handler(telemetry: Telemetry) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            return
+
+        def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+            if self.path.split("?", 1)[0] not in ("/", "/status"):
+                status, body = 404, {"error": "not_found"}
+            else:
+                status, body = 200, telemetry.snapshot()
+            raw = json.dumps(body, indent=2).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+    return Handler
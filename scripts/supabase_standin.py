@@ -0,0 +1,944 @@
+#!/usr/bin/env python3
+"""
+Local Supabase stand-in for offline benchmarking of the batch scripts.
+
+Emulates, on one local HTTP port:
+- POST /functions/v1/shadow-replay
+- POST /functions/v1/admin-reseed
+- GET  /rest/v1/<table>  (PostgREST subset: select, eq/neq/gt/gte/lt/lte/in/is filters,
+  order, limit, offset, Prefer: count=exact; gzip and keep-alive like the real gateway)
+- POST /rest/v1/rpc/list_unsegmented_interactions  (keyset-paginated candidate anti-join)
+- POST /rest/v1/rpc/reseed_candidate_features  (recency / review-queue / transcript-size features)
+- GET  /standin/stats    (request counts and injected faults, for benchmark reports)
+
+State lives in a SQLite fixture database (build one with `init`). Function
+latency follows a log-normal distribution fitted to a median and p95 (plus,
+optionally, a per-1000-transcript-chars term for admin-reseed), and
+5xx errors and 429 throttling can be injected at fixed rates or above a
+request-per-second ceiling.
+
+gt_batch_runner.py and gt_pick_fresh_review_items_v1.py also read Postgres
+directly (DATABASE_URL). With --pg-mirror, spans and attributions the stand-in
+creates are mirrored into a local Postgres (e.g. `supabase start`) so their
+readiness polling and span-actual queries resolve end to end.
+
+Example:
+  python3 scripts/supabase_standin.py init --db /tmp/standin.sqlite --interactions 5000
+  python3 scripts/supabase_standin.py serve --db /tmp/standin.sqlite --port 54329 \
+    --fn-latency-ms 800 --fn-latency-p95-ms 2500 --error-rate 0.02 --throttle-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import random
+import re
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+
+SHADOW_ID_PATTERN = re.compile(r"^cll_SHADOW_[a-zA-Z0-9_]+$")
+RESEED_MODES = ("resegment_only", "resegment_and_reroute", "reseed_and_close_loop")
+BOOL_COLUMNS = {"is_superseded"}
+DECISIONS = (("assign", 0.70), ("review", 0.25), ("none", 0.05))
+PROMPT_VERSION = "standin_v1"
+MODEL_ID = "standin-model"
+SPAN_CHARS = 1500
+P95_Z = 1.6449
+GZIP_MIN_BYTES = 1024
+
+SCHEMA = """
+create table if not exists interactions (
+  interaction_id text primary key,
+  channel text not null default 'call',
+  event_at_utc text
+);
+create table if not exists calls_raw (
+  interaction_id text primary key,
+  transcript text,
+  event_at_utc text,
+  direction text,
+  owner_phone text,
+  other_party_phone text,
+  owner_name text,
+  other_party_name text,
+  summary text,
+  recording_url text
+);
+create table if not exists projects (
+  id text primary key,
+  name text not null
+);
+create table if not exists conversation_spans (
+  id text primary key,
+  interaction_id text not null,
+  span_index integer not null,
+  char_start integer,
+  char_end integer,
+  is_superseded boolean not null default 0,
+  segment_generation integer not null default 1,
+  created_at text not null
+);
+create index if not exists idx_spans_interaction on conversation_spans(interaction_id, is_superseded);
+create table if not exists span_attributions (
+  id text primary key,
+  span_id text not null,
+  project_id text,
+  confidence real,
+  decision text,
+  prompt_version text,
+  model_id text,
+  reasoning text,
+  attributed_at text not null
+);
+create index if not exists idx_attr_span on span_attributions(span_id);
+create table if not exists human_locks (
+  interaction_id text primary key
+);
+create table if not exists review_queue (
+  id text primary key,
+  interaction_id text,
+  status text not null default 'pending'
+);
+create index if not exists idx_review_queue_interaction on review_queue(interaction_id);
+create table if not exists override_log (
+  idempotency_key text primary key,
+  interaction_id text not null,
+  reseed_status text not null,
+  effects_receipt text
+);
+"""
+
+WORDS = (
+    "yeah so the framing crew wants to come out thursday about the deck permit and the window order "
+    "we talked to the inspector about the footing and the drywall schedule slipped a week because "
+    "of the plumbing rough in on the second floor can you call the homeowner back about the change order"
+).split()
+
+
+def _now_iso() -> str:
+    return datetime.now(tz=UTC).isoformat()
+
+
+def _stable_fraction(*parts: object) -> float:
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return int(digest[:12], 16) / float(1 << 48)
+
+
+def _sql_quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+# ---------------------------------------------------------------------------
+# Fixture DB
+# ---------------------------------------------------------------------------
+
+
+def init_fixture(
+    db_path: Path,
+    *,
+    interactions: int,
+    projects: int,
+    unsegmented_fraction: float,
+    human_lock_fraction: float,
+    review_fraction: float,
+    seed: int,
+) -> dict[str, int]:
+    rng = random.Random(seed)
+    if db_path.exists():
+        db_path.unlink()
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+
+    project_rows = [(str(uuid.UUID(int=rng.getrandbits(128))), f"Project {i:03d}") for i in range(projects)]
+    conn.executemany("insert into projects (id, name) values (?, ?)", project_rows)
+
+    counts = {"interactions": 0, "unsegmented": 0, "human_locked": 0, "review_items": 0, "spans": 0, "attributions": 0}
+    created_at = _now_iso()
+    for i in range(interactions):
+        interaction_id = f"cll_STANDIN_{i:07d}"
+        event_at = f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:00:00Z"
+        transcript = " ".join(rng.choice(WORDS) for _ in range(rng.randint(60, 1200)))
+        conn.execute(
+            "insert into interactions (interaction_id, channel, event_at_utc) values (?, 'call', ?)",
+            (interaction_id, event_at),
+        )
+        conn.execute(
+            "insert into calls_raw (interaction_id, transcript, event_at_utc, direction, owner_phone, "
+            "other_party_phone, owner_name, other_party_name, summary) values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                interaction_id,
+                transcript,
+                event_at,
+                rng.choice(("inbound", "outbound")),
+                "+15550000000",
+                f"+1555{i:07d}",
+                "Owner",
+                f"Contact {i % 500}",
+                "synthetic call",
+            ),
+        )
+        counts["interactions"] += 1
+        if rng.random() < human_lock_fraction:
+            conn.execute("insert into human_locks (interaction_id) values (?)", (interaction_id,))
+            counts["human_locked"] += 1
+        if rng.random() < review_fraction:
+            for _ in range(rng.randint(1, 3)):
+                conn.execute(
+                    "insert into review_queue (id, interaction_id, status) values (?, ?, 'pending')",
+                    (str(uuid.UUID(int=rng.getrandbits(128))), interaction_id),
+                )
+                counts["review_items"] += 1
+        if rng.random() < unsegmented_fraction:
+            counts["unsegmented"] += 1
+            continue
+        for span_index, (start, end) in enumerate(_span_bounds(len(transcript))):
+            span_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            conn.execute(
+                "insert into conversation_spans (id, interaction_id, span_index, char_start, char_end, created_at) "
+                "values (?, ?, ?, ?, ?, ?)",
+                (span_id, interaction_id, span_index, start, end, created_at),
+            )
+            counts["spans"] += 1
+            project_id, _, decision, confidence = _synthetic_attribution(interaction_id, span_index, project_rows)
+            conn.execute(
+                "insert into span_attributions (id, span_id, project_id, confidence, decision, prompt_version, "
+                "model_id, reasoning, attributed_at) values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(uuid.UUID(int=rng.getrandbits(128))),
+                    span_id,
+                    project_id,
+                    confidence,
+                    decision,
+                    PROMPT_VERSION,
+                    MODEL_ID,
+                    "fixture",
+                    created_at,
+                ),
+            )
+            counts["attributions"] += 1
+    conn.commit()
+    conn.close()
+    return counts
+
+
+def _span_bounds(transcript_len: int) -> list[tuple[int, int]]:
+    n = max(1, min(4, math.ceil(transcript_len / SPAN_CHARS)))
+    step = math.ceil(transcript_len / n)
+    return [(i * step, min(transcript_len, (i + 1) * step)) for i in range(n)]
+
+
+def _synthetic_attribution(
+    source_interaction_id: str, span_index: int, projects: list[tuple[str, str]]
+) -> tuple[str | None, str | None, str, float]:
+    """Deterministic per (source interaction, span), so replays of one call agree."""
+    pick = _stable_fraction(source_interaction_id, span_index, "decision")
+    decision = DECISIONS[-1][0]
+    acc = 0.0
+    for name, weight in DECISIONS:
+        acc += weight
+        if pick < acc:
+            decision = name
+            break
+    confidence = round(0.4 + 0.6 * _stable_fraction(source_interaction_id, span_index, "confidence"), 3)
+    if decision == "none" or not projects:
+        return None, None, decision, confidence
+    project_id, project_name = projects[int(_stable_fraction(source_interaction_id, span_index) * len(projects))]
+    return project_id, project_name, decision, confidence
+
+
+# ---------------------------------------------------------------------------
+# Fault injection
+# ---------------------------------------------------------------------------
+
+
+class Faults:
+    """Latency sampling, injected 5xx/429 and a global request-per-second ceiling."""
+
+    def __init__(
+        self,
+        *,
+        fn_latency_ms: float,
+        fn_latency_p95_ms: float,
+        fn_ms_per_kchar: float,
+        rest_latency_ms: float,
+        rest_latency_p95_ms: float,
+        error_rate: float,
+        throttle_rate: float,
+        max_rps: float,
+        faults_on_rest: bool,
+        seed: int,
+    ) -> None:
+        self.fn_latency = (fn_latency_ms, fn_latency_p95_ms)
+        self.fn_ms_per_kchar = fn_ms_per_kchar
+        self.rest_latency = (rest_latency_ms, rest_latency_p95_ms)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self.faults_on_rest = faults_on_rest
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = max_rps
+        self._refilled = time.monotonic()
+
+    def latency_s(self, rest: bool) -> float:
+        median_ms, p95_ms = self.rest_latency if rest else self.fn_latency
+        if median_ms <= 0:
+            return 0.0
+        sigma = math.log(p95_ms / median_ms) / P95_Z if p95_ms > median_ms else 0.0
+        with self._lock:
+            z = self._rng.gauss(0.0, 1.0)
+        return median_ms * math.exp(sigma * z) / 1000.0
+
+    def verdict(self, rest: bool) -> str:
+        """Return "", "throttle" or "error" for the next request."""
+        if rest and not self.faults_on_rest:
+            return ""
+        with self._lock:
+            if self.max_rps > 0:
+                now = time.monotonic()
+                self._tokens = min(self.max_rps, self._tokens + (now - self._refilled) * self.max_rps)
+                self._refilled = now
+                if self._tokens < 1.0:
+                    return "throttle"
+                self._tokens -= 1.0
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            return "throttle"
+        if roll < self.throttle_rate + self.error_rate:
+            return "error"
+        return ""
+
+
+# ---------------------------------------------------------------------------
+# Optional Postgres mirror
+# ---------------------------------------------------------------------------
+
+
+class PgMirror:
+    """Replays stand-in span/attribution writes into a local Postgres via psql."""
+
+    def __init__(self, database_url: str, psql_bin: str) -> None:
+        self.database_url = database_url
+        self.psql_bin = psql_bin
+
+    def run(self, sql: str) -> None:
+        proc = subprocess.run(
+            [self.psql_bin, self.database_url, "-X", "-q", "-v", "ON_ERROR_STOP=1", "-c", sql],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            print(f"standin: pg mirror failed: {proc.stderr.strip()}", file=sys.stderr)
+
+    def spans(self, interaction_id: str, spans: list[dict[str, Any]], supersede: bool) -> None:
+        values = ",".join(
+            f"({_sql_quote(interaction_id)}, {s['span_index']}, {s['char_start']}, {s['char_end']}, "
+            "'standin_v1', 'standin')"
+            for s in spans
+        )
+        supersede_sql = (
+            f"update conversation_spans set is_superseded = true where interaction_id = {_sql_quote(interaction_id)} "
+            "and is_superseded = false;"
+            if supersede
+            else ""
+        )
+        self.run(
+            f"insert into interactions (interaction_id, channel) values ({_sql_quote(interaction_id)}, 'call') "
+            "on conflict (interaction_id) do nothing;"
+            f"{supersede_sql}"
+            "insert into conversation_spans (interaction_id, span_index, char_start, char_end, segmenter_version, "
+            f"segment_reason) values {values};"
+        )
+
+    def attributions(self, interaction_id: str, attributions: list[dict[str, Any]]) -> None:
+        statements = []
+        for a in attributions:
+            project = (
+                f"(select id from projects where name = {_sql_quote(a['project_name'])} limit 1)"
+                if a["project_name"]
+                else "null"
+            )
+            statements.append(
+                "insert into span_attributions (span_id, project_id, confidence, decision, prompt_version, model_id, "
+                "reasoning, attribution_source, attributed_by, attributed_at, applied_at_utc) "
+                f"select cs.id, {project}, {a['confidence']}, {_sql_quote(a['decision'])}, "
+                f"{_sql_quote(PROMPT_VERSION)}, {_sql_quote(MODEL_ID)}, 'standin', 'standin', 'standin', now(), now() "
+                f"from conversation_spans cs where cs.interaction_id = {_sql_quote(interaction_id)} "
+                f"and cs.span_index = {a['span_index']} and cs.is_superseded = false;"
+            )
+        self.run("".join(statements))
+
+
+# ---------------------------------------------------------------------------
+# Stand-in state
+# ---------------------------------------------------------------------------
+
+
+class StandIn:
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        edge_secret: str,
+        faults: Faults,
+        pipeline_delay_ms: float,
+        pg_mirror: PgMirror | None,
+    ) -> None:
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.db_lock = threading.Lock()
+        self.edge_secret = edge_secret
+        self.faults = faults
+        self.pipeline_delay_s = pipeline_delay_ms / 1000.0
+        self.pg_mirror = pg_mirror
+        self.projects = [(r["id"], r["name"]) for r in self.conn.execute("select id, name from projects order by id")]
+        self.table_columns = {
+            t: [c[1] for c in self.conn.execute(f"pragma table_info({t})")]
+            for (t,) in self.conn.execute("select name from sqlite_master where type = 'table'")
+        }
+        self.stats_lock = threading.Lock()
+        self.stats: dict[str, dict[str, int]] = {}
+        self.started_at = _now_iso()
+
+    def count(self, endpoint: str, status: int) -> None:
+        with self.stats_lock:
+            bucket = self.stats.setdefault(endpoint, {})
+            bucket[str(status)] = bucket.get(str(status), 0) + 1
+
+    # -- spans / attributions ------------------------------------------------
+
+    def _write_spans(
+        self, interaction_id: str, source_interaction_id: str, transcript_len: int, *, supersede: bool, attribute: bool
+    ) -> tuple[int, int]:
+        created_at = _now_iso()
+        spans = [
+            {"id": str(uuid.uuid4()), "span_index": i, "char_start": start, "char_end": end}
+            for i, (start, end) in enumerate(_span_bounds(transcript_len))
+        ]
+        with self.db_lock:
+            before = self.conn.execute(
+                "select count(*), coalesce(max(segment_generation), 0) from conversation_spans "
+                "where interaction_id = ? and is_superseded = 0",
+                (interaction_id,),
+            ).fetchone()
+            if supersede:
+                self.conn.execute(
+                    "update conversation_spans set is_superseded = 1 where interaction_id = ? and is_superseded = 0",
+                    (interaction_id,),
+                )
+            self.conn.executemany(
+                "insert into conversation_spans (id, interaction_id, span_index, char_start, char_end, "
+                "segment_generation, created_at) values (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (s["id"], interaction_id, s["span_index"], s["char_start"], s["char_end"], before[1] + 1, created_at)
+                    for s in spans
+                ],
+            )
+            self.conn.commit()
+        if self.pg_mirror is not None:
+            self.pg_mirror.spans(interaction_id, spans, supersede)
+
+        if attribute:
+            # Attributions land after the simulated pipeline delay so readiness polling is exercised.
+            timer = threading.Timer(
+                self.pipeline_delay_s, self._write_attributions, (interaction_id, source_interaction_id, spans)
+            )
+            timer.daemon = True
+            timer.start()
+        return int(before[0]), len(spans)
+
+    def _write_attributions(self, interaction_id: str, source_interaction_id: str, spans: list[dict[str, Any]]) -> None:
+        attributions = []
+        for s in spans:
+            project_id, project_name, decision, confidence = _synthetic_attribution(
+                source_interaction_id, s["span_index"], self.projects
+            )
+            attributions.append(
+                {
+                    "span_id": s["id"],
+                    "span_index": s["span_index"],
+                    "project_id": project_id,
+                    "project_name": project_name,
+                    "decision": decision,
+                    "confidence": confidence,
+                }
+            )
+        attributed_at = _now_iso()
+        with self.db_lock:
+            self.conn.executemany(
+                "insert into span_attributions (id, span_id, project_id, confidence, decision, prompt_version, "
+                "model_id, reasoning, attributed_at) values (?, ?, ?, ?, ?, ?, ?, 'standin', ?)",
+                [
+                    (
+                        str(uuid.uuid4()),
+                        a["span_id"],
+                        a["project_id"],
+                        a["confidence"],
+                        a["decision"],
+                        PROMPT_VERSION,
+                        MODEL_ID,
+                        attributed_at,
+                    )
+                    for a in attributions
+                ],
+            )
+            self.conn.commit()
+        if self.pg_mirror is not None:
+            self.pg_mirror.attributions(interaction_id, attributions)
+
+    # -- endpoints -------------------------------------------------------------
+
+    def shadow_replay(self, headers: Any, body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        t0 = time.monotonic()
+        if headers.get("X-Edge-Secret") != self.edge_secret:
+            return 401, {"ok": False, "error": "unauthorized", "error_code": "auth_failed"}
+        interaction_id = str(body.get("interaction_id") or "").strip()
+        if not interaction_id:
+            return 400, {"ok": False, "error": "missing_interaction_id"}
+        shadow_id = str(body.get("shadow_id") or "").strip() or f"cll_SHADOW_{int(time.time() * 1000)}_STANDIN"
+        if not SHADOW_ID_PATTERN.match(shadow_id):
+            return 400, {"ok": False, "error": "invalid_shadow_id"}
+        if shadow_id == interaction_id:
+            return 400, {"ok": False, "error": "shadow_id_must_differ"}
+
+        with self.db_lock:
+            original = self.conn.execute(
+                "select transcript from calls_raw where interaction_id = ?", (interaction_id,)
+            ).fetchone()
+        if original is None:
+            return 404, {"ok": False, "error": "original_call_not_found", "interaction_id": interaction_id}
+        transcript = str(original["transcript"] or "")
+        if len(transcript.strip()) < 10:
+            return 400, {"ok": False, "error": "original_transcript_missing", "interaction_id": interaction_id}
+
+        if body.get("dry_run") is True:
+            return 200, {
+                "ok": True,
+                "interaction_id": interaction_id,
+                "shadow_id": shadow_id,
+                "dry_run": True,
+                "pipeline_result": None,
+                "ms": round((time.monotonic() - t0) * 1000),
+            }
+
+        with self.db_lock:
+            self.conn.execute(
+                "insert or ignore into interactions (interaction_id, channel) values (?, 'call')", (shadow_id,)
+            )
+            self.conn.execute(
+                "insert or replace into calls_raw (interaction_id, transcript) values (?, ?)", (shadow_id, transcript)
+            )
+            self.conn.commit()
+        _, span_count = self._write_spans(shadow_id, interaction_id, len(transcript), supersede=True, attribute=True)
+        return 200, {
+            "ok": True,
+            "interaction_id": interaction_id,
+            "shadow_id": shadow_id,
+            "dry_run": False,
+            "pipeline_status": 200,
+            "pipeline_result": {"ok": True, "spans": span_count},
+            "ms": round((time.monotonic() - t0) * 1000),
+        }
+
+    def admin_reseed(self, headers: Any, body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        t0 = time.monotonic()
+        if headers.get("X-Edge-Secret") != self.edge_secret:
+            return 401, {"ok": False, "error": "unauthorized", "error_code": "auth_failed"}
+        interaction_id = str(body.get("interaction_id") or "")
+        reason = str(body.get("reason") or "")
+        idempotency_key = str(body.get("idempotency_key") or "")
+        mode = str(body.get("mode") or "resegment_only")
+        if not interaction_id:
+            return 400, {"error": "missing_interaction_id"}
+        if not reason.strip():
+            return 400, {"error": "missing_reason"}
+        if not idempotency_key.strip():
+            return 400, {"error": "missing_idempotency_key"}
+        if mode not in RESEED_MODES:
+            return 400, {"error": "invalid_mode", "valid": list(RESEED_MODES)}
+
+        with self.db_lock:
+            existing = self.conn.execute(
+                "select reseed_status, effects_receipt from override_log where idempotency_key = ?", (idempotency_key,)
+            ).fetchone()
+            interaction = self.conn.execute(
+                "select i.interaction_id, c.transcript from interactions i "
+                "left join calls_raw c on c.interaction_id = i.interaction_id where i.interaction_id = ?",
+                (interaction_id,),
+            ).fetchone()
+            locked = self.conn.execute(
+                "select 1 from human_locks where interaction_id = ?", (interaction_id,)
+            ).fetchone()
+        if existing is not None:
+            return 200, {
+                "ok": existing["reseed_status"] == "success",
+                "idempotent_replay": True,
+                "receipt": json.loads(existing["effects_receipt"] or "{}"),
+                "ms": round((time.monotonic() - t0) * 1000),
+            }
+        if interaction is None:
+            return 404, {"ok": False, "error": "interaction_not_found", "interaction_id": interaction_id}
+        if locked is not None:
+            return 409, {"ok": False, "error": "human_lock_present", "interaction_id": interaction_id}
+
+        transcript_len = len(str(interaction["transcript"] or ""))
+        # Segmentation time grows with the transcript (--fn-ms-per-kchar).
+        time.sleep(self.faults.fn_ms_per_kchar * transcript_len / 1e6)
+        reroute = mode != "resegment_only"
+        spans_before, spans_after = self._write_spans(
+            interaction_id,
+            interaction_id,
+            transcript_len or SPAN_CHARS,
+            supersede=True,
+            attribute=reroute,
+        )
+        receipt = {
+            "interaction_id": interaction_id,
+            "mode": mode,
+            "spans_before": spans_before,
+            "spans_after": spans_after,
+            "reroute_triggered": reroute,
+            "ms": round((time.monotonic() - t0) * 1000),
+        }
+        with self.db_lock:
+            self.conn.execute(
+                "insert or replace into override_log (idempotency_key, interaction_id, reseed_status, effects_receipt) "
+                "values (?, ?, 'success', ?)",
+                (idempotency_key, interaction_id, json.dumps(receipt)),
+            )
+            self.conn.commit()
+        return 200, {"ok": True, "receipt": receipt}
+
+    def rest_select(self, table: str, query: str, prefer: str) -> tuple[int, Any, dict[str, str]]:
+        columns = self.table_columns.get(table)
+        if columns is None:
+            return 404, {"code": "42P01", "message": f'relation "public.{table}" does not exist'}, {}
+
+        params = urllib.parse.parse_qsl(query, keep_blank_values=True)
+        select_cols = columns
+        where: list[str] = []
+        args: list[Any] = []
+        order: list[str] = []
+        limit: int | None = None
+        offset = 0
+        try:
+            for key, value in params:
+                if key == "select":
+                    select_cols = columns if value.strip() == "*" else [c.strip() for c in value.split(",")]
+                    unknown = [c for c in select_cols if c not in columns]
+                    if unknown:
+                        raise ValueError(f"column {table}.{unknown[0]} does not exist")
+                elif key == "order":
+                    for part in value.split(","):
+                        col, _, direction = part.partition(".")
+                        if col not in columns:
+                            raise ValueError(f"column {table}.{col} does not exist")
+                        order.append(f"{col} {'desc' if direction.startswith('desc') else 'asc'}")
+                elif key == "limit":
+                    limit = int(value)
+                elif key == "offset":
+                    offset = int(value)
+                else:
+                    if key not in columns:
+                        raise ValueError(f"column {table}.{key} does not exist")
+                    clause, clause_args = _rest_filter(key, value)
+                    where.append(clause)
+                    args.extend(clause_args)
+        except ValueError as exc:
+            return 400, {"code": "PGRST100", "message": str(exc)}, {}
+
+        where_sql = f" where {' and '.join(where)}" if where else ""
+        order_sql = f" order by {', '.join(order)}" if order else ""
+        page_sql = f" limit {limit if limit is not None else -1} offset {offset}"
+        sql = f"select {', '.join(select_cols)} from {table}{where_sql}{order_sql}{page_sql}"
+        with self.db_lock:
+            rows = [
+                {k: (bool(v) if k in BOOL_COLUMNS and v is not None else v) for k, v in zip(select_cols, r)}
+                for r in self.conn.execute(sql, args)
+            ]
+            total = None
+            if "count=exact" in prefer:
+                total = self.conn.execute(f"select count(*) from {table}{where_sql}", args).fetchone()[0]
+        end = offset + len(rows) - 1
+        content_range = f"{offset}-{end}" if rows else "*"
+        return 200, rows, {"Content-Range": f"{content_range}/{total if total is not None else '*'}"}
+
+    def rpc(self, name: str, body: dict[str, Any]) -> tuple[int, Any]:
+        functions = {
+            "list_unsegmented_interactions": self._rpc_list_unsegmented_interactions,
+            "reseed_candidate_features": self._rpc_reseed_candidate_features,
+        }
+        fn = functions.get(name)
+        if fn is None:
+            return 404, {"code": "PGRST202", "message": f"Could not find the function public.{name} in the schema cache"}
+        return fn(body)
+
+    def _rpc_list_unsegmented_interactions(self, body: dict[str, Any]) -> tuple[int, Any]:
+        after = body.get("p_after")
+        limit = min(max(int(body.get("p_limit") or 1000), 1), 10000)
+        # Same shape as the migration: keyset range on interaction_id + NOT EXISTS on active spans.
+        sql = (
+            "select i.interaction_id from interactions i "
+            "where (? is null or i.interaction_id > ?) "
+            "and not exists (select 1 from conversation_spans cs "
+            "where cs.interaction_id = i.interaction_id and cs.is_superseded = 0) "
+            "order by i.interaction_id limit ?"
+        )
+        with self.db_lock:
+            rows = [{"interaction_id": r[0]} for r in self.conn.execute(sql, (after, after, limit))]
+        return 200, rows
+
+    def _rpc_reseed_candidate_features(self, body: dict[str, Any]) -> tuple[int, Any]:
+        ids = body.get("p_interaction_ids")
+        if not isinstance(ids, list):
+            return 400, {"code": "22P02", "message": "p_interaction_ids must be an array"}
+        sql = (
+            "select i.interaction_id, i.event_at_utc, coalesce(length(cr.transcript), 0), "
+            "(select count(*) from review_queue q where q.interaction_id = i.interaction_id "
+            "and q.status = 'pending') "
+            "from interactions i left join calls_raw cr on cr.interaction_id = i.interaction_id "
+            "where i.interaction_id = ?"
+        )
+        rows: list[dict[str, Any]] = []
+        with self.db_lock:
+            for iid in dict.fromkeys(str(i) for i in ids):
+                for r in self.conn.execute(sql, (iid,)):
+                    rows.append(
+                        {"interaction_id": r[0], "event_at_utc": r[1], "transcript_bytes": r[2], "open_review_items": r[3]}
+                    )
+        return 200, rows
+
+
+def _rest_filter(column: str, expr: str) -> tuple[str, list[Any]]:
+    op, _, raw = expr.partition(".")
+    negate = False
+    if op == "not":
+        negate = True
+        op, _, raw = raw.partition(".")
+
+    def coerce(v: str) -> Any:
+        if column in BOOL_COLUMNS and v in ("true", "false"):
+            return 1 if v == "true" else 0
+        return v
+
+    ops = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+    if op in ops:
+        clause, args = f"{column} {ops[op]} ?", [coerce(raw)]
+    elif op == "in":
+        values = [v.strip().strip('"') for v in raw.strip("()").split(",") if v.strip()]
+        clause, args = f"{column} in ({','.join('?' for _ in values) or 'null'})", [coerce(v) for v in values]
+    elif op == "is":
+        if raw not in ("null", "true", "false"):
+            raise ValueError(f"unsupported is.{raw}")
+        clause, args = (f"{column} is null", []) if raw == "null" else (f"{column} = ?", [coerce(raw)])
+    elif op == "like":
+        clause, args = f"{column} like ?", [raw.replace("*", "%")]
+    else:
+        raise ValueError(f"unsupported operator: {op}")
+    return (f"not ({clause})", args) if negate else (clause, args)
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+
+def make_handler(standin: StandIn) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            pass
+
+        def _send(self, endpoint: str, status: int, payload: Any, extra_headers: dict[str, str] | None = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            gzipped = "gzip" in (self.headers.get("Accept-Encoding") or "") and len(body) > GZIP_MIN_BYTES
+            if gzipped:
+                body = gzip.compress(body, compresslevel=5)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (extra_headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+            standin.count(endpoint, status)
+
+        def _inject(self, endpoint: str, rest: bool) -> bool:
+            time.sleep(standin.faults.latency_s(rest))
+            verdict = standin.faults.verdict(rest)
+            if verdict == "throttle":
+                self._send(endpoint, 429, {"ok": False, "error": "rate_limited"}, {"Retry-After": "1"})
+                return True
+            if verdict == "error":
+                self._send(endpoint, 500, {"ok": False, "error": "injected_internal_error"})
+                return True
+            return False
+
+        def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+            path = urllib.parse.urlsplit(self.path).path
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            routes = {
+                "/functions/v1/shadow-replay": standin.shadow_replay,
+                "/functions/v1/admin-reseed": standin.admin_reseed,
+            }
+            route = routes.get(path)
+            if route is None and path.startswith("/rest/v1/rpc/"):
+                if self._inject(path, rest=True):
+                    return
+                try:
+                    body = json.loads(raw or b"{}")
+                except json.JSONDecodeError:
+                    self._send(path, 400, {"code": "PGRST102", "message": "invalid json"})
+                    return
+                status, payload = standin.rpc(path[len("/rest/v1/rpc/") :].strip("/"), body if isinstance(body, dict) else {})
+                self._send(path, status, payload)
+                return
+            if route is None:
+                self._send(path, 404, {"ok": False, "error": "not_found"})
+                return
+            if self._inject(path, rest=False):
+                return
+            try:
+                body = json.loads(raw or b"{}")
+            except json.JSONDecodeError:
+                self._send(path, 400, {"ok": False, "error": "invalid_json"})
+                return
+            status, payload = route(self.headers, body if isinstance(body, dict) else {})
+            self._send(path, status, payload)
+
+        def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+            parts = urllib.parse.urlsplit(self.path)
+            if parts.path == "/standin/stats":
+                with standin.stats_lock:
+                    stats = json.loads(json.dumps(standin.stats))
+                self._send(parts.path, 200, {"started_at_utc": standin.started_at, "requests": stats})
+                return
+            if not parts.path.startswith("/rest/v1/"):
+                self._send(parts.path, 404, {"ok": False, "error": "not_found"})
+                return
+            endpoint = parts.path
+            if self._inject(endpoint, rest=True):
+                return
+            table = parts.path[len("/rest/v1/") :].strip("/")
+            status, payload, headers = standin.rest_select(table, parts.query, self.headers.get("Prefer") or "")
+            self._send(endpoint, status, payload, headers)
+
+    return Handler
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local Supabase stand-in for offline batch-script benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    init = sub.add_parser("init", help="build a synthetic SQLite fixture database")
+    init.add_argument("--db", required=True, help="fixture path (overwritten)")
+    init.add_argument("--interactions", type=int, default=1000)
+    init.add_argument("--projects", type=int, default=25)
+    init.add_argument("--unsegmented-fraction", type=float, default=0.3, help="interactions with no active spans")
+    init.add_argument("--human-lock-fraction", type=float, default=0.02, help="interactions admin-reseed rejects (409)")
+    init.add_argument("--review-fraction", type=float, default=0.05, help="interactions with 1-3 pending review items")
+    init.add_argument("--seed", type=int, default=7)
+
+    serve = sub.add_parser("serve", help="serve the emulated endpoints")
+    serve.add_argument("--db", required=True, help="fixture path (from `init`)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=54329)
+    serve.add_argument("--edge-secret", default="standin-edge-secret", help="expected X-Edge-Secret")
+    serve.add_argument("--fn-latency-ms", type=float, default=0.0, help="median function latency (default: 0)")
+    serve.add_argument("--fn-latency-p95-ms", type=float, default=0.0, help="p95 function latency (log-normal)")
+    serve.add_argument(
+        "--fn-ms-per-kchar",
+        type=float,
+        default=0.0,
+        help="extra admin-reseed latency per 1000 transcript chars (default: 0)",
+    )
+    serve.add_argument("--rest-latency-ms", type=float, default=0.0, help="median PostgREST latency")
+    serve.add_argument("--rest-latency-p95-ms", type=float, default=0.0, help="p95 PostgREST latency (log-normal)")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 500")
+    serve.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    serve.add_argument("--max-rps", type=float, default=0.0, help="answer 429 above this request rate (0 = off)")
+    serve.add_argument("--faults-on-rest", action="store_true", help="also inject 5xx/429 on /rest/v1")
+    serve.add_argument(
+        "--pipeline-delay-ms",
+        type=float,
+        default=2000.0,
+        help="delay before a replay/reroute's attributions appear (default: 2000)",
+    )
+    serve.add_argument("--pg-mirror", default="", help="Postgres URL to mirror created spans/attributions into")
+    serve.add_argument("--psql", default="psql", help="psql binary for --pg-mirror")
+    serve.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+
+    if args.command == "init":
+        counts = init_fixture(
+            Path(args.db),
+            interactions=args.interactions,
+            projects=args.projects,
+            unsegmented_fraction=args.unsegmented_fraction,
+            human_lock_fraction=args.human_lock_fraction,
+            review_fraction=args.review_fraction,
+            seed=args.seed,
+        )
+        print(json.dumps({"db": args.db, **counts}, indent=2))
+        return 0
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"ERROR: fixture not found: {db_path} (run `init` first)", file=sys.stderr)
+        return 2
+    faults = Faults(
+        fn_latency_ms=args.fn_latency_ms,
+        fn_latency_p95_ms=args.fn_latency_p95_ms,
+        fn_ms_per_kchar=args.fn_ms_per_kchar,
+        rest_latency_ms=args.rest_latency_ms,
+        rest_latency_p95_ms=args.rest_latency_p95_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+        faults_on_rest=args.faults_on_rest,
+        seed=args.seed,
+    )
+    standin = StandIn(
+        db_path,
+        edge_secret=args.edge_secret,
+        faults=faults,
+        pipeline_delay_ms=args.pipeline_delay_ms,
+        pg_mirror=PgMirror(args.pg_mirror, args.psql) if args.pg_mirror else None,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(standin))
+    server.daemon_threads = True
+    print(f"STANDIN_READY http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Tests for admin_reseed_batch_backfill.py.
+
+End-to-end cases run the real CLI in a subprocess against a fake Supabase served
+from this process: the candidates RPC pages through INTERACTIONS, and admin-reseed
+logs every idempotency key and answers with the status configured per interaction
+(200 ok by default). Earlier interactions answer more slowly, so workers finish
+out of candidate order.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from admin_reseed_batch_backfill import _classify_failure, _drop_torn_row, _read_prior_results
+
+SCRIPTS = Path(__file__).resolve().parent
+BACKFILL = SCRIPTS / "admin_reseed_batch_backfill.py"
+INTERACTIONS = [f"cll_TEST_{i:03d}" for i in range(1, 7)]
+
+
+class FakeSupabase:
+    def __init__(self) -> None:
+        self.responses: dict[str, tuple[int, dict[str, Any]]] = {}
+        self.keys: list[str] = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+                return
+
+            def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+                if self.path == "/rest/v1/rpc/list_unsegmented_interactions":
+                    after = body.get("p_after")
+                    page = [iid for iid in INTERACTIONS if after is None or iid > after][: body["p_limit"]]
+                    self._reply(200, [{"interaction_id": iid} for iid in page])
+                elif self.path == "/functions/v1/admin-reseed":
+                    iid = body["interaction_id"]
+                    with fake.lock:
+                        fake.keys.append(body["idempotency_key"])
+                    time.sleep(0.05 * (len(INTERACTIONS) - INTERACTIONS.index(iid)))
+                    self._reply(*fake.responses.get(iid, (200, {"ok": True})))
+                else:
+                    self._reply(404, {"error": "not_found"})
+
+            def _reply(self, status: int, payload: Any) -> None:
+                raw = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        return Handler
+
+
+class BackfillHarness(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out = Path(tmp.name) / "run"
+        self.fake = FakeSupabase()
+        self.addCleanup(self.fake.close)
+
+    def run_backfill(self, *args: str, returncode: int = 0) -> None:
+        env = {
+            **os.environ,
+            "SUPABASE_URL": self.fake.url,
+            "SUPABASE_SERVICE_ROLE_KEY": "service-key",
+            "EDGE_SHARED_SECRET": "edge-secret",
+            "ORIGIN_SESSION": "test-session",
+            "CLAIM_RECEIPT": "claim__test",
+        }
+        cmd = [sys.executable, str(BACKFILL), "--max-per-minute", "6000", "--workers", "3", "--status-every", "0"]
+        if "--resume" not in args:
+            cmd += ["--output-dir", str(self.out)]
+        proc = subprocess.run(
+            [*cmd, "--retry-base-seconds", "0.01", *args], env=env, capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(proc.returncode, returncode, proc.stdout + proc.stderr)
+
+    def read_results(self) -> list[dict[str, str]]:
+        with (self.out / "results.csv").open(newline="", encoding="utf-8") as fh:
+            return list(csv.DictReader(fh))
+
+    def take_keys(self) -> list[str]:
+        with self.fake.lock:
+            keys, self.fake.keys = sorted(self.fake.keys), []
+        return keys
+
+
+class ClassifyFailureTest(unittest.TestCase):
+    def test_transient_and_permanent(self) -> None:
+        for status, data, expected in (
+            (0, {"error": "request_failed: timed out"}, "transient"),
+            (429, {}, "transient"),
+            (503, {"raw": "<html>"}, "transient"),
+            (200, {"ok": False, "error": "segmentation_failed"}, "transient"),
+            (500, {"error": "interaction_not_found"}, "permanent"),
+            (400, {"error": "invalid_mode"}, "permanent"),
+            (404, {"error": "interaction_not_found"}, "permanent"),
+            (401, {}, "fatal"),
+            (403, {"error": "claim_receipt_invalid"}, "fatal"),
+            (404, "not json", "fatal"),
+            (422, {"error": "unexpected"}, "transient"),
+        ):
+            with self.subTest(status=status, data=data):
+                self.assertEqual(_classify_failure(status, data), expected)
+
+
+class TornRowTest(unittest.TestCase):
+    def test_partial_last_row_is_cut_before_reading(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "results.csv"
+            complete = b"index,interaction_id,result,http_status,latency_ms,error\r\n1,cll_A,failed,500,5.0,x\r\n"
+            for tail in (b"", b"2,cll_B,succ", b"2,cll_B,success,200,1.0,\r"):
+                with self.subTest(tail=tail):
+                    path.write_bytes(complete + tail)
+                    _drop_torn_row(path)
+                    self.assertEqual(path.read_bytes(), complete)
+                    prior = _read_prior_results(path)
+                    self.assertEqual(prior.last_result, {"cll_A": "failed"})
+                    self.assertEqual((prior.attempts, prior.max_index), ({"cll_A": 1}, 1))
+
+
+class ReorderTest(BackfillHarness):
+    def test_rows_are_written_in_candidate_order(self) -> None:
+        self.run_backfill()
+        rows = self.read_results()
+        expected = [(str(index), iid) for index, iid in enumerate(INTERACTIONS, start=1)]
+        self.assertEqual([(r["index"], r["interaction_id"]) for r in rows], expected)
+        self.assertEqual({r["result"] for r in rows}, {"success"})
+
+
+class ResumeTest(BackfillHarness):
+    def test_resume_after_a_torn_row_continues_attempt_numbers(self) -> None:
+        failing, gone = INTERACTIONS[2], INTERACTIONS[4]
+        self.fake.responses = {failing: (500, {"error": "boom"}), gone: (404, {"error": "interaction_not_found"})}
+        self.run_backfill()
+        stamp = json.loads((self.out / "run.json").read_text(encoding="utf-8"))["timestamp_utc"]
+        self.assertEqual(self.take_keys(), [f"backfill:{stamp}:{iid}" for iid in INTERACTIONS])
+        # Killed while writing a seventh row.
+        with (self.out / "results.csv").open("a", encoding="utf-8", newline="") as fh:
+            fh.write("7,cll_TEST_0")
+
+        # Still failing: --max-attempts 2 makes attempts 2 and 3, after attempt 1 above.
+        self.run_backfill("--resume", str(self.out), "--max-attempts", "2")
+        self.assertEqual(self.take_keys(), [f"backfill:{stamp}:{failing}:attempt{n}" for n in (2, 3)])
+
+        self.fake.responses = {}
+        self.run_backfill("--resume", str(self.out))
+        self.assertEqual(self.take_keys(), [f"backfill:{stamp}:{failing}:attempt4"])
+
+        rows = self.read_results()
+        self.assertEqual([len(r) for r in rows], [6] * len(rows))
+        self.assertEqual(
+            [(r["index"], r["interaction_id"], r["result"]) for r in rows[len(INTERACTIONS) :]],
+            [("7", failing, "failed"), ("7", failing, "failed"), ("8", failing, "success")],
+        )
+        self.assertEqual(rows[4]["result"], "failed_permanent")
+
+        # Nothing left to do.
+        self.run_backfill("--resume", str(self.out))
+        self.assertEqual(self.take_keys(), [])
+
+    def test_auth_failure_aborts_and_resume_retries_every_row(self) -> None:
+        self.fake.responses = {iid: (401, {"error": "unauthorized"}) for iid in INTERACTIONS}
+        self.run_backfill("--max-attempts", "3", returncode=1)
+        called = self.take_keys()
+        # Each worker's first call fails and nothing new is dispatched; none are retried.
+        self.assertLessEqual(len(called), 3)
+        self.assertNotIn(":attempt", "".join(called))
+        summary = json.loads((self.out / "summary.json").read_text(encoding="utf-8"))
+        self.assertIn("HTTP 401", summary["aborted"])
+        self.assertEqual(summary["failed_permanent"], 0)
+        self.assertEqual({r["result"] for r in self.read_results()}, {"failed"})
+        status = json.loads((self.out / "status.json").read_text(encoding="utf-8"))
+        self.assertEqual(status["state"], "aborted")
+
+        self.fake.responses = {}
+        self.run_backfill("--resume", str(self.out))
+        self.assertEqual(len(self.take_keys()), len(INTERACTIONS))
+        last = {r["interaction_id"]: r["result"] for r in self.read_results()}
+        self.assertEqual(last, {iid: "success" for iid in INTERACTIONS})
+
+
+if __name__ == "__main__":
+    unittest.main()
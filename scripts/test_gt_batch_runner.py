@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Tests for gt_batch_runner.py.
+
+End-to-end cases run the real CLI in a subprocess against fake `curl` and `psql`
+executables written to a temp dir (PATH / PSQL_PATH). The fake curl answers
+shadow-replay / admin-reseed, fails the interaction ids listed in FAKE_FAIL_IDS
+with HTTP 500, and logs every call to FAKE_LOG. The fake psql answers the
+runner's readiness, actuals and bookkeeping queries with fixed rows: "assign"
+for odd-numbered interactions, "review" for even ones (swapped when FAKE_FLIP
+is set).
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import unittest
+from pathlib import Path
+
+from gt_batch_runner import (
+    JOURNAL_NAME,
+    ArtifactStore,
+    AttributionCache,
+    RunJournal,
+    iter_json_array,
+    preserve_baseline_artifacts,
+    read_journal,
+)
+from gt_run_index import file_sha256
+
+SCRIPTS = Path(__file__).resolve().parent
+RUNNER = SCRIPTS / "gt_batch_runner.py"
+INTERACTIONS = [f"cll_TEST_{i:03d}" for i in range(1, 9)]
+TORN = '{"event": "trigger", "trigger_row": {"interaction_id": "cll_TE'
+
+FAKE_CURL = r'''
+import json, os, sys
+args = sys.argv[1:]
+data = json.loads(args[args.index("--data") + 1])
+iid = data["interaction_id"]
+with open(os.environ["FAKE_LOG"], "a") as fh:
+    fh.write(iid + "\n")
+if iid in os.environ.get("FAKE_FAIL_IDS", "").split(","):
+    print(json.dumps({"ok": False, "error": "injected"}))
+    print("__HTTP_STATUS__:500")
+else:
+    out = {"ok": True}
+    if "shadow_id" in data:
+        out["shadow_id"] = data["shadow_id"]
+    print(json.dumps(out))
+    print("__HTTP_STATUS__:200")
+'''
+
+FAKE_PSQL = r'''
+import json, os, re, sys
+sql = sys.argv[sys.argv.index("-c") + 1]
+
+def out(obj):
+    print(json.dumps(obj).replace("\\", "\\\\"))
+
+def actual(iid, span_index):
+    keys = ["resolved_span_id", "resolved_span_index", "char_start", "char_end", "actual_project_id",
+            "actual_project_name", "actual_decision", "actual_confidence", "actual_prompt_version",
+            "actual_model_id", "actual_reason_codes", "actual_reasoning"]
+    decision = "assign" if (int(iid[-1]) + bool(os.environ.get("FAKE_FLIP"))) % 2 else "review"
+    values = [f"sp_{iid[-3:]}_{span_index}", span_index, 0, 100, "proj_1", "Project One", decision, 0.8,
+              "v1", "model", "{}", "fixture"]
+    return dict(zip(keys, values))
+
+ids = re.findall(r"'(cll_[^']+)'", sql)
+if "db_now" in sql:
+    out({"db_now": "2026-01-01 00:00:00+00"})
+elif "transcript_sha256" in sql:
+    for iid in ids:
+        out({"interaction_id": iid, "transcript_sha256": "h" + iid})
+elif "where sa.prompt_version is not null" in sql:
+    out({"prompt_version": "v1", "model_id": "model"})
+elif "attributed_count" in sql:
+    for iid in ids:
+        out({"interaction_id": iid, "span_count": 2, "attributed_count": 2})
+elif "missing_count" in sql:
+    out({"missing_count": 0})
+elif "with sel(" in sql:
+    for m in re.finditer(r"\((\d+), '([^']+)', (?:'[^']*'|null::text), (\d+|null::int)\)", sql):
+        index = 0 if m.group(3).startswith("null") else int(m.group(3))
+        out({"row_pos": int(m.group(1)), **actual(m.group(2), index)})
+else:
+    m = re.search(r"cs.interaction_id = '([^']+)'", sql)
+    if m:
+        out(actual(m.group(1), 0))
+'''
+
+
+def write_input(path: Path) -> None:
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["row_id", "interaction_id", "span_index", "expected_project_id", "expected_decision"])
+        for n, iid in enumerate(INTERACTIONS):
+            for span_index in (0, 1):
+                writer.writerow([f"r{n:02d}_{span_index}", iid, span_index, "proj_1", "assign"])
+
+
+class RunnerHarness(unittest.TestCase):
+    """Temp dir with fake curl/psql on PATH and a small GT input file."""
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        bin_dir = self.tmp / "bin"
+        bin_dir.mkdir()
+        for name, body in (("curl", FAKE_CURL), ("psql", FAKE_PSQL)):
+            tool = bin_dir / name
+            tool.write_text(f"#!{sys.executable}\n" + textwrap.dedent(body), encoding="utf-8")
+            tool.chmod(0o755)
+        self.input = self.tmp / "input.csv"
+        write_input(self.input)
+        self.log = self.tmp / "curl.log"
+        self.env = {
+            **os.environ,
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            "PSQL_PATH": str(bin_dir / "psql"),
+            "GT_DB_DRIVER": "psql",
+            "SUPABASE_URL": "http://fake",
+            "SUPABASE_SERVICE_ROLE_KEY": "k",
+            "EDGE_SHARED_SECRET": "s",
+            "DATABASE_URL": "postgres://fake",
+            "FAKE_LOG": str(self.log),
+        }
+
+    def run_runner(self, *args: str, fail: tuple[str, ...] = (), flip: bool = False) -> subprocess.CompletedProcess:
+        env = {**self.env, "FAKE_FAIL_IDS": ",".join(fail), "FAKE_FLIP": "1" if flip else ""}
+        argv = [sys.executable, str(RUNNER), *args]
+        if args[:1] != ("merge",):
+            argv += ["--ready-poll-seconds", "0.05", "--ready-timeout-seconds", "5"]
+        proc = subprocess.run(argv + ["--no-run-index"], env=env, capture_output=True, text=True, timeout=120)
+        return proc
+
+    def calls(self) -> list[str]:
+        return self.log.read_text(encoding="utf-8").split() if self.log.exists() else []
+
+    @staticmethod
+    def read_csv(path: Path) -> list[dict]:
+        with path.open(newline="", encoding="utf-8") as fh:
+            return list(csv.DictReader(fh))
+
+
+class JournalTest(unittest.TestCase):
+    def test_events_after_a_torn_line_survive(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / JOURNAL_NAME
+            path.write_text('{"event": "triggered", "id": "a"}\n{"event": "trig', encoding="utf-8")
+            journal = RunJournal(path)
+            journal.append("triggered", id="b")
+            journal.append("scored", id="b")
+            journal.close()
+            self.assertEqual([e.get("id") for e in read_journal(path)], ["a", "b", "b"])
+            self.assertTrue(path.read_text(encoding="utf-8").endswith("\n"))
+
+    def test_reader_skips_a_bad_line_in_the_middle(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / JOURNAL_NAME
+            path.write_text('{"id": 1}\n{"id": \n{"id": 2}\n', encoding="utf-8")
+            self.assertEqual([e["id"] for e in read_journal(path)], [1, 2])
+
+    def test_torn_first_line_is_dropped(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / JOURNAL_NAME
+            path.write_text('{"event": "run_st', encoding="utf-8")
+            RunJournal(path).close()
+            self.assertEqual(path.read_bytes(), b"")
+
+
+def stored_bytes(*roots: Path) -> int:
+    """Bytes on disk under roots, counting each inode once."""
+    inodes = {}
+    for root in roots:
+        for path in root.rglob("*"):
+            if path.is_file() and not path.is_symlink():
+                st = path.stat()
+                inodes[(st.st_dev, st.st_ino)] = st.st_size
+    return sum(inodes.values())
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    DOC = (
+        '{"meta": {"n": [1, 2.5, null], "rows_hint": "x"}, "rows": ['
+        '{"a": 1.25, "b": "x\\"y\\u00e9 \\n", "c": [true, false, null]}, '
+        "123456, -7.5e-3, 1E+2, 0, \"\", {}, []]}"
+    )
+
+    def test_every_chunk_size_matches_json_loads(self) -> None:
+        for doc, expected in (
+            (self.DOC, json.loads(self.DOC)["rows"]),
+            (json.dumps(json.loads(self.DOC)["rows"]), json.loads(self.DOC)["rows"]),
+            ("  [ ]  ", []),
+            ('{"rows": []}', []),
+        ):
+            for chunk_size in (1, 2, 3, 7, len(doc)):
+                with self.subTest(doc=doc[:20], chunk_size=chunk_size):
+                    self.assertEqual(list(iter_json_array(io.StringIO(doc), chunk_size)), expected)
+
+    def test_rejects_documents_without_rows(self) -> None:
+        for doc in ('{"meta": 1}', '"rows"', "[1, 2"):
+            for chunk_size in (1, 4):
+                with self.subTest(doc=doc, chunk_size=chunk_size), self.assertRaises(RuntimeError):
+                    list(iter_json_array(io.StringIO(doc), chunk_size))
+
+
+class AttributionCacheTest(unittest.TestCase):
+    def test_concurrent_writers_of_one_key_never_share_a_temp_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AttributionCache(Path(tmp), max_bytes=1 << 20)
+            key = AttributionCache.make_key("h", "v1", "model")
+            errors: list[BaseException] = []
+
+            def writer(n: int) -> None:
+                try:
+                    for i in range(50):
+                        cache.put(key, {"writer": n, "i": i, "actuals": {"span_index:0": {"pad": "x" * 4096}}})
+                except BaseException as exc:  # noqa: BLE001 - reported by the assertion below
+                    errors.append(exc)
+
+            threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertIsNotNone(cache.get(key, ["span_index:0"]))
+            self.assertEqual([p.name for p in Path(tmp).rglob("*") if p.is_file()], [f"{key}.json"])
+
+
+class ArtifactStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out_root = Path(tmp.name)
+        self.baseline = self.out_root / "B0"
+        self.baseline.mkdir()
+        (self.baseline / "metrics.json").write_text('{"accuracy": 0.5}', encoding="utf-8")
+        (self.baseline / "results.csv").write_text("row_id\n" + "r\n" * 5000, encoding="utf-8")
+        (self.baseline / "copy_of_results.csv").write_text("row_id\n" + "r\n" * 5000, encoding="utf-8")
+
+    def test_preserving_a_baseline_stores_its_bytes_once(self) -> None:
+        for run in ("R1", "R2"):
+            run_dir = self.out_root / run
+            run_dir.mkdir()
+            preserved = preserve_baseline_artifacts(self.baseline / "metrics.json", run_dir, self.out_root)
+            self.assertEqual(preserved, run_dir / "baseline_preserved" / "B0" / "metrics.json")
+        # One copy of each distinct file, however many runs preserve it.
+        unique = len('{"accuracy": 0.5}') + (self.baseline / "results.csv").stat().st_size
+        preserved_dirs = [self.out_root / run / "baseline_preserved" for run in ("R1", "R2")]
+        manifests = sum(path.stat().st_size for d in preserved_dirs for path in d.rglob("preserved_manifest.json"))
+        self.assertEqual(stored_bytes(self.out_root / ".artifact_store" / "objects", *preserved_dirs), unique + manifests)
+        for name in ("metrics.json", "results.csv", "copy_of_results.csv"):
+            r1, r2 = (self.out_root / run / "baseline_preserved" / "B0" / name for run in ("R1", "R2"))
+            self.assertTrue(os.path.samefile(r1, r2))
+            self.assertFalse(os.path.samefile(self.baseline / name, r1))
+
+    def test_baseline_files_are_left_untouched_and_writable(self) -> None:
+        names = ("metrics.json", "results.csv", "copy_of_results.csv")
+        before = {name: os.stat(self.baseline / name) for name in names}
+        run_dir = self.out_root / "R1"
+        run_dir.mkdir()
+        preserve_baseline_artifacts(self.baseline / "metrics.json", run_dir, self.out_root)
+        for name in names:
+            after = os.stat(self.baseline / name)
+            self.assertEqual((after.st_ino, after.st_mode, after.st_nlink), (before[name].st_ino, before[name].st_mode, 1))
+
+        # Rewriting the baseline in place (e.g. --resume B0) must not reach the preserved copy.
+        with (self.baseline / "results.csv").open("a", encoding="utf-8") as fh:
+            fh.write("resumed\n")
+        target_dir = run_dir / "baseline_preserved" / "B0"
+        manifest = json.loads((target_dir / "preserved_manifest.json").read_text(encoding="utf-8"))
+        for rel, digest in manifest["files"].items():
+            self.assertEqual(file_sha256(target_dir / rel), digest)
+
+    def test_unchanged_files_are_not_rehashed(self) -> None:
+        store = ArtifactStore(self.out_root / ".artifact_store")
+        digest = store.ingest(self.baseline / "results.csv")
+        store.save_index()
+        again = ArtifactStore(self.out_root / ".artifact_store")
+        self.assertEqual(again.ingest(self.baseline / "results.csv"), digest)
+        self.assertEqual(again.files_hashed, 0)
+
+    def test_index_drops_entries_for_replaced_files(self) -> None:
+        store_root = self.out_root / ".artifact_store"
+        kept = self.baseline / "metrics.json"
+        for n in range(3):
+            # A fresh file (new inode, new bytes) each time, like a rewritten run dir.
+            path = self.out_root / f"scratch_{n}.txt"
+            path.write_text(f"version {n}", encoding="utf-8")
+            store = ArtifactStore(store_root)
+            store.ingest(path)
+            store.ingest(kept)
+            store.save_index()
+            path.unlink()
+        store = ArtifactStore(store_root)
+        store.save_index()
+        index = json.loads((store_root / "file_index.json").read_text(encoding="utf-8"))
+        self.assertEqual(list(index), [str(kept.resolve())])
+        (self.baseline / "metrics.json").write_text('{"accuracy": 0.75}', encoding="utf-8")
+        store = ArtifactStore(store_root)
+        store.save_index()
+        self.assertEqual(json.loads((store_root / "file_index.json").read_text(encoding="utf-8")), {})
+
+
+class ResumeTest(RunnerHarness):
+    def test_crash_resume_and_second_resume_never_retrigger_completed_work(self) -> None:
+        out_root = self.tmp / "runs"
+        first = self.run_runner(
+            "--input", str(self.input), "--out-root", str(out_root), "--run-id", "R1",
+            fail=(INTERACTIONS[0], INTERACTIONS[1]),
+        )
+        run_dir = out_root / "R1"
+        self.assertTrue((run_dir / JOURNAL_NAME).exists(), first.stderr)
+        self.assertEqual(sorted(self.calls()), sorted(INTERACTIONS))
+
+        # Crash mid-append, then resume with one interaction still failing.
+        with (run_dir / JOURNAL_NAME).open("a", encoding="utf-8") as fh:
+            fh.write(TORN)
+        second = self.run_runner("--resume", str(run_dir), fail=(INTERACTIONS[0],))
+        self.assertIn("GT_BATCH_RUN_READY", second.stdout, second.stderr)
+        self.assertEqual(sorted(self.calls()), sorted(INTERACTIONS + INTERACTIONS[:2]))
+
+        # Crash again; the second resume must see everything the first resume did.
+        with (run_dir / JOURNAL_NAME).open("a", encoding="utf-8") as fh:
+            fh.write(TORN)
+        third = self.run_runner("--resume", str(run_dir))
+        self.assertIn("GT_BATCH_RUN_READY", third.stdout, third.stderr)
+        self.assertEqual(sorted(self.calls()), sorted(INTERACTIONS + INTERACTIONS[:2] + INTERACTIONS[:1]))
+
+        events = read_journal(run_dir / JOURNAL_NAME)
+        self.assertEqual(sum(e.get("event") == "run_resume" for e in events), 2)
+        results = self.read_csv(run_dir / "results.csv")
+        self.assertEqual(len(results), 2 * len(INTERACTIONS))
+        self.assertTrue(all(r["run_interaction_id"] for r in results))
+
+    def test_resumed_reseed_run_scores_a_retried_interaction_once(self) -> None:
+        # A failed reseed trigger keeps its interaction_id as run id, so it is scored as well.
+        out_root = self.tmp / "runs"
+        self.run_runner(
+            "--input", str(self.input), "--out-root", str(out_root), "--run-id", "R1", "--mode", "reseed",
+            fail=(INTERACTIONS[0],),
+        )
+        run_dir = out_root / "R1"
+        resumed = self.run_runner("--resume", str(run_dir))
+        self.assertIn("GT_BATCH_RUN_READY", resumed.stdout, resumed.stderr)
+        self.assertEqual(sorted(self.calls()), sorted(INTERACTIONS + INTERACTIONS[:1]))
+
+        readiness = self.read_csv(run_dir / "readiness.csv")
+        self.assertEqual([r["interaction_id"] for r in readiness], INTERACTIONS)
+        metrics = json.loads((run_dir / "metrics.json").read_text(encoding="utf-8"))
+        self.assertEqual(metrics["ready_timeout_count"], sum(r["state"] == "timeout" for r in readiness))
+
+
+class MergeTest(RunnerHarness):
+    def test_merged_shards_match_a_single_process_run(self) -> None:
+        single_root = self.tmp / "single"
+        shard_root = self.tmp / "sharded"
+        single = self.run_runner("--input", str(self.input), "--out-root", str(single_root), "--run-id", "M1")
+        self.assertIn("GT_BATCH_RUN_READY", single.stdout, single.stderr)
+        shard_dirs = []
+        for shard in ("1/2", "2/2"):
+            proc = self.run_runner(
+                "--input", str(self.input), "--out-root", str(shard_root), "--run-id", "M1", "--shard", shard
+            )
+            self.assertIn("GT_BATCH_RUN_READY", proc.stdout, proc.stderr)
+            shard_dirs.append(proc.stdout.split("GT_BATCH_RUN_READY", 1)[1].split()[0])
+        # Each interaction is triggered once per process tree: once alone, once across the shards.
+        self.assertEqual(sorted(self.calls()), sorted(INTERACTIONS * 2))
+
+        merged = self.run_runner("merge", *shard_dirs)
+        self.assertIn("GT_BATCH_RUN_READY", merged.stdout, merged.stderr)
+        merged_dir = shard_root / "M1"
+        for name in ("results.csv", "input_normalized.csv"):
+            self.assertEqual(
+                (merged_dir / name).read_text(encoding="utf-8"),
+                (single_root / "M1" / name).read_text(encoding="utf-8"),
+                name,
+            )
+        single_metrics = json.loads((single_root / "M1" / "metrics.json").read_text(encoding="utf-8"))
+        merged_metrics = json.loads((merged_dir / "metrics.json").read_text(encoding="utf-8"))
+        for key in ("total_rows", "correct_rows", "accuracy", "review_rate", "failures_count", "mean_confidence"):
+            self.assertEqual(merged_metrics[key], single_metrics[key], key)
+
+
+class FlipDiffTest(RunnerHarness):
+    def test_flips_against_baseline(self) -> None:
+        out_root = self.tmp / "runs"
+        base = self.run_runner("--input", str(self.input), "--out-root", str(out_root), "--run-id", "B0")
+        self.assertIn("GT_BATCH_RUN_READY", base.stdout, base.stderr)
+        same = self.run_runner(
+            "--input", str(self.input), "--out-root", str(out_root), "--run-id", "B1",
+            "--baseline", str(out_root / "B0"),
+        )
+        self.assertIn("GT_BATCH_RUN_READY", same.stdout, same.stderr)
+        self.assertEqual(self.read_csv(out_root / "B1" / "flips.csv"), [])
+
+        flipped = self.run_runner(
+            "--input", str(self.input), "--out-root", str(out_root), "--run-id", "B2",
+            "--baseline", str(out_root / "B0"), flip=True,
+        )
+        self.assertIn("GT_BATCH_RUN_READY", flipped.stdout, flipped.stderr)
+        flips = self.read_csv(out_root / "B2" / "flips.csv")
+        self.assertEqual(len(flips), 2 * len(INTERACTIONS))
+        for row in flips:
+            odd = int(row["interaction_id"][-1]) % 2 == 1
+            self.assertEqual(
+                row["change"],
+                ("correct_to_incorrect" if odd else "incorrect_to_correct") + ";decision_changed",
+            )
+            self.assertEqual(row["baseline_decision"], "assign" if odd else "review")
+            self.assertEqual(row["current_decision"], "review" if odd else "assign")
+        row_diff = json.loads((out_root / "B2" / "diff.json").read_text(encoding="utf-8"))["row_diff"]
+        self.assertEqual(row_diff["flip_correct_to_incorrect"], len(INTERACTIONS))
+        self.assertEqual(row_diff["flip_incorrect_to_correct"], len(INTERACTIONS))
+        self.assertEqual(row_diff["rows_matched"], 2 * len(INTERACTIONS))
+
+
+if __name__ == "__main__":
+    unittest.main()
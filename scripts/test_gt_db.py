@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for gt_db.ConnectionPool (psycopg replaced by an in-memory fake)."""
+
+from __future__ import annotations
+
+import threading
+import types
+import unittest
+from unittest import mock
+
+import gt_db
+
+IDLE = "idle"
+FAKE_PSYCOPG = types.SimpleNamespace(pq=types.SimpleNamespace(TransactionStatus=types.SimpleNamespace(IDLE=IDLE)))
+
+
+class FakeConn:
+    def __init__(self) -> None:
+        self.closed = False
+        self.info = types.SimpleNamespace(transaction_status=IDLE)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connects: list[FakeConn] = []
+
+        def connect(url: str, autocommit: bool) -> FakeConn:
+            conn = FakeConn()
+            self.connects.append(conn)
+            return conn
+
+        fake = types.SimpleNamespace(connect=connect, pq=FAKE_PSYCOPG.pq)
+        patcher = mock.patch.object(gt_db, "psycopg", fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_released_connection(self) -> None:
+        pool = gt_db.ConnectionPool("postgres://x", max_size=2)
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(len(self.connects), 1)
+
+    def test_waiter_opens_replacement_for_discarded_connection(self) -> None:
+        pool = gt_db.ConnectionPool("postgres://x", max_size=1)
+        conn = pool.acquire()
+        got: list[FakeConn] = []
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire()), daemon=True)
+        waiter.start()
+        waiter.join(0.2)
+        self.assertTrue(waiter.is_alive(), "pool at max_size should block")
+
+        conn.closed = True  # broken: release discards it
+        pool.release(conn)
+        waiter.join(2.0)
+        self.assertFalse(waiter.is_alive(), "waiter deadlocked after a discard")
+        self.assertIsNot(got[0], conn)
+        self.assertEqual(len(self.connects), 2)
+
+    def test_failed_connect_frees_the_slot(self) -> None:
+        pool = gt_db.ConnectionPool("postgres://x", max_size=1)
+        with mock.patch.object(gt_db.psycopg, "connect", side_effect=OSError("refused")):
+            with self.assertRaises(OSError):
+                pool.acquire()
+        pool.acquire()
+        self.assertEqual(len(self.connects), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for gt_rate_control.py (time.monotonic/sleep replaced by a manual clock)."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import gt_rate_control
+from gt_rate_control import AdaptiveRateController, CircuitBreaker, TokenBucket, guarded_call
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class ClockTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(gt_rate_control.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Breaker transitions are printed.
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+
+class TokenBucketTest(ClockTest):
+    def test_waiters_are_spaced_at_the_rate_and_burst_is_banked(self) -> None:
+        bucket = TokenBucket(per_minute=60, burst=2)
+        self.assertEqual([bucket.take() for _ in range(4)], [1000.0, 1000.0, 1001.0, 1002.0])
+        self.assertEqual(self.clock.slept, [1.0, 1.0])
+        self.clock.now += 10
+        self.assertEqual([bucket.take() for _ in range(3)], [1012.0, 1012.0, 1013.0])
+
+    def test_set_rate_with_drain_drops_banked_tokens(self) -> None:
+        bucket = TokenBucket(per_minute=60, burst=5)
+        bucket.set_rate(30, drain=True)
+        self.assertEqual([bucket.take(), bucket.take()], [1002.0, 1004.0])
+
+
+class CircuitBreakerTest(ClockTest):
+    def test_open_half_open_and_close(self) -> None:
+        breaker = CircuitBreaker(threshold=2, cooldown_s=10)
+        breaker.record(breaker.before_call(), 500)
+        breaker.record(breaker.before_call(), 200)
+        breaker.record(breaker.before_call(), 0)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.record(breaker.before_call(), 503)
+        self.assertEqual((breaker.state, breaker.trips), (CircuitBreaker.OPEN, 1))
+
+        # A call dispatched before the trip does not close it.
+        breaker.record(False, 200)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        self.clock.now += 10
+        probe = breaker.before_call()
+        self.assertTrue(probe)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        breaker.record(probe, 502)
+        self.assertEqual((breaker.state, breaker.cooldown_s, breaker.trips), (CircuitBreaker.OPEN, 20, 2))
+
+        self.clock.now += 20
+        breaker.record(breaker.before_call(), 200)
+        self.assertEqual((breaker.state, breaker.cooldown_s), (CircuitBreaker.CLOSED, 10))
+        self.assertFalse(breaker.before_call())
+
+
+class GuardedCallTest(ClockTest):
+    def test_an_exception_frees_the_slot_and_fails_the_probe(self) -> None:
+        rate = AdaptiveRateController(concurrency=1, per_minute=0)
+        breaker = CircuitBreaker(threshold=1, cooldown_s=10)
+        breaker.record(breaker.before_call(), 500)
+        self.clock.now += 10
+
+        with self.assertRaises(RuntimeError), guarded_call(rate, breaker):
+            self.assertEqual((rate.in_flight, breaker.state), (1, CircuitBreaker.HALF_OPEN))
+            raise RuntimeError("connection reset")
+        self.assertEqual((rate.in_flight, rate.calls), (0, 1))
+        self.assertEqual((breaker.state, breaker.cooldown_s), (CircuitBreaker.OPEN, 20))
+
+        # The next probe is let through rather than blocking on the lost one.
+        self.clock.now += 20
+        with guarded_call(rate, breaker) as call:
+            call.status = 200
+        self.assertEqual((rate.in_flight, breaker.state), (0, CircuitBreaker.CLOSED))
+
+    def test_interrupted_rate_wait_gives_back_the_concurrency_slot(self) -> None:
+        rate = AdaptiveRateController(concurrency=1, per_minute=60)
+        breaker = CircuitBreaker(threshold=1, cooldown_s=10)
+        with mock.patch.object(TokenBucket, "take", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt), guarded_call(rate, breaker):
+                self.fail("body must not run")
+        self.assertEqual(rate.in_flight, 0)
+        # No response recorded: a closed breaker counts it as one failure.
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+
+if __name__ == "__main__":
+    unittest.main()
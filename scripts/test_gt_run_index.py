@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Tests for gt_run_index.py."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from gt_run_index import RunIndex
+
+
+def result_row(span_index: int) -> dict:
+    return {
+        "row_id": f"row_{span_index}",
+        "interaction_id": "cll_TEST_001",
+        "span_selector": f"span_index:{span_index}",
+        "actual_decision": "assign",
+        "has_expectation": "true",
+        "is_correct": "true",
+    }
+
+
+class RowHistoryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.index = RunIndex(self.root / "run_index.sqlite")
+        self.addCleanup(self.index.close)
+        # Three whole runs with two spans of one interaction each, plus a newer shard run.
+        for day in (1, 2, 3):
+            metrics = {"run_id": f"run_{day}", "generated_at_utc": f"2026-01-0{day}T00:00:00Z"}
+            self.index.record_run(self.root / f"run_{day}", metrics, [result_row(0), result_row(1)], "sha")
+        shard = {"run_id": "run_4", "generated_at_utc": "2026-01-04T00:00:00Z", "shard": "1/2"}
+        self.index.record_run(self.root / "run_4", shard, [result_row(0)], "sha")
+
+    def test_last_counts_runs_not_rows(self) -> None:
+        rows = self.index.row_history(interaction_id="cll_TEST_001", last=2)
+        self.assertEqual([r["run_id"] for r in rows], ["run_2", "run_2", "run_3", "run_3"])
+
+    def test_last_with_a_span_selector_and_no_limit(self) -> None:
+        rows = self.index.row_history(interaction_id="cll_TEST_001", span_selector="span_index:1", last=1)
+        self.assertEqual([(r["run_id"], r["row_id"]) for r in rows], [("run_3", "row_1")])
+        rows = self.index.row_history(interaction_id="cll_TEST_001")
+        self.assertEqual([r["run_id"] for r in rows], ["run_1", "run_1", "run_2", "run_2", "run_3", "run_3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
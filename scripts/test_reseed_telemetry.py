@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Tests for reseed_telemetry.Telemetry (time.monotonic/time.time replaced by a manual clock)."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import reseed_telemetry
+from gt_rate_control import AdaptiveRateController
+from reseed_telemetry import Telemetry, _bin_upper_ms, _latency_bin
+
+
+class TelemetryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 5000.0
+        patcher = mock.patch.multiple(reseed_telemetry.time, monotonic=lambda: self.now, time=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.telemetry = Telemetry(
+            total=100,
+            status_path=Path(tmp.name) / "status.json",
+            rate=AdaptiveRateController(concurrency=2, per_minute=30),
+            breaker=None,
+        )
+
+    def at(self, elapsed_s: float) -> None:
+        self.now = 5000.0 + elapsed_s
+
+    def test_windows_count_only_their_buckets(self) -> None:
+        self.at(5)
+        for status in (200, 200, 500, 0, 429):
+            self.telemetry.record_call(status, 100.0)
+        self.at(250)
+        self.telemetry.record_call(200, 100.0)
+        self.at(295)
+        self.telemetry.record_call(200, 100.0)
+
+        windows = self.telemetry.snapshot()["windows"]
+        self.assertEqual([windows[w]["calls"] for w in ("1m", "5m", "15m")], [2, 7, 7])
+        self.assertEqual(windows["5m"]["error_rate"], round(2 / 7, 4))
+        self.assertEqual(windows["5m"]["throttle_rate"], round(1 / 7, 4))
+        self.assertEqual((windows["1m"]["error_rate"], windows["1m"]["calls_per_minute"]), (0.0, 2.0))
+        # Under five minutes in, the 5m window is only as long as the run.
+        self.assertEqual(windows["5m"]["calls_per_minute"], round(7 / (295 / 60), 2))
+
+    def test_ring_buckets_are_reset_when_reused(self) -> None:
+        self.at(0)
+        self.telemetry.record_call(500, 100.0)
+        self.at(900)
+        self.telemetry.record_call(200, 100.0)
+        windows = self.telemetry.snapshot()["windows"]
+        self.assertEqual((windows["15m"]["calls"], windows["15m"]["error_rate"]), (1, 0.0))
+
+    def test_percentiles_come_from_the_histogram(self) -> None:
+        for _ in range(94):
+            self.telemetry.record_call(200, 120.0)
+        for _ in range(6):
+            self.telemetry.record_call(200, 4000.0)
+        window = self.telemetry.snapshot()["windows"]["1m"]
+        self.assertEqual(window["latency_p50_ms"], round(_bin_upper_ms(_latency_bin(120.0)), 1))
+        self.assertEqual(window["latency_p95_ms"], round(_bin_upper_ms(_latency_bin(4000.0)), 1))
+        self.assertGreaterEqual(window["latency_p50_ms"], 120.0)
+        self.assertLess(window["latency_p50_ms"], 120.0 * reseed_telemetry.LATENCY_GROWTH)
+
+    def test_eta_uses_the_five_minute_completion_rate(self) -> None:
+        self.assertIsNone(self.telemetry.snapshot()["eta"]["seconds"])
+        for second in range(0, 300, 10):
+            self.at(second)
+            self.telemetry.record_done("success")
+        self.at(299)
+        snap = self.telemetry.snapshot()
+        self.assertEqual(snap["progress"]["remaining"], 70)
+        self.assertEqual(snap["eta"]["seconds"], round(70 * 60 / round(30 / (299 / 60), 2)))
+        # Five minutes on, nothing has finished inside the window, so there is no rate to project.
+        self.at(599)
+        self.assertIsNone(self.telemetry.snapshot()["eta"]["seconds"])
+
+    def test_finished_run_has_zero_eta_and_writes_status(self) -> None:
+        for _ in range(100):
+            self.telemetry.record_done("success")
+        self.telemetry.close("complete")
+        status = json.loads(self.telemetry.status_path.read_text(encoding="utf-8"))
+        self.assertEqual(status["state"], "complete")
+        self.assertEqual((status["eta"]["seconds"], status["progress"]["pct"]), (0, 100.0))
+        expected_limits = {"max_per_minute": 30.0, "workers": 2, "in_flight": 0, "adaptive": False}
+        self.assertEqual(status["rate_limit"], expected_limits)
+
+
+if __name__ == "__main__":
+    unittest.main()
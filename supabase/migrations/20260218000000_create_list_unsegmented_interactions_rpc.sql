@@ -0,0 +1,38 @@
+-- Candidate discovery for admin_reseed_batch_backfill.py.
+-- Returns interactions with no active (is_superseded = false) conversation_spans,
+-- one keyset page at a time: pass the last interaction_id of the previous page as
+-- p_after. The anti-join runs server-side, so only candidate ids cross the wire and
+-- every page costs the same regardless of how deep into the table it is.
+--
+-- Plan: range scan on the interactions.interaction_id unique index from p_after,
+-- NOT EXISTS probe on conversation_spans_active_unique (partial index on
+-- (interaction_id, span_index) WHERE is_superseded = false), stop at p_limit.
+
+CREATE OR REPLACE FUNCTION public.list_unsegmented_interactions(
+  p_after text DEFAULT NULL,
+  p_limit integer DEFAULT 1000
+) RETURNS TABLE (interaction_id text)
+  LANGUAGE sql
+  STABLE
+  SET search_path = public
+AS $$
+  SELECT i.interaction_id
+  FROM public.interactions i
+  WHERE (p_after IS NULL OR i.interaction_id > p_after)
+    AND NOT EXISTS (
+      SELECT 1
+      FROM public.conversation_spans cs
+      WHERE cs.interaction_id = i.interaction_id
+        AND cs.is_superseded = false
+    )
+  ORDER BY i.interaction_id
+  LIMIT LEAST(GREATEST(COALESCE(p_limit, 1000), 1), 10000);
+$$;
+
+REVOKE ALL ON FUNCTION public.list_unsegmented_interactions(text, integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.list_unsegmented_interactions(text, integer) TO service_role;
+
+COMMENT ON FUNCTION public.list_unsegmented_interactions(text, integer) IS
+  'Interactions without active conversation_spans, ordered by interaction_id. '
+  'Keyset pagination: p_after = last interaction_id of the previous page. '
+  'Used by scripts/admin_reseed_batch_backfill.py for candidate discovery.';
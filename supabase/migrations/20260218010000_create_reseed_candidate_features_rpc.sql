@@ -0,0 +1,53 @@
+-- Scheduling features for admin_reseed_batch_backfill.py --schedule priority.
+-- For a batch of candidate interaction_ids, returns what the scheduler ranks on:
+-- event_at_utc (recency), pending review_queue items, and transcript size (cost).
+--
+-- transcript_bytes is octet_length(), which PostgreSQL answers from the TOAST
+-- header without decompressing the transcript; bytes track characters closely
+-- enough for a latency estimate.
+--
+-- Plan: unnest the id array, probe the interactions.interaction_id and
+-- calls_raw.interaction_id unique indexes, count pending rows through
+-- idx_review_queue_interaction_id. Ids that do not exist are omitted.
+--
+-- Both review_queue(interaction_id) indexes were dropped on 2026-01-29
+-- (idx_review_queue_interaction_id in 20260129192409, idx_review_queue_interaction
+-- in 20260129192535), despite the "retained" note in 20260209011017. Without one,
+-- every candidate's count scans review_queue, so the lookup index is recreated here.
+
+CREATE INDEX IF NOT EXISTS idx_review_queue_interaction_id ON public.review_queue (interaction_id);
+
+CREATE OR REPLACE FUNCTION public.reseed_candidate_features(
+  p_interaction_ids text[]
+) RETURNS TABLE (
+  interaction_id text,
+  event_at_utc timestamptz,
+  transcript_bytes integer,
+  open_review_items integer
+)
+  LANGUAGE sql
+  STABLE
+  SET search_path = public
+AS $$
+  SELECT
+    i.interaction_id,
+    i.event_at_utc,
+    COALESCE(octet_length(cr.transcript), 0)::integer AS transcript_bytes,
+    COALESCE(rq.open_items, 0)::integer AS open_review_items
+  FROM unnest(p_interaction_ids) AS ids(interaction_id)
+  JOIN public.interactions i ON i.interaction_id = ids.interaction_id
+  LEFT JOIN public.calls_raw cr ON cr.interaction_id = i.interaction_id
+  LEFT JOIN LATERAL (
+    SELECT count(*) AS open_items
+    FROM public.review_queue q
+    WHERE q.interaction_id = i.interaction_id
+      AND q.status = 'pending'
+  ) rq ON true;
+$$;
+
+REVOKE ALL ON FUNCTION public.reseed_candidate_features(text[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.reseed_candidate_features(text[]) TO service_role;
+
+COMMENT ON FUNCTION public.reseed_candidate_features(text[]) IS
+  'Per-candidate scheduling features: event_at_utc, transcript_bytes, pending review_queue items. '
+  'Used by scripts/admin_reseed_batch_backfill.py --schedule priority.';